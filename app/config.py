@@ -8,11 +8,26 @@ class Settings:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    SUPABASE_TIMEOUT_SECONDS: float = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", 10))
+    SUPABASE_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_MAX_CONNECTIONS", 100))
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", 20))
+    PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", 10000))  # cached user/business rows
+    PROFILE_CACHE_TTL_SECONDS: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", 300))
+    
+    # Write-behind for last_login bookkeeping
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", 5))
+    ACTIVITY_MAX_BATCH: int = int(os.getenv("ACTIVITY_MAX_BATCH", 500))
     
     # JWT Configuration
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))  # verified tokens kept in memory
+    
+    # Password Hashing Pool
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE_DEPTH: int = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", 64))
     
     # CORS Configuration
     ALLOWED_ORIGINS: list = ["*"] # Allow all for development debugging
@@ -25,12 +40,78 @@ class Settings:
     #     "file://*"
     # ]
     
+    # Response compression (br when the brotli package is installed, else gzip)
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))  # smaller bodies go out as-is
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", 6))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", 4))  # 0-11; 4 suits dynamic responses
+
+    # Request metrics (Prometheus text at /metrics) and Server-Timing headers
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"  # per-request breakdown header
+
+    # Compliance Deadlines
+    DEADLINE_HORIZON_DAYS: int = int(os.getenv("DEADLINE_HORIZON_DAYS", 365))  # generate this far ahead
+    DEADLINE_INSERT_CHUNK: int = int(os.getenv("DEADLINE_INSERT_CHUNK", 500))
+    DASHBOARD_UPCOMING_DAYS: int = int(os.getenv("DASHBOARD_UPCOMING_DAYS", 30))
+    DASHBOARD_RECENT_ACTIVITIES: int = int(os.getenv("DASHBOARD_RECENT_ACTIVITIES", 10))
+    
+    # Late fees and interest on open deadlines
+    PENALTY_PROJECTION_DAYS: int = int(os.getenv("PENALTY_PROJECTION_DAYS", 30))  # projected liability horizon
+    PENALTY_RISK_HIGH: float = float(os.getenv("PENALTY_RISK_HIGH", 10000))  # accrued rupees for "high" risk
+    PENALTY_TABLE_DAYS: int = int(os.getenv("PENALTY_TABLE_DAYS", 3660))  # per-day tables stop accruing here
+    
+    # Compliance trends (/api/analytics)
+    ANALYTICS_DEFAULT_PERIODS: int = int(os.getenv("ANALYTICS_DEFAULT_PERIODS", 12))  # periods per trend
+    ANALYTICS_MAX_PERIODS: int = int(os.getenv("ANALYTICS_MAX_PERIODS", 120))
+
+    # GST Filing History
+    GST_FILINGS_PAGE_SIZE: int = int(os.getenv("GST_FILINGS_PAGE_SIZE", 50))
+    GST_FILINGS_MAX_PAGE_SIZE: int = int(os.getenv("GST_FILINGS_MAX_PAGE_SIZE", 200))
+    
+    # GST Filing Import
+    GST_IMPORT_BATCH_SIZE: int = int(os.getenv("GST_IMPORT_BATCH_SIZE", 500))  # rows per insert
+    GST_IMPORT_MAX_ERRORS: int = int(os.getenv("GST_IMPORT_MAX_ERRORS", 1000))  # row errors returned
+    GST_IMPORT_MAX_LINE_BYTES: int = int(os.getenv("GST_IMPORT_MAX_LINE_BYTES", 64 * 1024))
+    
+    # Bulk GSTIN/PAN validation
+    VALIDATION_MAX_BATCH: int = int(os.getenv("VALIDATION_MAX_BATCH", 500000))  # identifiers per request
+    
+    # ITC Reconciliation (purchase register vs GSTR-2A/2B)
+    RECON_DATE_TOLERANCE_DAYS: int = int(os.getenv("RECON_DATE_TOLERANCE_DAYS", 3))
+    RECON_AMOUNT_TOLERANCE: float = float(os.getenv("RECON_AMOUNT_TOLERANCE", 1.0))  # rupees
+    RECON_AMOUNT_TOLERANCE_PCT: float = float(os.getenv("RECON_AMOUNT_TOLERANCE_PCT", 0.1))
+    RECON_MAX_DETAILS: int = int(os.getenv("RECON_MAX_DETAILS", 1000))  # lines listed per bucket
+    
+    # TDS computation
+    TDS_MAX_BATCH: int = int(os.getenv("TDS_MAX_BATCH", 200000))  # payments per request
+    
+    # ROC company master index (built with python -m app.utils.company_index)
+    ROC_INDEX_PATH: str = os.getenv("ROC_INDEX_PATH", "data/roc_companies.idx")
+    ROC_SEARCH_LIMIT: int = int(os.getenv("ROC_SEARCH_LIMIT", 20))
+    ROC_SEARCH_MAX_LIMIT: int = int(os.getenv("ROC_SEARCH_MAX_LIMIT", 100))
+    
+    # Mock DB Configuration (used when Supabase is not configured)
+    MOCKDB_JOURNAL_COMPACT_BYTES: int = int(os.getenv("MOCKDB_JOURNAL_COMPACT_BYTES", 1024 * 1024))  # 1MB
+    MOCKDB_FSYNC: bool = os.getenv("MOCKDB_FSYNC", "false").lower() == "true"
+    
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FILE_TYPES: list = [".pdf", ".jpg", ".jpeg", ".png"]
     
+    UPLOAD_CHUNK_BYTES: int = int(os.getenv("UPLOAD_CHUNK_BYTES", 1024 * 1024))  # streamed to disk per read
+    
     # OCR Configuration
     TESSERACT_PATH: str = os.getenv("TESSERACT_PATH", "/usr/bin/tesseract")
+    OCR_BACKEND: str = os.getenv("OCR_BACKEND", "tesseract")  # "tesseract", "stub" or "module:function"
+    OCR_EXECUTOR: str = os.getenv("OCR_EXECUTOR", "process")  # "process" or "thread"
+    OCR_WORKERS: int = int(os.getenv("OCR_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+    OCR_QUEUE_DEPTH: int = int(os.getenv("OCR_QUEUE_DEPTH", 32))
+    OCR_UPLOAD_DIR: str = os.getenv("OCR_UPLOAD_DIR", "data/uploads")
+    OCR_JOB_TTL_SECONDS: int = int(os.getenv("OCR_JOB_TTL_SECONDS", 3600))
+    OCR_JOB_CACHE_SIZE: int = int(os.getenv("OCR_JOB_CACHE_SIZE", 10000))
+    OCR_DPI: int = int(os.getenv("OCR_DPI", 300))
+    OCR_CACHE_DIR: str = os.getenv("OCR_CACHE_DIR", "data/ocr_cache")  # results keyed by upload SHA-256
+    OCR_CACHE_MAX_BYTES: int = int(os.getenv("OCR_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256MB
     
     # Redis Configuration (for Celery)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -4,7 +4,11 @@ except ImportError:
     class Client: pass
     create_client = None
 
+import httpx
+from typing import Any, Dict, List, Optional, Union
+
 from app.config import settings
+from app.utils.metrics import backend_call
 import logging
 
 logger = logging.getLogger(__name__)
@@ -49,6 +53,187 @@ class SupabaseClient:
 supabase = SupabaseClient().get_client()
 supabase_admin = SupabaseClient.get_admin_client()
 
+class SupabaseError(Exception):
+    """Non-2xx response from the Supabase REST or Auth API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+class AsyncSupabaseClient:
+    """Async access to Supabase Auth (GoTrue) and PostgREST.
+
+    All requests share one ``httpx.AsyncClient`` so keep-alive connections
+    are pooled across requests instead of blocking the event loop on the
+    synchronous supabase-py client.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        service_role_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.key = key
+        self.service_role_key = service_role_key or key
+        self._http = httpx.AsyncClient(
+            base_url=url.rstrip("/"),
+            timeout=settings.SUPABASE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            transport=transport
+        )
+
+    def _headers(
+        self,
+        admin: bool = False,
+        access_token: Optional[str] = None,
+        prefer: Optional[str] = None,
+        single: bool = False
+    ) -> Dict[str, str]:
+        key = self.service_role_key if admin else self.key
+        headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {access_token or key}"
+        }
+        if prefer:
+            headers["Prefer"] = prefer
+        if single:
+            headers["Accept"] = "application/vnd.pgrst.object+json"
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        **header_options
+    ) -> Any:
+        with backend_call("supabase", f"{method} {path}"):
+            response = await self._http.request(
+                method, path, params=params, json=json,
+                headers=self._headers(**header_options)
+            )
+        if response.status_code >= 400:
+            try:
+                body = response.json()
+                message = body.get("message") or body.get("msg") or body.get("error_description") or str(body)
+            except ValueError:
+                message = response.text
+            raise SupabaseError(response.status_code, message)
+        if not response.content:
+            return None
+        return response.json()
+
+    # Auth
+    async def sign_up(self, email: str, password: str) -> Dict:
+        """Create an auth user; returns a dict with a ``user`` key"""
+        data = await self._request(
+            "POST", "/auth/v1/signup",
+            json={"email": email, "password": password}
+        )
+        # With email confirmation on GoTrue returns the bare user object
+        return data if "user" in data else {"user": data}
+
+    async def sign_in_with_password(self, email: str, password: str) -> Dict:
+        """Password grant; returns the session (``access_token``, ``user``, ...)"""
+        return await self._request(
+            "POST", "/auth/v1/token",
+            params={"grant_type": "password"},
+            json={"email": email, "password": password}
+        )
+
+    # PostgREST
+    @staticmethod
+    def _filter_params(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        return {column: f"eq.{value}" for column, value in (filters or {}).items()}
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        single: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+        admin: bool = False,
+        access_token: Optional[str] = None
+    ) -> Union[Dict, List[Dict]]:
+        query = {"select": columns, **self._filter_params(filters), **(params or {})}
+        return await self._request(
+            "GET", f"/rest/v1/{table}", params=query,
+            single=single, admin=admin, access_token=access_token
+        )
+
+    async def insert(
+        self,
+        table: str,
+        rows: Union[Dict, List[Dict]],
+        admin: bool = False,
+        access_token: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        returning: bool = True,
+        columns: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """Insert rows; with ``returning`` the inserted rows come back (only ``columns`` if given)"""
+        prefer = "return=representation" if returning else "return=minimal"
+        if ignore_duplicates:
+            prefer += ",resolution=ignore-duplicates"
+        return await self._request(
+            "POST", f"/rest/v1/{table}", json=rows,
+            params={"select": columns} if returning and columns else None,
+            prefer=prefer, admin=admin, access_token=access_token
+        )
+
+    async def update(
+        self,
+        table: str,
+        values: Dict,
+        filters: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None,
+        admin: bool = False,
+        access_token: Optional[str] = None
+    ) -> None:
+        query = {**self._filter_params(filters), **(params or {})}
+        await self._request(
+            "PATCH", f"/rest/v1/{table}", params=query, json=values,
+            prefer="return=minimal", admin=admin, access_token=access_token
+        )
+
+    async def rpc(self, function: str, params: Dict[str, Any], admin: bool = False) -> Any:
+        """Call a Postgres function exposed by PostgREST"""
+        return await self._request("POST", f"/rest/v1/rpc/{function}", json=params, admin=admin)
+
+    async def ping(self) -> bool:
+        """Establish a pooled connection; False if the API is unreachable"""
+        try:
+            await self._http.get("/rest/v1/", headers=self._headers())
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Supabase warm-up failed: {e}")
+            return False
+
+    async def aclose(self):
+        await self._http.aclose()
+
+def create_async_client() -> Optional[AsyncSupabaseClient]:
+    """Build the shared async client, or None when Supabase is not configured"""
+    if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+        logger.warning("Supabase URL/key not configured.")
+        return None
+    return AsyncSupabaseClient(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_KEY,
+        settings.SUPABASE_SERVICE_ROLE_KEY
+    )
+
+async_supabase = create_async_client()
+
 def test_connection():
     """Test database connection"""
     try:
@@ -0,0 +1,55 @@
+from typing import Dict
+
+from fastapi import Depends, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from app.services.analytics_service import AnalyticsService
+from app.services.auth_service import AuthService
+from app.services.dashboard_service import DashboardService
+from app.services.deadline_service import DeadlineService
+from app.services.gst_service import GSTService
+from app.services.ocr_service import OCRService
+from app.services.penalty_service import PenaltyService
+from app.services.roc_service import ROCService
+from app.services.tds_service import TDSService
+from app.utils.security import verify_token
+
+# App-lifetime instances are created in app.main.startup_event and kept on
+# app.state; routes receive them through these Depends providers.
+
+security = HTTPBearer()
+
+def get_auth_service(request: Request) -> AuthService:
+    return request.app.state.auth_service
+
+def get_deadline_service(request: Request) -> DeadlineService:
+    return request.app.state.deadline_service
+
+def get_dashboard_service(request: Request) -> DashboardService:
+    return request.app.state.dashboard_service
+
+def get_penalty_service(request: Request) -> PenaltyService:
+    return request.app.state.penalty_service
+
+def get_gst_service(request: Request) -> GSTService:
+    return request.app.state.gst_service
+
+def get_analytics_service(request: Request) -> AnalyticsService:
+    return request.app.state.analytics_service
+
+def get_ocr_service(request: Request) -> OCRService:
+    return request.app.state.ocr_service
+
+def get_roc_service(request: Request) -> ROCService:
+    return request.app.state.roc_service
+
+def get_tds_service(request: Request) -> TDSService:
+    return request.app.state.tds_service
+
+async def get_current_profile(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service)
+) -> Dict:
+    """Verified caller's ``{"user": ..., "business": ...}`` profile"""
+    payload = verify_token(credentials.credentials)
+    return await auth_service.get_user_profile(payload["sub"])
@@ -1,10 +1,28 @@
-from fastapi import FastAPI, Depends
-from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import logging
 
 from app.config import settings
+from app.database import async_supabase
+from app.services.analytics_service import AnalyticsService
+from app.services.auth_service import AuthService
+from app.services.dashboard_service import DashboardService
+from app.services.deadline_service import DeadlineService
+from app.services.gst_service import GSTService
+from app.services.ocr_service import OCRService
+from app.services.penalty_service import PenaltyService
+from app.services.roc_service import ROCService
+from app.services.tds_service import TDSService
+from app.services.version_service import VersionService
+from app.utils.compression import CompressionMiddleware
+from app.utils.conditional import ConditionalGetMiddleware
+from app.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry
+from app.utils.mock_db import MockDB
+from app.utils.responses import FastJSONResponse, JSONRoute
+from app.utils.security import password_hashing_pool, token_cache
 # from app.database import test_connection # Commented out until DB is reachable
 from app.routes import (
     auth, dashboard, gst, tds, roc, 
@@ -18,6 +36,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create app-lifetime services on startup and release them on shutdown"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
 # Create FastAPI app
 app = FastAPI(
     title="Niyam AI Compliance OS API",
@@ -25,7 +50,24 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+app.router.route_class = JSONRoute
+
+# Answer If-None-Match on polled read endpoints before the route runs.
+# Added first so it sits inside CORS and 304s still carry CORS headers.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    paths=(
+        "/api/auth/me",
+        "/api/dashboard/summary",
+        "/api/dashboard/deadlines",
+        "/api/dashboard/penalties",
+        "/api/gst/filings",
+        "/api/analytics/trends",
+    )
 )
 
 # Add CORS middleware
@@ -43,6 +85,18 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure properly for production
 )
 
+# Compress large responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_BYTES,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY
+)
+
+# Time requests and their backend calls; added last so it wraps every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(dashboard.router)
@@ -72,24 +126,60 @@ async def health_check():
     return {
         "status": "healthy" if db_connected else "degraded",
         "database": "connected" if db_connected else "disconnected",
-        "timestamp": "2025-01-06T10:30:00Z"  # In production, use datetime.utcnow()
+        "timestamp": "2025-01-06T10:30:00Z",  # In production, use datetime.utcnow()
+        "password_hashing": password_hashing_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "activity_writer": app.state.auth_service.activity_writer.stats(),
+        "ocr": app.state.ocr_service.stats()
     }
 
-@app.on_event("startup")
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request and backend-call histograms in the Prometheus text format"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 async def startup_event():
     """Run on application startup"""
     logger.info("Starting Niyam AI Compliance OS API...")
     
+    # Services live for the whole process and are injected via app.dependencies
+    mock_db = MockDB() if async_supabase is None else None
+    app.state.auth_service = AuthService(db=async_supabase, mock_db=mock_db)
+    await app.state.auth_service.warm_up()
+    app.state.deadline_service = DeadlineService(db=async_supabase, mock_db=mock_db)
+    app.state.penalty_service = PenaltyService(app.state.deadline_service)
+    app.state.dashboard_service = DashboardService(app.state.deadline_service, app.state.penalty_service)
+    app.state.dashboard_service.start()
+    app.state.gst_service = GSTService(db=async_supabase, mock_db=mock_db)
+    app.state.analytics_service = AnalyticsService(
+        app.state.deadline_service, app.state.penalty_service, app.state.gst_service
+    )
+    app.state.version_service = VersionService(
+        app.state.deadline_service, app.state.gst_service, app.state.auth_service
+    )
+    app.state.tds_service = TDSService()
+    app.state.roc_service = ROCService()
+    app.state.ocr_service = OCRService()
+    
     # Test database connection
     # if test_connection():
     #     logger.info("Database connection established")
     # else:
     #     logger.error("Failed to connect to database")
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info("Shutting down Niyam AI Compliance OS API...")
+    await app.state.dashboard_service.stop()
+    await app.state.ocr_service.close()
+    app.state.roc_service.close()
+    # Flush write-behind buffers before the backend client goes away
+    await app.state.auth_service.close()
+    if async_supabase is not None:
+        await async_supabase.aclose()
+    password_hashing_pool.shutdown()
 
 if __name__ == "__main__":
     import uvicorn
@@ -15,6 +15,10 @@ class DeadlineStatus(str, Enum):
     COMPLETED = "completed"
     PENDING = "pending"
 
+class GSTFilingStatus(str, Enum):
+    PENDING = "pending"
+    FILED = "filed"
+
 class DeadlineBase(BaseModel):
     type: ComplianceType
     subtype: str
@@ -49,6 +53,7 @@ class GSTFilingBase(BaseModel):
 
 class GSTFilingCreate(GSTFilingBase):
     business_id: str
+    status: GSTFilingStatus = GSTFilingStatus.PENDING
 
 class GSTFilingResponse(GSTFilingBase):
     id: str
@@ -62,10 +67,34 @@ class GSTFilingResponse(GSTFilingBase):
     class Config:
         from_attributes = True
 
+class IdentifierBatch(BaseModel):
+    gstins: List[str] = []
+    pans: List[str] = []
+    match_pans: bool = False  # check gstins[i] embeds pans[i]
+
+class TDSPayment(BaseModel):
+    vendor: str = Field(..., min_length=1)
+    pan: Optional[str] = None
+    section: str  # e.g. "194C", "194J(b)"
+    amount: float = Field(..., gt=0)
+    payment_date: date
+
+class TDSOpeningBalance(BaseModel):
+    financial_year: int  # starting year, 2025 for FY 2025-26
+    payee: str  # PAN, or "vendor:<name>" for payees without one
+    section: str
+    paid: float = Field(..., ge=0)
+    taxed: float = Field(0, ge=0)
+
+class TDSBatch(BaseModel):
+    payments: List[TDSPayment]
+    opening: List[TDSOpeningBalance] = []  # FY-to-date totals from earlier runs
+
 class DashboardMetrics(BaseModel):
     upcoming_deadlines: int
     compliance_health: float  # Percentage
-    penalty_risk: str  # "low", "medium", "high"
+    penalty_risk: str  # "low", "medium", "high", from accrued late fees and interest
+    penalty_liability: dict = {}  # accrued and projected late fees/interest
     recent_activities: List[dict]
     quick_stats: dict
     
@@ -1,7 +1,39 @@
-from fastapi import APIRouter
+from typing import Dict
 
-router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.config import settings
+from app.dependencies import get_analytics_service, get_current_profile, get_deadline_service
+from app.services.analytics_service import AnalyticsService
+from app.services.deadline_service import DeadlineService
+from app.utils.responses import JSONRoute
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"], route_class=JSONRoute)
 
 @router.get("/")
 async def get_analytics():
     return {"message": "Analytics API"}
+
+@router.get("/trends")
+async def get_trends(
+    granularity: str = Query("month", pattern="^(month|quarter|fy)$"),
+    periods: int = Query(settings.ANALYTICS_DEFAULT_PERIODS, ge=1, le=settings.ANALYTICS_MAX_PERIODS),
+    profile: Dict = Depends(get_current_profile),
+    deadline_service: DeadlineService = Depends(get_deadline_service),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
+):
+    """Tax liability, ITC utilisation, on-time filing rate and penalties paid per period, oldest first"""
+    business = profile.get("business")
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found"
+        )
+    await deadline_service.ensure_business(business)
+    await analytics_service.ensure_business(business["id"])
+    return {
+        "success": True,
+        "data": {
+            "granularity": granularity,
+            "periods": analytics_service.trends(business["id"], granularity, periods)
+        }
+    }
@@ -1,17 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.models.user import UserCreate, UserLogin, UserResponse, BusinessResponse
+from app.dependencies import get_auth_service
 from app.services.auth_service import AuthService
 from app.utils.security import verify_token
+from app.utils.responses import JSONRoute
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+router = APIRouter(prefix="/api/auth", tags=["Authentication"], route_class=JSONRoute)
 security = HTTPBearer()
 
-@router.post("/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate):
+@router.post("/signup", status_code=status.HTTP_201_CREATED)
+async def signup(
+    user_data: UserCreate,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """Register a new user with business"""
     try:
-        auth_service = AuthService()
         result = await auth_service.register_user(user_data)
         return {
             "success": True,
@@ -26,11 +30,13 @@ async def signup(user_data: UserCreate):
             detail=f"Registration failed: {str(e)}"
         )
 
-@router.post("/login", response_model=dict)
-async def login(credentials: UserLogin):
+@router.post("/login")
+async def login(
+    credentials: UserLogin,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """Authenticate user and return tokens"""
     try:
-        auth_service = AuthService()
         result = await auth_service.authenticate_user(
             email=credentials.email,
             password=credentials.password
@@ -48,17 +54,17 @@ async def login(credentials: UserLogin):
             detail=f"Login failed: {str(e)}"
         )
 
-@router.get("/me", response_model=dict)
+@router.get("/me")
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """Get current authenticated user details"""
     try:
         token = credentials.credentials
-        user_id = verify_token(token)
+        payload = verify_token(token)
         
-        auth_service = AuthService()
-        user_data = await auth_service.get_user_profile(user_id)
+        user_data = await auth_service.get_user_profile(payload["sub"])
         
         return {
             "success": True,
@@ -72,7 +78,7 @@ async def get_current_user(
             detail=f"Failed to fetch user profile: {str(e)}"
         )
 
-@router.post("/logout", response_model=dict)
+@router.post("/logout")
 async def logout(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
@@ -82,14 +88,14 @@ async def logout(
         "message": "Logout successful"
     }
 
-@router.post("/refresh", response_model=dict)
+@router.post("/refresh")
 async def refresh_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """Refresh access token using refresh token"""
     try:
         refresh_token = credentials.credentials
-        auth_service = AuthService()
         new_tokens = await auth_service.refresh_token(refresh_token)
         
         return {
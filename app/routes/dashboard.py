@@ -1,23 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.config import settings
+from app.dependencies import (
+    get_current_profile, get_dashboard_service, get_deadline_service, get_penalty_service
+)
 from app.models.compliance import DashboardMetrics
-# from app.services.deadline_service import DeadlineService # To be implemented
-from app.utils.security import verify_token
+from app.services.dashboard_service import DashboardService
+from app.services.deadline_service import DeadlineService
+from app.services.penalty_service import PenaltyService
+from app.utils.responses import JSONRoute
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"], route_class=JSONRoute)
 
-router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
-security = HTTPBearer()
+async def _business_with_deadlines(profile: Dict, deadline_service: DeadlineService) -> Dict:
+    business = profile.get("business")
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found"
+        )
+    await deadline_service.ensure_business(business)
+    return business
 
-@router.get("/summary", response_model=dict)
+@router.get("/summary")
 async def get_dashboard_summary(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    profile: Dict = Depends(get_current_profile),
+    deadline_service: DeadlineService = Depends(get_deadline_service),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
 ):
     """Get dashboard metrics and overview"""
-    # Placeholder for actual implementation
+    business = await _business_with_deadlines(profile, deadline_service)
+    return {
+        "success": True,
+        "data": DashboardMetrics(**dashboard_service.metrics(business["id"])).model_dump()
+    }
+
+@router.get("/deadlines")
+async def get_deadlines(
+    days: int = Query(settings.DASHBOARD_UPCOMING_DAYS, ge=0, le=366),
+    overdue: bool = False,
+    profile: Dict = Depends(get_current_profile),
+    deadline_service: DeadlineService = Depends(get_deadline_service)
+):
+    """Open deadlines due in the next ``days`` days, or overdue ones"""
+    business = await _business_with_deadlines(profile, deadline_service)
+    if overdue:
+        deadlines = deadline_service.overdue(business["id"])
+    else:
+        deadlines = deadline_service.upcoming(business["id"], days)
+    return {
+        "success": True,
+        "data": deadlines
+    }
+
+@router.get("/penalties")
+async def get_penalties(
+    profile: Dict = Depends(get_current_profile),
+    deadline_service: DeadlineService = Depends(get_deadline_service),
+    penalty_service: PenaltyService = Depends(get_penalty_service)
+):
+    """Late fees and interest accrued on overdue deadlines, plus the projected liability"""
+    business = await _business_with_deadlines(profile, deadline_service)
+    return {
+        "success": True,
+        "data": penalty_service.business_penalties(business["id"])
+    }
+
+@router.post("/deadlines/{deadline_id}/complete")
+async def complete_deadline(
+    deadline_id: str,
+    profile: Dict = Depends(get_current_profile),
+    deadline_service: DeadlineService = Depends(get_deadline_service)
+):
+    """Mark a deadline as filed"""
+    business = await _business_with_deadlines(profile, deadline_service)
+    deadline = await deadline_service.complete(business["id"], deadline_id)
     return {
         "success": True,
-        "data": {
-            "upcoming_deadlines": 5,
-            "compliance_health": 85.5,
-            "penalty_risk": "low"
-        }
+        "data": deadline
     }
@@ -1,16 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-# from app.services.gst_service import GSTService # To be implemented
+from typing import Dict, Optional
 
-router = APIRouter(prefix="/api/gst", tags=["GST"])
-security = HTTPBearer()
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from app.config import settings
+from app.dependencies import get_current_profile, get_gst_service
+from app.models.compliance import IdentifierBatch
+from app.services.gst_service import GSTService
+from app.utils.responses import JSONRoute
 
-@router.get("/filings", response_model=dict)
+router = APIRouter(prefix="/api/gst", tags=["GST"], route_class=JSONRoute)
+
+def _business_id(profile: Dict) -> str:
+    business = profile.get("business")
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found"
+        )
+    return business["id"]
+
+@router.get("/filings")
 async def get_gst_filings(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    limit: int = Query(settings.GST_FILINGS_PAGE_SIZE, ge=1, le=settings.GST_FILINGS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    filing_type: Optional[str] = None,
+    filing_status: Optional[str] = Query(None, alias="status"),
+    profile: Dict = Depends(get_current_profile),
+    gst_service: GSTService = Depends(get_gst_service)
+):
+    """Get GST filing history, newest period first; pass ``next_cursor`` back as ``cursor``"""
+    filings, next_cursor = await gst_service.list_filings(
+        _business_id(profile),
+        limit,
+        cursor=cursor,
+        fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        filing_type=filing_type,
+        filing_status=filing_status
+    )
+    return {
+        "success": True,
+        "data": filings,
+        "next_cursor": next_cursor
+    }
+
+@router.post("/filings/import")
+async def import_gst_filings(
+    request: Request,
+    profile: Dict = Depends(get_current_profile),
+    gst_service: GSTService = Depends(get_gst_service)
+):
+    """Bulk-import filing history from a CSV or NDJSON request body"""
+    result = await gst_service.import_filings(
+        _business_id(profile), request.stream(), request.headers.get("content-type", "")
+    )
+    return {
+        "success": True,
+        "data": result
+    }
+
+@router.post("/reconcile")
+async def reconcile_itc(
+    period_month: int = Form(..., ge=1, le=12),
+    period_year: int = Form(..., ge=2000, le=2100),
+    purchase_register: UploadFile = File(..., description="Books: gstin,invoice_number,invoice_date,taxable_value,tax_amount"),
+    gstr2b: UploadFile = File(..., description="Supplier-reported lines, same columns"),
+    profile: Dict = Depends(get_current_profile),
+    gst_service: GSTService = Depends(get_gst_service)
+):
+    """Match the purchase register against GSTR-2A/2B and update the period's ITC"""
+    result = await gst_service.reconcile_period(
+        _business_id(profile), period_year, period_month, purchase_register.file, gstr2b.file
+    )
+    return {
+        "success": True,
+        "data": result
+    }
+
+@router.post("/validate")
+async def validate_identifiers(
+    batch: IdentifierBatch,
+    profile: Dict = Depends(get_current_profile),
+    gst_service: GSTService = Depends(get_gst_service)
 ):
-    """Get GST filing history"""
+    """Check GSTINs (format, state code, embedded PAN, check digit) and PANs in bulk"""
+    result = await gst_service.validate_identifiers(batch.gstins, batch.pans, batch.match_pans)
     return {
         "success": True,
-        "data": []
+        "data": result
     }
@@ -1,7 +1,81 @@
-from fastapi import APIRouter
+from typing import Dict
 
-router = APIRouter(prefix="/api/ocr", tags=["OCR"])
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from app.dependencies import get_current_profile, get_ocr_service
+from app.services.ocr_service import OCRService
+from app.utils.responses import JSONRoute
+
+router = APIRouter(prefix="/api/ocr", tags=["OCR"], route_class=JSONRoute)
+
+def _business_id(profile: Dict) -> str:
+    business = profile.get("business")
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found"
+        )
+    return business["id"]
 
 @router.get("/")
 async def get_ocr():
     return {"message": "OCR API"}
+
+# The body is read by OCRService as it streams in, so the form is described here
+_UPLOAD_BODY = {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object", "required": ["file"], "properties": {"file": {"type": "string", "format": "binary"}}
+}}}}}
+
+@router.post("/upload", status_code=status.HTTP_202_ACCEPTED, openapi_extra=_UPLOAD_BODY)
+async def upload_document(
+    request: Request,
+    profile: Dict = Depends(get_current_profile),
+    ocr_service: OCRService = Depends(get_ocr_service)
+):
+    """Queue an invoice image or PDF (multipart field ``file``) for extraction; poll the returned job"""
+    content_length = request.headers.get("content-length")
+    job = await ocr_service.submit(
+        _business_id(profile),
+        request.stream(),
+        request.headers.get("content-type", ""),
+        int(content_length) if content_length and content_length.isdigit() else None
+    )
+    return {
+        "success": True,
+        "data": job.to_dict()
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    profile: Dict = Depends(get_current_profile),
+    ocr_service: OCRService = Depends(get_ocr_service)
+):
+    """Extraction job status"""
+    job = ocr_service.get_job(job_id, _business_id(profile))
+    return {
+        "success": True,
+        "data": job.to_dict()
+    }
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    profile: Dict = Depends(get_current_profile),
+    ocr_service: OCRService = Depends(get_ocr_service)
+):
+    """Extracted text and invoice fields of a finished job"""
+    job = ocr_service.get_job(job_id, _business_id(profile))
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Extraction failed: {job.error}"
+        )
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}"
+        )
+    return {
+        "success": True,
+        "data": {**job.to_dict(), "result": job.result}
+    }
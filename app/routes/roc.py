@@ -1,7 +1,38 @@
-from fastapi import APIRouter
+from typing import Dict
 
-router = APIRouter(prefix="/api/roc", tags=["ROC"])
+from fastapi import APIRouter, Depends, Query
+from app.config import settings
+from app.dependencies import get_current_profile, get_roc_service
+from app.services.roc_service import ROCService
+from app.utils.responses import JSONRoute
+
+router = APIRouter(prefix="/api/roc", tags=["ROC"], route_class=JSONRoute)
 
 @router.get("/")
 async def get_roc():
     return {"message": "ROC API"}
+
+@router.get("/companies")
+async def search_companies(
+    name: str = Query(..., min_length=2, description="Company name prefix"),
+    limit: int = Query(settings.ROC_SEARCH_LIMIT, ge=1, le=settings.ROC_SEARCH_MAX_LIMIT),
+    profile: Dict = Depends(get_current_profile),
+    roc_service: ROCService = Depends(get_roc_service)
+):
+    """Companies whose name starts with ``name`` (case and punctuation ignored)"""
+    return {
+        "success": True,
+        "data": roc_service.search(name, limit)
+    }
+
+@router.get("/companies/{cin}")
+async def get_company(
+    cin: str,
+    profile: Dict = Depends(get_current_profile),
+    roc_service: ROCService = Depends(get_roc_service)
+):
+    """Company master record by CIN"""
+    return {
+        "success": True,
+        "data": roc_service.get_company(cin)
+    }
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
+from app.utils.responses import JSONRoute
 
-router = APIRouter(prefix="/api/settings", tags=["Settings"])
+router = APIRouter(prefix="/api/settings", tags=["Settings"], route_class=JSONRoute)
 
 @router.get("/")
 async def get_settings():
@@ -1,7 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from typing import Dict
 
-router = APIRouter(prefix="/api/tds", tags=["TDS"])
+from app.dependencies import get_current_profile, get_tds_service
+from app.models.compliance import TDSBatch
+from app.services.tds_service import TDS_SECTIONS, TDSService
+from app.utils.responses import JSONRoute
+
+router = APIRouter(prefix="/api/tds", tags=["TDS"], route_class=JSONRoute)
 
 @router.get("/")
 async def get_tds():
     return {"message": "TDS API"}
+
+@router.get("/sections")
+async def get_tds_sections():
+    """Sections the engine knows, with rates (percent) and thresholds (rupees)"""
+    return {
+        "success": True,
+        "data": [section._asdict() for section in TDS_SECTIONS.values()]
+    }
+
+@router.post("/compute")
+async def compute_tds(
+    batch: TDSBatch,
+    profile: Dict = Depends(get_current_profile),
+    tds_service: TDSService = Depends(get_tds_service)
+):
+    """Section-wise TDS for a batch of vendor payments with FY-to-date thresholds per PAN"""
+    result = await tds_service.compute(batch.payments, batch.opening)
+    return {
+        "success": True,
+        "data": result
+    }
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.database import AsyncSupabaseClient
+from app.utils.mock_db import MockDB
+
+logger = logging.getLogger(__name__)
+
+class ActivityWriter:
+    """Write-behind buffer for ``users.last_login``.
+
+    Logins call ``record_login`` and return without a backend write. Pending
+    timestamps are coalesced per user and flushed every
+    ``ACTIVITY_FLUSH_INTERVAL_SECONDS`` (or as soon as ``ACTIVITY_MAX_BATCH``
+    users are waiting) as one bulk write: the ``touch_last_login`` RPC on
+    Supabase, a single journal entry on MockDB. ``stop`` flushes whatever is
+    left, so nothing recorded before shutdown is lost.
+
+    Listeners registered with ``subscribe`` get ``profile_changed(business_id)``
+    for each flushed user's business once the write has landed.
+    """
+
+    def __init__(
+        self,
+        db: Optional[AsyncSupabaseClient] = None,
+        mock_db: Optional[MockDB] = None,
+        interval: float = settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+        max_batch: int = settings.ACTIVITY_MAX_BATCH
+    ):
+        self.db = db
+        self.mock_db = mock_db
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, str] = {}
+        self._businesses: Dict[str, str] = {}  # user id -> business id, for listeners
+        self._listeners = []
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.recorded = 0
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+        self.failed_batches = 0
+
+    def subscribe(self, listener):
+        """Register an object with a profile_changed hook"""
+        self._listeners.append(listener)
+
+    def record_login(self, user_id: str, timestamp: str, business_id: Optional[str] = None):
+        """Queue a last_login update; later timestamps win"""
+        current = self._pending.get(user_id)
+        if current is None or timestamp > current:
+            self._pending[user_id] = timestamp
+        if business_id:
+            self._businesses[user_id] = business_id
+        self.recorded += 1
+        if len(self._pending) >= self.max_batch and self._wake is not None:
+            self._wake.set()
+
+    async def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Let the loop finish a flush it is in the middle of rather than
+        # cancelling it after the batch has left _pending
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write all pending updates in one backend call"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        businesses, self._businesses = self._businesses, {}
+        try:
+            if self.db is not None:
+                await self.db.rpc(
+                    "touch_last_login",
+                    {"updates": [{"id": user_id, "last_login": ts} for user_id, ts in batch.items()]},
+                    admin=True
+                )
+            elif self.mock_db is not None:
+                self.mock_db.update_users_last_login(batch)
+            self.flushed_rows += len(batch)
+            self.flushed_batches += 1
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} last_login updates: {e}")
+            self.failed_batches += 1
+            # Put the batch back without overwriting anything newer
+            for user_id, timestamp in batch.items():
+                self.record_login(user_id, timestamp, businesses.get(user_id))
+                self.recorded -= 1
+            return
+        for business_id in set(businesses.values()):
+            for listener in self._listeners:
+                listener.profile_changed(business_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushed_rows": self.flushed_rows,
+            "flushed_batches": self.flushed_batches,
+            "failed_batches": self.failed_batches
+        }
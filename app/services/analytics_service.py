@@ -0,0 +1,269 @@
+import asyncio
+import logging
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models.compliance import DeadlineStatus
+from app.services.deadline_service import Deadline, DeadlineService
+from app.services.gst_service import GSTService
+from app.services.penalty_service import PenaltyService
+
+logger = logging.getLogger(__name__)
+
+# Summed per (business, period); ratios are derived when a trend is read
+METRICS = (
+    "tax_liability", "tax_paid", "itc_available", "itc_claimed", "gst_filings",
+    "filed_on_time", "filed_late", "missed", "penalties_paid"
+)
+_METRIC_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+_COUNTS = ("gst_filings", "filed_on_time", "filed_late", "missed")
+# gst_filings column -> metric
+_FILING_AMOUNTS = {
+    "total_tax_liability": "tax_liability",
+    "payment_made": "tax_paid",
+    "itc_available": "itc_available",
+    "itc_claimed": "itc_claimed",
+}
+FILING_COLUMNS = ("id", "business_id", "period_year", "period_month") + tuple(_FILING_AMOUNTS)
+
+GRANULARITIES = ("month", "quarter", "fy")
+
+# How a deadline counts towards the on-time rate
+_NOT_DUE, _MISSED, _ON_TIME, _LATE = 0, 1, 2, 3
+_OUTCOME_METRIC = {_MISSED: "missed", _ON_TIME: "filed_on_time", _LATE: "filed_late"}
+
+def period_keys(year: int, month: int) -> Tuple[int, int, int]:
+    """Month, financial-year quarter and financial-year keys for a calendar month"""
+    fy = year if month >= 4 else year - 1
+    return year * 12 + month - 1, fy * 4 + (month - 4) % 12 // 3, fy
+
+def _fy_label(fy: int) -> str:
+    return f"FY{fy}-{(fy + 1) % 100:02d}"
+
+def _period(granularity: str, key: int) -> Dict:
+    if granularity == "month":
+        year, month = divmod(key, 12)
+        return {"period": f"{year}-{month + 1:02d}", "start": date(year, month + 1, 1).isoformat()}
+    if granularity == "quarter":
+        fy, quarter = divmod(key, 4)
+        year, month = divmod(fy * 12 + 3 + quarter * 3, 12)
+        return {"period": f"{_fy_label(fy)} Q{quarter + 1}", "start": date(year, month + 1, 1).isoformat()}
+    return {"period": _fy_label(key), "start": date(key, 4, 1).isoformat()}
+
+def _ratio(part: float, whole: float) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+def _completed_day(deadline: Deadline) -> int:
+    # Rows completed without a timestamp count as filed on the due date
+    if not deadline.completed_at:
+        return deadline.due
+    return date.fromisoformat(str(deadline.completed_at)[:10]).toordinal()
+
+
+class Rollup:
+    """Metric sums for one granularity, a row per (business, period).
+
+    Rows are appended as periods first see an event and never move; each
+    metric is an ``array`` column, so reading a trend gathers a few rows.
+    """
+
+    def __init__(self, granularity: str):
+        self.granularity = granularity
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self._columns = [array("d") for _ in METRICS]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, business: int, period: int, deltas: Dict[str, float]):
+        row = self._rows.get((business, period))
+        if row is None:
+            row = self._rows[(business, period)] = len(self._rows)
+            for column in self._columns:
+                column.append(0.0)
+        for metric, delta in deltas.items():
+            self._columns[_METRIC_INDEX[metric]][row] += delta
+
+    def read(self, business: int, periods: Iterable[int]) -> np.ndarray:
+        """``[period, metric]`` sums; periods without events are zero"""
+        rows = np.array([self._rows.get((business, period), -1) for period in periods], dtype=np.int64)
+        present = rows >= 0
+        values = np.zeros((len(rows), len(METRICS)))
+        for i, column in enumerate(self._columns):
+            values[present, i] = np.frombuffer(column, dtype=np.float64)[rows[present]]
+        return values
+
+
+class AnalyticsService:
+    """Month, quarter and financial-year compliance trends per business.
+
+    Compliance events are kept in columnar ``array``s: GST filings by slot
+    (period and amounts) and deadlines by ``seq`` (how each counts towards
+    the on-time rate, and the penalty paid when it was filed late). Every
+    event adds its change to the matching row of all three ``Rollup``s as
+    it arrives, so a trend over several years reads one row per period
+    instead of scanning raw filings.
+
+    Filings are bucketed by return period, deadlines by due month. Events
+    come from ``GSTService`` and ``DeadlineService`` subscriptions;
+    ``ensure_business`` loads a business's filing history the first time
+    it is asked for. Filing events are applied from the moment that load
+    starts, so a filing imported while the history is being read is kept;
+    events for businesses never asked for are left to their load.
+    """
+
+    def __init__(
+        self,
+        deadline_service: DeadlineService,
+        penalty_service: PenaltyService,
+        gst_service: GSTService
+    ):
+        self.deadline_service = deadline_service
+        self.penalty_service = penalty_service
+        self.gst_service = gst_service
+        self.rollups = {granularity: Rollup(granularity) for granularity in GRANULARITIES}
+        self._business_codes: Dict[str, int] = {}
+        self._loaded: Set[str] = set()
+        self._tracked: Set[str] = set()  # taking filing events, loaded or loading
+        self._load_lock = asyncio.Lock()
+        # Filing columns, by slot
+        self._filing_slots: Dict[str, int] = {}
+        self._filing_business = array("i")
+        self._filing_month = array("i")
+        self._filing_amounts = {metric: array("d") for metric in _FILING_AMOUNTS.values()}
+        # Deadline columns, by seq
+        self._outcome = array("b")
+        self._penalty = array("d")
+        for deadline in deadline_service.records:
+            self.deadline_added(deadline)
+        deadline_service.subscribe(self)
+        gst_service.subscribe(self)
+
+    def _code(self, business_id: str) -> int:
+        return self._business_codes.setdefault(business_id, len(self._business_codes))
+
+    def _roll(self, business: int, month_key: int, deltas: Dict[str, float]):
+        year, month = divmod(month_key, 12)
+        for rollup, period in zip(self.rollups.values(), period_keys(year, month + 1)):
+            rollup.add(business, period, deltas)
+
+    # GSTService listener hooks
+    def filings_added(self, rows: Iterable[Dict]):
+        for row in rows:
+            if row["business_id"] in self._tracked and row["id"] not in self._filing_slots:
+                self._add_filing(row)
+
+    def filing_updated(self, row: Dict, changes: Dict):
+        if row["business_id"] not in self._tracked:
+            return
+        slot = self._filing_slots.get(row["id"])
+        if slot is None:
+            self._add_filing({**row, **changes})
+            return
+        deltas = {}
+        for column, metric in _FILING_AMOUNTS.items():
+            if column in changes:
+                value = float(changes[column] or 0.0)
+                deltas[metric] = value - self._filing_amounts[metric][slot]
+                self._filing_amounts[metric][slot] = value
+        self._roll(self._filing_business[slot], self._filing_month[slot], deltas)
+
+    def _add_filing(self, row: Dict):
+        business = self._code(row["business_id"])
+        month_key = int(row["period_year"]) * 12 + int(row["period_month"]) - 1
+        self._filing_slots[row["id"]] = len(self._filing_business)
+        self._filing_business.append(business)
+        self._filing_month.append(month_key)
+        deltas = {"gst_filings": 1.0}
+        for column, metric in _FILING_AMOUNTS.items():
+            value = float(row.get(column) or 0.0)
+            self._filing_amounts[metric].append(value)
+            deltas[metric] = value
+        self._roll(business, month_key, deltas)
+
+    # DeadlineService listener hooks
+    def deadline_added(self, deadline: Deadline):
+        if deadline.seq != len(self._outcome):
+            raise RuntimeError(f"Analytics columns out of step at deadline {deadline.seq}")
+        self._outcome.append(_NOT_DUE)
+        self._penalty.append(0.0)
+        if deadline.status == DeadlineStatus.COMPLETED.value:
+            self._filed(deadline)
+        elif deadline.status == DeadlineStatus.OVERDUE.value:
+            self._set_outcome(deadline, _MISSED)
+
+    def deadline_completed(self, deadline: Deadline, was_overdue: bool):
+        self._filed(deadline)
+
+    def deadline_overdue(self, deadline: Deadline):
+        self._set_outcome(deadline, _MISSED)
+
+    def _filed(self, deadline: Deadline):
+        day = _completed_day(deadline)
+        self._set_outcome(
+            deadline, _ON_TIME if day <= deadline.due else _LATE, self.penalty_service.penalty_on(deadline, day)
+        )
+
+    def _set_outcome(self, deadline: Deadline, outcome: int, penalty: float = 0.0):
+        previous = self._outcome[deadline.seq]
+        deltas = {_OUTCOME_METRIC[outcome]: 1.0, "penalties_paid": penalty - self._penalty[deadline.seq]}
+        if previous != _NOT_DUE:
+            deltas[_OUTCOME_METRIC[previous]] = deltas.get(_OUTCOME_METRIC[previous], 0.0) - 1.0
+        self._outcome[deadline.seq] = outcome
+        self._penalty[deadline.seq] = penalty
+        due = date.fromordinal(deadline.due)
+        self._roll(self._code(deadline.business_id), due.year * 12 + due.month - 1, deltas)
+
+    # Queries
+    async def ensure_business(self, business_id: str):
+        """Load a business's GST filing history into the store once"""
+        if business_id in self._loaded:
+            return
+
+        async with self._load_lock:
+            if business_id in self._loaded:
+                return
+            # Take events before reading, then merge the history by id:
+            # filings that arrived while it was in flight are already in
+            # _filing_slots and are skipped
+            self._tracked.add(business_id)
+            try:
+                rows = await self.gst_service.all_filings(business_id, FILING_COLUMNS)
+            except Exception:
+                self._tracked.discard(business_id)
+                raise
+            self.filings_added(rows)
+            self._loaded.add(business_id)
+        logger.info(f"Analytics loaded {len(rows)} GST filings for business {business_id}")
+
+    def trends(
+        self,
+        business_id: str,
+        granularity: str,
+        periods: int,
+        today: Optional[date] = None
+    ) -> List[Dict]:
+        """The last ``periods`` periods up to the one containing ``today``, oldest first"""
+        today = today or self.deadline_service.today
+        end = period_keys(today.year, today.month)[GRANULARITIES.index(granularity)]
+        keys = range(end - periods + 1, end + 1)
+        business = self._business_codes.get(business_id)
+        values = (
+            self.rollups[granularity].read(business, keys) if business is not None
+            else np.zeros((len(keys), len(METRICS)))
+        )
+        trend = []
+        for key, row in zip(keys, values.tolist()):
+            sums = dict(zip(METRICS, row))
+            due = sums["filed_on_time"] + sums["filed_late"] + sums["missed"]
+            trend.append({
+                **_period(granularity, key),
+                **{metric: int(value) if metric in _COUNTS else round(value, 2) for metric, value in sums.items()},
+                "deadlines_due": int(due),
+                "on_time_rate": _ratio(sums["filed_on_time"], due),
+                "itc_utilisation": _ratio(sums["itc_claimed"], sums["itc_available"])
+            })
+        return trend
@@ -1,20 +1,19 @@
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 import uuid
 from fastapi import HTTPException, status
-try:
-    from supabase import Client
-except ImportError:
-    class Client: pass
-
 
+from app.config import settings
 from app.models.user import UserCreate, UserResponse, BusinessResponse
-from app.database import supabase, supabase_admin
+from app.database import AsyncSupabaseClient, async_supabase
+from app.services.activity_writer import ActivityWriter
+from app.utils.cache import ExpiringLRUCache
 from app.utils.mock_db import MockDB
 from app.utils.security import (
-    hash_password, 
-    verify_password, 
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     verify_token,
     create_refresh_token
@@ -22,32 +21,87 @@ from app.utils.security import (
 
 logger = logging.getLogger(__name__)
 
+# PostgREST embed of the user's business; the hint picks users.business_id
+# over the reverse businesses.user_id relationship
+PROFILE_COLUMNS = "*,business:businesses!business_id(*)"
+
+def _claims(user_id: str, business_id: Optional[str]) -> Dict:
+    """Token claims; ``bid`` lets read endpoints check ETags before loading the profile"""
+    claims = {"sub": user_id}
+    if business_id:
+        claims["bid"] = business_id
+    return claims
+
 class AuthService:
-    def __init__(self):
-        self.client: Client = supabase
-        self.admin_client: Client = supabase_admin
-        self.use_mock = self.client is None or self.admin_client is None
+    """Sign-up, login and cached profile reads.
+
+    Listeners registered with ``subscribe`` are told when a user's profile
+    data changes (``profile_changed``), e.g. on login and again when its
+    last_login write is flushed.
+    """
+
+    def __init__(
+        self,
+        db: Optional[AsyncSupabaseClient] = None,
+        mock_db: Optional[MockDB] = None,
+        activity_writer: Optional[ActivityWriter] = None
+    ):
+        self.db: AsyncSupabaseClient = db or async_supabase
+        self.use_mock = self.db is None
         
         if self.use_mock:
-            self.mock_db = MockDB()
+            self.mock_db = mock_db or MockDB()
             logger.warning("Supabase client not available. Using Mock DB.")
+
+        # last_login bookkeeping is written behind the response in batches
+        self.activity_writer = activity_writer or ActivityWriter(
+            db=None if self.use_mock else self.db,
+            mock_db=self.mock_db if self.use_mock else None
+        )
+
+        # Read-through caches of backend rows, keyed by user id and business id
+        self.user_cache = ExpiringLRUCache(maxsize=settings.PROFILE_CACHE_SIZE)
+        self.business_cache = ExpiringLRUCache(maxsize=settings.PROFILE_CACHE_SIZE)
+        self._listeners = []
+        self.activity_writer.subscribe(self)
+
+    def subscribe(self, listener):
+        """Register an object with a profile_changed hook"""
+        self._listeners.append(listener)
+
+    # ActivityWriter listener hook: a last_login flush landed
+    def profile_changed(self, business_id: str):
+        self._profile_changed(business_id)
+
+    def _profile_changed(self, business_id: Optional[str]):
+        if business_id:
+            for listener in self._listeners:
+                listener.profile_changed(business_id)
+
+    async def warm_up(self):
+        """Open the backend connection pool and start background writers"""
+        await self.activity_writer.start()
+        if not self.use_mock:
+            await self.db.ping()
+
+    async def close(self):
+        """Flush pending background writes"""
+        await self.activity_writer.stop()
     
     async def register_user(self, user_data: UserCreate) -> Dict:
         """Register a new user with business details"""
         if self.use_mock:
-            return self._register_user_mock(user_data)
+            return await self._register_user_mock(user_data)
 
         try:
             # Check if user already exists
-            existing_user = self.client.auth.sign_up({
-                "email": user_data.email,
-                "password": user_data.password
-            })
+            existing_user = await self.db.sign_up(user_data.email, user_data.password)
+            auth_user = existing_user.get("user")
             
-            if existing_user.user:
+            if auth_user:
                 # Create business profile
                 business_data = {
-                    "user_id": existing_user.user.id,
+                    "user_id": auth_user["id"],
                     "legal_name": user_data.business_name,
                     "trade_name": user_data.business_name,
                     "gstin": user_data.gstin,
@@ -56,27 +110,29 @@ class AuthService:
                 }
                 
                 # Use admin client to bypass RLS for initial creation
-                business_response = self.admin_client.table("businesses").insert(business_data).execute()
+                business_rows = await self.db.insert("businesses", business_data, admin=True)
                 
                 # Create user profile
                 user_profile = {
-                    "id": existing_user.user.id,
+                    "id": auth_user["id"],
                     "email": user_data.email,
                     "full_name": user_data.full_name,
                     "phone": user_data.phone,
-                    "business_id": business_response.data[0]["id"],
+                    "business_id": business_rows[0]["id"],
                     "created_at": datetime.utcnow().isoformat()
                 }
                 
-                self.admin_client.table("users").insert(user_profile).execute()
+                await self.db.insert("users", user_profile, admin=True)
+                self.invalidate_profile(user_id=auth_user["id"], business_id=business_rows[0]["id"])
                 
                 # Create access token
-                access_token = create_access_token(data={"sub": existing_user.user.id})
-                refresh_token = create_refresh_token(data={"sub": existing_user.user.id})
+                claims = _claims(auth_user["id"], business_rows[0]["id"])
+                access_token = create_access_token(data=claims)
+                refresh_token = create_refresh_token(data=claims)
                 
                 return {
-                    "user_id": existing_user.user.id,
-                    "business_id": business_response.data[0]["id"],
+                    "user_id": auth_user["id"],
+                    "business_id": business_rows[0]["id"],
                     "access_token": access_token,
                     "refresh_token": refresh_token,
                     "user_name": user_data.full_name,
@@ -90,7 +146,7 @@ class AuthService:
                 detail=f"Registration failed: {str(e)}"
             )
 
-    def _register_user_mock(self, user_data: UserCreate) -> Dict:
+    async def _register_user_mock(self, user_data: UserCreate) -> Dict:
         # Check existing
         if self.mock_db.get_user_by_email(user_data.email):
             raise HTTPException(
@@ -115,7 +171,7 @@ class AuthService:
         self.mock_db.create_business(business_data)
 
         # Create User
-        hashed = hash_password(user_data.password)
+        hashed = await hash_password_async(user_data.password)
         user_profile = {
             "id": user_id,
             "email": user_data.email,
@@ -129,8 +185,8 @@ class AuthService:
         self.mock_db.create_user(user_profile)
 
         # Tokens
-        access_token = create_access_token(data={"sub": user_id})
-        refresh_token = create_refresh_token(data={"sub": user_id})
+        access_token = create_access_token(data=_claims(user_id, business_id))
+        refresh_token = create_refresh_token(data=_claims(user_id, business_id))
 
         return {
             "user_id": user_id,
@@ -144,35 +200,38 @@ class AuthService:
     async def authenticate_user(self, email: str, password: str) -> Dict:
         """Authenticate user with email and password"""
         if self.use_mock:
-            return self._authenticate_user_mock(email, password)
+            return await self._authenticate_user_mock(email, password)
 
         try:
             # Use Supabase Auth
-            auth_response = self.client.auth.sign_in_with_password({
-                "email": email,
-                "password": password
-            })
+            session = await self.db.sign_in_with_password(email, password)
+            auth_user = session.get("user")
             
-            if auth_response.user:
-                # Update last login
-                self.client.table("users").update({
-                    "last_login": datetime.utcnow().isoformat()
-                }).eq("id", auth_response.user.id).execute()
-                
-                # Get user profile
-                user_profile = self.client.table("users").select("*").eq("id", auth_response.user.id).single().execute()
+            if auth_user:
+                user_id = auth_user["id"]
+                supabase_token = session.get("access_token")
+                now = datetime.utcnow().isoformat()
+
+                # Fetch user + business in one joined read; last_login is
+                # written behind the response
+                user_profile, business = await self._fetch_profile(user_id, access_token=supabase_token)
+                self.activity_writer.record_login(user_id, now, user_profile.get("business_id"))
+                # The cached row is this dict, so /me sees the new timestamp
+                user_profile["last_login"] = now
+                self._profile_changed(user_profile.get("business_id"))
                 
                 # Create tokens
-                access_token = create_access_token(data={"sub": auth_response.user.id})
-                refresh_token = create_refresh_token(data={"sub": auth_response.user.id})
+                claims = _claims(user_id, user_profile.get("business_id"))
+                access_token = create_access_token(data=claims)
+                refresh_token = create_refresh_token(data=claims)
                 
                 return {
-                    "user_id": auth_response.user.id,
-                    "business_id": user_profile.data.get("business_id"),
+                    "user_id": user_id,
+                    "business_id": user_profile.get("business_id"),
                     "access_token": access_token,
                     "refresh_token": refresh_token,
-                    "user_name": user_profile.data.get("full_name"),
-                    "business_name": self._get_business_name(user_profile.data.get("business_id"))
+                    "user_name": user_profile.get("full_name"),
+                    "business_name": (business or {}).get("trade_name", "Business")
                 }
             else:
                 raise HTTPException(
@@ -187,19 +246,21 @@ class AuthService:
                 detail="Invalid email or password"
             )
 
-    def _authenticate_user_mock(self, email: str, password: str) -> Dict:
+    async def _authenticate_user_mock(self, email: str, password: str) -> Dict:
         user = self.mock_db.get_user_by_email(email)
-        if not user or not verify_password(password, user["hashed_password"]):
+        if not user or not await verify_password_async(password, user["hashed_password"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        # Update last login
-        self.mock_db.update_user_last_login(user["id"], datetime.utcnow().isoformat())
+        # Update last login (written behind the response)
+        self.activity_writer.record_login(user["id"], datetime.utcnow().isoformat(), user["business_id"])
+        self._profile_changed(user["business_id"])
         
-        access_token = create_access_token(data={"sub": user["id"]})
-        refresh_token = create_refresh_token(data={"sub": user["id"]})
+        claims = _claims(user["id"], user["business_id"])
+        access_token = create_access_token(data=claims)
+        refresh_token = create_refresh_token(data=claims)
         
         business = self.mock_db.get_business_by_id(user["business_id"])
         business_name = business["trade_name"] if business else "Business"
@@ -219,18 +280,18 @@ class AuthService:
             return self._get_user_profile_mock(user_id)
 
         try:
-            # Get user data
-            user_response = self.client.table("users").select("*").eq("id", user_id).single().execute()
-            user_data = user_response.data
+            user_data = self.user_cache.get(user_id)
+            business_data = None
+            if user_data is not None:
+                business_data = self.business_cache.get(user_data.get("business_id"))
             
-            # Get business data
-            business_id = user_data.get("business_id")
-            business_response = self.client.table("businesses").select("*").eq("id", business_id).single().execute()
-            business_data = business_response.data
+            if user_data is None or business_data is None:
+                # Caller's JWT is already verified, so read with the service role
+                user_data, business_data = await self._fetch_profile(user_id, admin=True)
             
             return {
-                "user": user_data,
-                "business": business_data
+                "user": dict(user_data),
+                "business": dict(business_data) if business_data else None
             }
         except Exception as e:
             logger.error(f"Failed to fetch user profile: {str(e)}")
@@ -270,8 +331,9 @@ class AuthService:
                 )
             
             # Create new tokens
-            new_access_token = create_access_token(data={"sub": user_id})
-            new_refresh_token = create_refresh_token(data={"sub": user_id})
+            claims = _claims(user_id, payload.get("bid"))
+            new_access_token = create_access_token(data=claims)
+            new_refresh_token = create_refresh_token(data=claims)
             
             return {
                 "access_token": new_access_token,
@@ -285,14 +347,28 @@ class AuthService:
                 detail="Invalid refresh token"
             )
     
-    def _get_business_name(self, business_id: str) -> str:
-        """Helper to get business name"""
-        if self.use_mock:
-           biz = self.mock_db.get_business_by_id(business_id)
-           return biz["trade_name"] if biz else "Business"
+    async def _fetch_profile(
+        self,
+        user_id: str,
+        admin: bool = False,
+        access_token: Optional[str] = None
+    ) -> Tuple[Dict, Optional[Dict]]:
+        """Fetch the user row and its business in one round trip and cache both"""
+        row = await self.db.select(
+            "users", columns=PROFILE_COLUMNS, filters={"id": user_id},
+            single=True, admin=admin, access_token=access_token
+        )
+        business = row.pop("business", None)
+        expires_at = time.time() + settings.PROFILE_CACHE_TTL_SECONDS
+        self.user_cache.set(user_id, row, expires_at)
+        if business and business.get("id"):
+            self.business_cache.set(business["id"], business, expires_at)
+        return row, business
 
-        try:
-            response = self.client.table("businesses").select("trade_name").eq("id", business_id).single().execute()
-            return response.data.get("trade_name", "Business")
-        except:
-            return "Business"
+    def invalidate_profile(self, user_id: Optional[str] = None, business_id: Optional[str] = None):
+        """Drop cached rows after a write so the next read goes to the backend"""
+        if user_id:
+            self.user_cache.pop(user_id)
+        if business_id:
+            self.business_cache.pop(business_id)
+            self._profile_changed(business_id)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.models.compliance import DeadlineStatus
+from app.services.deadline_service import Deadline, DeadlineService
+from app.services.penalty_service import PenaltyService
+
+logger = logging.getLogger(__name__)
+
+_COUNTER_FIELDS = ("upcoming", "overdue", "completed_on_time", "completed_late")
+
+class DashboardCounters:
+    """Materialized deadline counts for one business"""
+
+    __slots__ = _COUNTER_FIELDS + ("recent",)
+
+    def __init__(self):
+        self.upcoming = 0
+        self.overdue = 0
+        self.completed_on_time = 0
+        self.completed_late = 0
+        self.recent: Deque[Dict] = deque(maxlen=settings.DASHBOARD_RECENT_ACTIVITIES)
+
+    def as_tuple(self) -> tuple:
+        return tuple(getattr(self, field) for field in _COUNTER_FIELDS)
+
+def _completed_on_time(deadline: Deadline) -> bool:
+    if not deadline.completed_at:
+        return True
+    return date.fromisoformat(str(deadline.completed_at)[:10]).toordinal() <= deadline.due
+
+def _count(counters: DashboardCounters, deadline: Deadline, delta: int = 1):
+    if deadline.status == DeadlineStatus.COMPLETED.value:
+        if _completed_on_time(deadline):
+            counters.completed_on_time += delta
+        else:
+            counters.completed_late += delta
+    elif deadline.status == DeadlineStatus.OVERDUE.value:
+        counters.overdue += delta
+    else:
+        counters.upcoming += delta
+
+
+class DashboardService:
+    """Per-business dashboard aggregates kept current from deadline events.
+
+    Subscribes to ``DeadlineService`` and adjusts each business's
+    ``DashboardCounters`` as deadlines are created, completed or go overdue,
+    so ``metrics`` reads a handful of counters instead of scanning the
+    business's deadlines. Penalty totals from ``PenaltyService`` are kept
+    per business as well: a deadline added to or completed for a business
+    drops its totals, the next read reassesses that business alone, and
+    since accrual moves with the date they are all reassessed in one pass
+    at rollover. ``rollover`` runs once a day: it advances the deadline
+    engine, then rebuilds every counter from one full scan and logs any
+    drift the incremental counters had from it (what ``verify`` reports).
+    """
+
+    def __init__(self, deadline_service: DeadlineService, penalty_service: PenaltyService):
+        self.deadline_service = deadline_service
+        self.penalty_service = penalty_service
+        self._counters: Dict[str, DashboardCounters] = {}
+        self._penalties: Dict[str, Dict] = {}  # PenaltyAssessment totals as of _penalty_day
+        self._penalty_day: Optional[date] = None
+        self._rollover_task: Optional[asyncio.Task] = None
+        deadline_service.subscribe(self)
+
+    def _get(self, business_id: str) -> DashboardCounters:
+        counters = self._counters.get(business_id)
+        if counters is None:
+            counters = self._counters[business_id] = DashboardCounters()
+        return counters
+
+    def _penalty_totals(self, business_id: str) -> Dict:
+        today = self.deadline_service.today
+        if today != self._penalty_day:
+            self._penalties, self._penalty_day = {}, today
+        totals = self._penalties.get(business_id)
+        if totals is None:
+            totals = self.penalty_service.assess([business_id], today).totals()[business_id]
+            self._penalties[business_id] = totals
+        return totals
+
+    # DeadlineService listener hooks
+    def deadline_added(self, deadline: Deadline):
+        _count(self._get(deadline.business_id), deadline)
+        self._penalties.pop(deadline.business_id, None)
+
+    def deadline_completed(self, deadline: Deadline, was_overdue: bool):
+        self._penalties.pop(deadline.business_id, None)
+        counters = self._get(deadline.business_id)
+        if was_overdue:
+            counters.overdue -= 1
+        else:
+            counters.upcoming -= 1
+        _count(counters, deadline)
+        counters.recent.appendleft({
+            "type": "deadline_completed",
+            "deadline_id": deadline.id,
+            "description": deadline.description,
+            "due_date": date.fromordinal(deadline.due).isoformat(),
+            "completed_at": deadline.completed_at,
+            "on_time": _completed_on_time(deadline)
+        })
+
+    def deadline_overdue(self, deadline: Deadline):
+        counters = self._get(deadline.business_id)
+        counters.upcoming -= 1
+        counters.overdue += 1
+
+    # Reads
+    def metrics(self, business_id: str) -> Dict:
+        """``DashboardMetrics``-shaped summary for one business"""
+        counters = self._get(business_id)
+        completed = counters.completed_on_time + counters.completed_late
+        assessed = completed + counters.overdue
+        health = round(100.0 * counters.completed_on_time / assessed, 1) if assessed else 100.0
+        penalties = self._penalty_totals(business_id)
+
+        deadlines = self.deadline_service
+        return {
+            "upcoming_deadlines": deadlines.count_upcoming(business_id, settings.DASHBOARD_UPCOMING_DAYS),
+            "compliance_health": health,
+            "penalty_risk": penalties["penalty_risk"],
+            "penalty_liability": {
+                "accrued_late_fees": penalties["accrued_late_fees"],
+                "accrued_interest": penalties["accrued_interest"],
+                "accrued_total": penalties["accrued_total"],
+                "projected_total": penalties["projected_total"],
+                "projection_days": settings.PENALTY_PROJECTION_DAYS
+            },
+            "recent_activities": list(counters.recent),
+            "quick_stats": {
+                "open": counters.upcoming + counters.overdue,
+                "overdue": counters.overdue,
+                "completed": completed,
+                "completed_late": counters.completed_late,
+                "due_this_week": deadlines.count_upcoming(business_id, 7)
+            }
+        }
+
+    # Consistency
+    def recompute(self, business_ids: Optional[Iterable[str]] = None) -> Dict[str, DashboardCounters]:
+        """Counters rebuilt from a full scan of the deadline engine"""
+        wanted = set(business_ids) if business_ids is not None else None
+        fresh: Dict[str, DashboardCounters] = {}
+        for deadline in self.deadline_service.records:
+            if wanted is not None and deadline.business_id not in wanted:
+                continue
+            counters = fresh.get(deadline.business_id)
+            if counters is None:
+                counters = fresh[deadline.business_id] = DashboardCounters()
+            _count(counters, deadline)
+        return fresh
+
+    def verify(self, business_ids: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Businesses whose incremental counters differ from a full recomputation"""
+        return self._mismatches(self.recompute(business_ids), business_ids)
+
+    def _mismatches(
+        self,
+        fresh: Dict[str, DashboardCounters],
+        business_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        ids = set(fresh) | (set(business_ids) if business_ids is not None else set(self._counters))
+        mismatches = []
+        for business_id in ids:
+            current = self._counters.get(business_id, DashboardCounters()).as_tuple()
+            expected = fresh.get(business_id, DashboardCounters()).as_tuple()
+            if current != expected:
+                mismatches.append({
+                    "business_id": business_id,
+                    "counters": dict(zip(_COUNTER_FIELDS, current)),
+                    "recomputed": dict(zip(_COUNTER_FIELDS, expected))
+                })
+        return mismatches
+
+    async def rollover(self, today: Optional[date] = None):
+        """Daily rollover: lapse overdue deadlines, then rebuild all counters"""
+        lapsed = await self.deadline_service.rollover(today)
+        fresh = self.recompute()
+        mismatches = self._mismatches(fresh)
+        if mismatches:
+            logger.warning(f"Dashboard counters drifted for {len(mismatches)} businesses; rebuilding")
+        for business_id, counters in fresh.items():
+            previous = self._counters.get(business_id)
+            if previous is not None:
+                counters.recent.extend(previous.recent)
+        self._counters = fresh
+        self._penalty_day = self.deadline_service.today
+        self._penalties = self.penalty_service.assess(today=self._penalty_day).totals()
+        logger.info(f"Dashboard rollover: {len(lapsed)} deadlines now overdue")
+
+    async def _run_daily_rollover(self):
+        while True:
+            now = datetime.now()
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            await asyncio.sleep((next_midnight - now).total_seconds())
+            try:
+                await self.rollover()
+            except Exception as e:
+                logger.error(f"Dashboard rollover failed: {e}")
+
+    def start(self):
+        if self._rollover_task is None:
+            self._rollover_task = asyncio.create_task(self._run_daily_rollover())
+
+    async def stop(self):
+        if self._rollover_task is not None:
+            self._rollover_task.cancel()
+            try:
+                await self._rollover_task
+            except asyncio.CancelledError:
+                pass
+            self._rollover_task = None
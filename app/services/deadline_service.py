@@ -0,0 +1,500 @@
+import asyncio
+import bisect
+import logging
+import uuid
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.database import AsyncSupabaseClient
+from app.models.compliance import ComplianceType, DeadlineStatus
+from app.utils.mock_db import MockDB
+
+logger = logging.getLogger(__name__)
+
+# Rule-generated deadline ids are uuid5(business, subtype, period) so that
+# regenerating a window never duplicates a persisted row
+DEADLINE_NAMESPACE = uuid.UUID("6f1d7c1e-4b0a-5d8e-9a53-2c7e1f0b9d44")
+
+def _day_of_next_month(day: int) -> Callable[[int, int], date]:
+    return lambda year, month: date(year + month // 12, month % 12 + 1, day)
+
+def _tds_payment_due(year: int, month: int) -> date:
+    # March deductions get until 30 April; every other month the 7th
+    return date(year, 4, 30) if month == 3 else _day_of_next_month(7)(year, month)
+
+_TDS_RETURN_DUE = {6: (0, 7, 31), 9: (0, 10, 31), 12: (1, 1, 31), 3: (0, 5, 31)}
+
+def _tds_return_due(year: int, month: int) -> date:
+    years_later, due_month, due_day = _TDS_RETURN_DUE[month]
+    return date(year + years_later, due_month, due_day)
+
+def _after_fy_end(month: int, day: int) -> Callable[[int, int], date]:
+    # Annual rules close on 31 March of ``year``
+    return lambda year, _: date(year, month, day)
+
+MONTHLY = tuple(range(1, 13))
+QUARTERLY = (6, 9, 12, 3)
+ANNUAL = (3,)
+
+class DeadlineRule(NamedTuple):
+    type: ComplianceType
+    subtype: str
+    period_months: Tuple[int, ...]  # calendar months that close a period
+    due: Callable[[int, int], date]  # (year, month) closing the period -> due date
+    description: str
+    filing_portal: str
+    applies_to: str  # "gst", "all", "company" or "llp"
+
+DEADLINE_RULES: List[DeadlineRule] = [
+    DeadlineRule(ComplianceType.GST, "GSTR-1", MONTHLY, _day_of_next_month(11),
+                 "GSTR-1 outward supplies return", "https://www.gst.gov.in", "gst"),
+    DeadlineRule(ComplianceType.GST, "GSTR-3B", MONTHLY, _day_of_next_month(20),
+                 "GSTR-3B summary return and tax payment", "https://www.gst.gov.in", "gst"),
+    DeadlineRule(ComplianceType.GST, "GSTR-9", ANNUAL, _after_fy_end(12, 31),
+                 "GSTR-9 annual return", "https://www.gst.gov.in", "gst"),
+    DeadlineRule(ComplianceType.TDS, "TDS Payment", MONTHLY, _tds_payment_due,
+                 "TDS deposit (Challan 281)", "https://www.incometax.gov.in", "all"),
+    DeadlineRule(ComplianceType.TDS, "24Q/26Q", QUARTERLY, _tds_return_due,
+                 "Quarterly TDS return (24Q/26Q)", "https://www.tdscpc.gov.in", "all"),
+    DeadlineRule(ComplianceType.ROC, "AOC-4", ANNUAL, _after_fy_end(10, 30),
+                 "AOC-4 financial statements", "https://www.mca.gov.in", "company"),
+    DeadlineRule(ComplianceType.ROC, "MGT-7", ANNUAL, _after_fy_end(11, 29),
+                 "MGT-7 annual return", "https://www.mca.gov.in", "company"),
+    DeadlineRule(ComplianceType.ROC, "LLP Form 11", ANNUAL, _after_fy_end(5, 30),
+                 "LLP Form 11 annual return", "https://www.mca.gov.in", "llp"),
+    DeadlineRule(ComplianceType.ROC, "LLP Form 8", ANNUAL, _after_fy_end(10, 30),
+                 "LLP Form 8 statement of accounts", "https://www.mca.gov.in", "llp"),
+]
+
+# The latest a rule falls due after its period closes (GSTR-9: Mar -> Dec)
+_MAX_DUE_LAG_MONTHS = 10
+
+def _fy_label(year: int, month: int) -> str:
+    start = year if month >= 4 else year - 1
+    return f"FY{start}-{(start + 1) % 100:02d}"
+
+def _period_label(rule: DeadlineRule, year: int, month: int) -> str:
+    if rule.period_months is MONTHLY:
+        return f"{year}-{month:02d}"
+    if rule.period_months is QUARTERLY:
+        return f"{_fy_label(year, month)} Q{QUARTERLY.index(month) + 1}"
+    return _fy_label(year, month)
+
+def _business_categories(business: Dict) -> Tuple[str, ...]:
+    categories = ["all"]
+    if business.get("gstin"):
+        categories.append("gst")
+    business_type = (business.get("business_type") or "").lower()
+    if "llp" in business_type:
+        categories.append("llp")
+    elif any(kind in business_type for kind in ("private limited", "public limited", "company", "opc")):
+        categories.append("company")
+    return tuple(categories)
+
+def _as_ordinal(value) -> int:
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+class Deadline:
+    """Compact in-memory form of a ``compliance_deadlines`` row.
+
+    ``due`` is a date ordinal and ``seq`` the deadline's slot in the
+    service, which is what the indexes store.
+    """
+
+    __slots__ = (
+        "seq", "id", "business_id", "type", "subtype", "due", "description",
+        "amount", "penalty_rate", "filing_portal", "status", "created_at", "completed_at"
+    )
+
+    def __init__(self, seq: int, row: Dict):
+        self.seq = seq
+        self.id = row["id"]
+        self.business_id = row["business_id"]
+        self.type = row["type"]
+        self.subtype = row.get("subtype")
+        self.due = _as_ordinal(row["due_date"])
+        self.description = row.get("description")
+        self.amount = row.get("amount")
+        self.penalty_rate = row.get("penalty_rate")
+        self.filing_portal = row.get("filing_portal")
+        self.status = row.get("status") or DeadlineStatus.UPCOMING.value
+        self.created_at = row.get("created_at")
+        self.completed_at = row.get("completed_at")
+
+    @property
+    def is_open(self) -> bool:
+        return self.status != DeadlineStatus.COMPLETED.value
+
+    def to_dict(self, today: Optional[date] = None) -> Dict:
+        current_status = self.status
+        if self.is_open and today is not None:
+            current_status = (
+                DeadlineStatus.OVERDUE.value if self.due < today.toordinal()
+                else DeadlineStatus.UPCOMING.value
+            )
+        return {
+            "id": self.id,
+            "business_id": self.business_id,
+            "type": self.type,
+            "subtype": self.subtype,
+            "due_date": date.fromordinal(self.due).isoformat(),
+            "description": self.description,
+            "amount": self.amount,
+            "penalty_rate": self.penalty_rate,
+            "filing_portal": self.filing_portal,
+            "status": current_status,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at
+        }
+
+
+class DeadlineIndex:
+    """Open deadlines ordered by due date.
+
+    Entries are packed ``due << 32 | seq`` int64 keys in a sorted array, so
+    a due-date window is two bisections plus a slice: O(log n + k). Batches
+    are merged in with numpy over the same buffer, so loading one more
+    business costs a memory copy of the index, not a re-sort of it.
+    """
+
+    _SEQ_MASK = (1 << 32) - 1
+
+    def __init__(self, keys: Iterable[int] = ()):
+        self._keys = array("q", sorted(keys))
+
+    @staticmethod
+    def key(due: int, seq: int) -> int:
+        return (due << 32) | seq
+
+    def add(self, due: int, seq: int):
+        bisect.insort(self._keys, self.key(due, seq))
+
+    def add_many(self, keys: List[int]):
+        if len(keys) < 32:
+            for key in keys:
+                bisect.insort(self._keys, key)
+        else:
+            # Merge on the raw int64 buffer: one searchsorted and one copy,
+            # instead of boxing and re-sorting every key already indexed
+            current = np.frombuffer(self._keys, dtype=np.int64)
+            new = np.sort(np.array(keys, dtype=np.int64))
+            merged = np.insert(current, np.searchsorted(current, new), new)
+            self._keys = array("q")
+            self._keys.frombytes(merged.view(np.uint8))
+
+    def remove(self, due: int, seq: int) -> bool:
+        key = self.key(due, seq)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            return True
+        return False
+
+    def _bounds(self, start: int, end: int) -> Tuple[int, int]:
+        """Slice bounds for keys with ``start <= due <= end`` (ordinals)"""
+        lo = bisect.bisect_left(self._keys, start << 32)
+        hi = bisect.bisect_left(self._keys, (end + 1) << 32)
+        return lo, hi
+
+    def between(self, start: int, end: int) -> List[int]:
+        lo, hi = self._bounds(start, end)
+        mask = self._SEQ_MASK
+        return [key & mask for key in self._keys[lo:hi]]
+
+    def count_between(self, start: int, end: int) -> int:
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def before(self, end: int) -> List[int]:
+        """Seqs due strictly before ``end``"""
+        return self.between(0, end - 1)
+
+    def count_before(self, end: int) -> int:
+        return self.count_between(0, end - 1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class DeadlineService:
+    """Rule-driven compliance deadline engine.
+
+    Deadlines for a business are generated from ``DEADLINE_RULES`` from the
+    day it joined up to ``DEADLINE_HORIZON_DAYS`` ahead, merged with what is
+    already persisted (completion state, custom deadlines), and kept in
+    date-sorted ``DeadlineIndex``es of open deadlines: one per business and
+    one across all businesses. Upcoming and overdue queries are bisections
+    on those indexes instead of scans.
+
+    Open deadlines are "upcoming" or "overdue" relative to the engine's
+    current day; ``rollover`` advances that day and flips newly past-due
+    deadlines to overdue. Listeners registered with ``subscribe`` are told
+    about every deadline that is added, completed or goes overdue, which is
+    how derived counters stay current without rescanning.
+
+    Persistence goes to ``compliance_deadlines`` through Supabase or MockDB;
+    with neither the engine is purely in-memory.
+    """
+
+    def __init__(
+        self,
+        db: Optional[AsyncSupabaseClient] = None,
+        mock_db: Optional[MockDB] = None,
+        horizon_days: int = settings.DEADLINE_HORIZON_DAYS
+    ):
+        self.db = db
+        self.mock_db = mock_db
+        self.horizon_days = horizon_days
+        self._records: List[Deadline] = []
+        self._by_id: Dict[str, int] = {}
+        self._open: Dict[str, DeadlineIndex] = {}
+        self._open_all = DeadlineIndex()
+        self._generated_through: Dict[str, int] = {}
+        self._load_lock = asyncio.Lock()
+        self._as_of = date.today().toordinal()
+        self._listeners: List = []
+
+    def subscribe(self, listener):
+        """Register an object with deadline_added/_completed/_overdue hooks"""
+        self._listeners.append(listener)
+
+    @property
+    def today(self) -> date:
+        return date.fromordinal(self._as_of)
+
+    @property
+    def records(self) -> List[Deadline]:
+        return self._records
+
+    # Generation
+    def generate(self, business: Dict, start: date, end: date) -> Iterator[Dict]:
+        """Yield rule deadline rows for ``business`` falling due in [start, end]"""
+        business_id = business["id"]
+        categories = _business_categories(business)
+        rules = [rule for rule in DEADLINE_RULES if rule.applies_to in categories]
+        created_at = datetime.utcnow().isoformat()
+
+        month_index = start.year * 12 + start.month - 1 - _MAX_DUE_LAG_MONTHS
+        last_index = end.year * 12 + end.month - 1
+        while month_index <= last_index:
+            year, month = divmod(month_index, 12)
+            month += 1
+            for rule in rules:
+                if month not in rule.period_months:
+                    continue
+                due = rule.due(year, month)
+                if due < start or due > end:
+                    continue
+                period = _period_label(rule, year, month)
+                yield {
+                    "id": str(uuid.uuid5(DEADLINE_NAMESPACE, f"{business_id}:{rule.subtype}:{period}")),
+                    "business_id": business_id,
+                    "type": rule.type.value,
+                    "subtype": rule.subtype,
+                    "due_date": due,
+                    "description": f"{rule.description} for {period}",
+                    "amount": None,
+                    "penalty_rate": None,
+                    "filing_portal": rule.filing_portal,
+                    "status": DeadlineStatus.UPCOMING.value,
+                    "created_at": created_at,
+                    "completed_at": None
+                }
+            month_index += 1
+
+    def add_rows(self, rows: Iterable[Dict]) -> List[Deadline]:
+        """Index deadline rows, skipping ids that are already known"""
+        added: List[Deadline] = []
+        new_keys: Dict[str, List[int]] = {}
+        for row in rows:
+            if row["id"] in self._by_id:
+                continue
+            deadline = Deadline(len(self._records), row)
+            if deadline.is_open:
+                deadline.status = (
+                    DeadlineStatus.OVERDUE.value if deadline.due < self._as_of
+                    else DeadlineStatus.UPCOMING.value
+                )
+            self._records.append(deadline)
+            self._by_id[deadline.id] = deadline.seq
+            added.append(deadline)
+            if deadline.is_open:
+                new_keys.setdefault(deadline.business_id, []).append(
+                    DeadlineIndex.key(deadline.due, deadline.seq)
+                )
+
+        for business_id, keys in new_keys.items():
+            index = self._open.get(business_id)
+            if index is None:
+                self._open[business_id] = DeadlineIndex(keys)
+            else:
+                index.add_many(keys)
+        self._open_all.add_many([key for keys in new_keys.values() for key in keys])
+        for listener in self._listeners:
+            for deadline in added:
+                listener.deadline_added(deadline)
+        return added
+
+    def load_businesses(self, businesses: List[Dict], start: date, end: date) -> int:
+        """Generate and index deadlines for many businesses without persisting"""
+        count = len(self._records)
+        self.add_rows(chain.from_iterable(
+            self.generate(business, start, end) for business in businesses
+        ))
+        for business in businesses:
+            self._generated_through[business["id"]] = end.toordinal()
+        return len(self._records) - count
+
+    async def ensure_business(self, business: Dict, today: Optional[date] = None):
+        """Load persisted deadlines and generate any missing ones up to the horizon"""
+        today = today or self.today
+        horizon = today + timedelta(days=self.horizon_days)
+        business_id = business["id"]
+        if self._generated_through.get(business_id, 0) >= horizon.toordinal():
+            return
+
+        async with self._load_lock:
+            generated_through = self._generated_through.get(business_id)
+            if generated_through is None:
+                self.add_rows(await self._fetch_persisted(business_id))
+                joined = business.get("created_at")
+                start = date.fromisoformat(joined[:10]) if joined else today
+            elif generated_through >= horizon.toordinal():
+                return
+            else:
+                start = date.fromordinal(generated_through + 1)
+
+            added = self.add_rows(self.generate(business, start, horizon))
+            await self._persist([deadline.to_dict() for deadline in added])
+            self._generated_through[business_id] = horizon.toordinal()
+
+    # Queries
+    def get(self, deadline_id: str) -> Optional[Deadline]:
+        seq = self._by_id.get(deadline_id)
+        return self._records[seq] if seq is not None else None
+
+    def upcoming(self, business_id: str, days: int, today: Optional[date] = None) -> List[Dict]:
+        """Open deadlines due from today through ``days`` ahead, soonest first"""
+        today = today or self.today
+        index = self._open.get(business_id)
+        if index is None:
+            return []
+        start = today.toordinal()
+        return [self._records[seq].to_dict(today) for seq in index.between(start, start + days)]
+
+    def count_upcoming(self, business_id: str, days: int, today: Optional[date] = None) -> int:
+        today = today or self.today
+        index = self._open.get(business_id)
+        start = today.toordinal()
+        return index.count_between(start, start + days) if index is not None else 0
+
+    def open_seqs(self, business_id: str) -> List[int]:
+        """Seqs of the business's open deadlines, by due date"""
+        index = self._open.get(business_id)
+        return index.between(0, date.max.toordinal()) if index is not None else []
+
+    def overdue(self, business_id: str, today: Optional[date] = None) -> List[Dict]:
+        """Open deadlines whose due date has passed, oldest first"""
+        today = today or self.today
+        index = self._open.get(business_id)
+        if index is None:
+            return []
+        return [self._records[seq].to_dict(today) for seq in index.before(today.toordinal())]
+
+    # Updates
+    async def complete(
+        self,
+        business_id: str,
+        deadline_id: str,
+        completed_at: Optional[datetime] = None
+    ) -> Dict:
+        """Mark a deadline completed and drop it from the open indexes"""
+        deadline = self.get(deadline_id)
+        if deadline is None or deadline.business_id != business_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Deadline not found"
+            )
+        if deadline.is_open:
+            was_overdue = deadline.status == DeadlineStatus.OVERDUE.value
+            deadline.status = DeadlineStatus.COMPLETED.value
+            deadline.completed_at = (completed_at or datetime.utcnow()).isoformat()
+            self._open[business_id].remove(deadline.due, deadline.seq)
+            self._open_all.remove(deadline.due, deadline.seq)
+            for listener in self._listeners:
+                listener.deadline_completed(deadline, was_overdue)
+            await self._persist_update(deadline.id, {
+                "status": deadline.status,
+                "completed_at": deadline.completed_at
+            })
+        return deadline.to_dict()
+
+    async def rollover(self, today: Optional[date] = None) -> List[Deadline]:
+        """Advance the engine's day, marking deadlines that just passed as overdue"""
+        new_day = (today or date.today()).toordinal()
+        if new_day <= self._as_of:
+            return []
+        # Open deadlines due in [old day, new day) were upcoming until now
+        lapsed = [self._records[seq] for seq in self._open_all.between(self._as_of, new_day - 1)]
+        self._as_of = new_day
+        for deadline in lapsed:
+            deadline.status = DeadlineStatus.OVERDUE.value
+            for listener in self._listeners:
+                listener.deadline_overdue(deadline)
+        await self._persist_overdue(lapsed)
+        return lapsed
+
+    # Persistence
+    async def _fetch_persisted(self, business_id: str) -> List[Dict]:
+        if self.db is not None:
+            return await self.db.select(
+                "compliance_deadlines", filters={"business_id": business_id}, admin=True
+            )
+        if self.mock_db is not None:
+            return self.mock_db.get_deadlines_by_business(business_id)
+        return []
+
+    async def _persist(self, rows: List[Dict]):
+        if not rows:
+            return
+        if self.db is not None:
+            chunk = settings.DEADLINE_INSERT_CHUNK
+            for i in range(0, len(rows), chunk):
+                await self.db.insert(
+                    "compliance_deadlines", rows[i:i + chunk],
+                    admin=True, ignore_duplicates=True, returning=False
+                )
+        elif self.mock_db is not None:
+            self.mock_db.create_deadlines(rows)
+
+    async def _persist_overdue(self, lapsed: List[Deadline]):
+        if not lapsed:
+            return
+        if self.db is not None:
+            # One statement flips every lapsed row, whichever business owns it
+            await self.db.update(
+                "compliance_deadlines",
+                {"status": DeadlineStatus.OVERDUE.value},
+                filters={"status": DeadlineStatus.UPCOMING.value},
+                params={"due_date": f"lt.{self.today.isoformat()}"},
+                admin=True
+            )
+        elif self.mock_db is not None:
+            self.mock_db.update_deadlines({
+                deadline.id: {"status": DeadlineStatus.OVERDUE.value} for deadline in lapsed
+            })
+
+    async def _persist_update(self, deadline_id: str, changes: Dict):
+        if self.db is not None:
+            await self.db.update("compliance_deadlines", changes, filters={"id": deadline_id}, admin=True)
+        elif self.mock_db is not None:
+            self.mock_db.update_deadline(deadline_id, changes)
@@ -0,0 +1,436 @@
+import asyncio
+import base64
+import csv
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import AsyncSupabaseClient
+from app.models.compliance import ComplianceType, GSTFilingCreate
+from app.services.deadline_service import DEADLINE_RULES
+from app.services.reconciliation_service import InvoiceTable, reconcile
+from app.utils.mock_db import MockDB
+from app.utils.validators import error_names, validate_gstins, validate_pans
+
+logger = logging.getLogger(__name__)
+
+# Filing ids are uuid5(business, filing type, period) so re-importing the
+# same history never duplicates a row
+GST_FILING_NAMESPACE = uuid.UUID("0b6e3a52-9d1f-5c47-8e2a-4f7d1c9b3e60")
+
+GST_RULES = {rule.subtype: rule for rule in DEADLINE_RULES if rule.type == ComplianceType.GST}
+
+GST_FILING_COLUMNS = (
+    "id", "business_id", "filing_type", "period_year", "period_month", "due_date",
+    "filed_on", "status", "reconciliation_status", "total_taxable_value",
+    "total_tax_liability", "itc_available", "itc_claimed", "payment_made",
+    "challan_number", "created_at"
+)
+# Columns the keyset cursor is built from; always selected
+GST_FILING_KEY = ("period_year", "period_month", "id")
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+def _filing_id(business_id: str, filing_type: str, year: int, month: int) -> str:
+    return str(uuid.uuid5(GST_FILING_NAMESPACE, f"{business_id}:{filing_type}:{year}-{month:02d}"))
+
+def _encode_cursor(row: Dict) -> str:
+    key = json.dumps([row[column] for column in GST_FILING_KEY], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[int, int, str]:
+    try:
+        year, month, filing_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return int(year), int(month), str(uuid.UUID(filing_id))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _filing_key(row: Dict) -> Tuple[int, int, str]:
+    return row["period_year"], row["period_month"], row["id"]
+
+def _line_too_long(line_no: int, max_line_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Line {line_no} exceeds {max_line_bytes} bytes"
+    )
+
+async def _iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into numbered lines, holding at most one partial line"""
+    pending = b""
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        if b"\n" in chunk:
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                line_no += 1
+                if len(line) > max_line_bytes:
+                    raise _line_too_long(line_no, max_line_bytes)
+                yield line_no, line
+        if len(pending) > max_line_bytes:
+            raise _line_too_long(line_no + 1, max_line_bytes)
+    if pending:
+        yield line_no + 1, pending
+
+async def _iter_csv_records(lines: AsyncIterator[Tuple[int, bytes]], max_line_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    """Join lines into CSV records, numbered by their first line.
+
+    A record with an odd number of quote characters so far is inside a
+    quoted field, so the newline belongs to the field and the next line
+    continues it (an escaped ``""`` does not change the parity).
+    """
+    record: List[bytes] = []
+    first = quotes = size = 0
+    async for line_no, line in lines:
+        if not record:
+            first = line_no
+        record.append(line)
+        quotes += line.count(b'"')
+        size += len(line) + 1
+        if size > max_line_bytes:
+            raise _line_too_long(first, max_line_bytes)
+        if quotes % 2 == 0:
+            yield first, b"\n".join(record)
+            record, quotes, size = [], 0, 0
+    if record:
+        yield first, b"\n".join(record)  # unterminated quote; strict parsing rejects it
+
+class GSTService:
+    """GST filing history, ITC reconciliation and identifier validation.
+
+    Listeners registered with ``subscribe`` are told about filings as they
+    are written (``filings_added``) and changed (``filing_updated``).
+    """
+
+    def __init__(self, db: Optional[AsyncSupabaseClient] = None, mock_db: Optional[MockDB] = None):
+        self.db = db
+        self.mock_db = mock_db
+        self._listeners: List = []
+
+    def subscribe(self, listener):
+        """Register an object with filings_added/filing_updated hooks"""
+        self._listeners.append(listener)
+
+    async def all_filings(self, business_id: str, columns: Sequence[str]) -> List[Dict]:
+        """Every filing of a business, unordered"""
+        if self.db is not None:
+            return await self.db.select(
+                "gst_filings", columns=",".join(columns), filters={"business_id": business_id}, admin=True
+            )
+        if self.mock_db is not None:
+            return [
+                {column: row.get(column) for column in columns}
+                for row in self.mock_db.get_gst_filings_by_business(business_id)
+            ]
+        return []
+
+    async def list_filings(
+        self,
+        business_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filing_type: Optional[str] = None,
+        filing_status: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """One page of filings, newest period first, and the cursor for the next.
+
+        Pages continue from the last ``(period_year, period_month, id)`` seen
+        rather than an offset, so with the ``(business_id, period_year,
+        period_month, id)`` index every page is a short index range scan no
+        matter how deep it is.
+        """
+        if fields:
+            unknown = sorted(set(fields) - set(GST_FILING_COLUMNS))
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(unknown)}"
+                )
+            columns = [c for c in GST_FILING_COLUMNS if c in fields or c in GST_FILING_KEY]
+        else:
+            columns = list(GST_FILING_COLUMNS)
+        after = _decode_cursor(cursor) if cursor else None
+
+        if self.db is not None:
+            rows = await self._fetch_page(business_id, limit + 1, after, columns, filing_type, filing_status)
+        elif self.mock_db is not None:
+            rows = self._fetch_page_mock(business_id, limit + 1, after, columns, filing_type, filing_status)
+        else:
+            rows = []
+
+        next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    async def _fetch_page(
+        self,
+        business_id: str,
+        limit: int,
+        after: Optional[Tuple[int, int, str]],
+        columns: List[str],
+        filing_type: Optional[str],
+        filing_status: Optional[str]
+    ) -> List[Dict]:
+        filters = {"business_id": business_id}
+        if filing_type:
+            filters["filing_type"] = filing_type
+        if filing_status:
+            filters["status"] = filing_status
+        params = {
+            "order": "period_year.desc,period_month.desc,id.desc",
+            "limit": str(limit)
+        }
+        if after:
+            year, month, filing_id = after
+            # PostgREST has no row comparison; the period_year bound gives the
+            # index scan its start point and the or() resolves ties within it
+            params["period_year"] = f"lte.{year}"
+            params["or"] = (
+                f"(period_year.lt.{year},"
+                f"and(period_year.eq.{year},period_month.lt.{month}),"
+                f"and(period_year.eq.{year},period_month.eq.{month},id.lt.{filing_id}))"
+            )
+        return await self.db.select(
+            "gst_filings", columns=",".join(columns), filters=filters, params=params, admin=True
+        )
+
+    def _fetch_page_mock(
+        self,
+        business_id: str,
+        limit: int,
+        after: Optional[Tuple[int, int, str]],
+        columns: List[str],
+        filing_type: Optional[str],
+        filing_status: Optional[str]
+    ) -> List[Dict]:
+        rows = [
+            row for row in self.mock_db.get_gst_filings_by_business(business_id)
+            if (not filing_type or row.get("filing_type") == filing_type)
+            and (not filing_status or row.get("status") == filing_status)
+            and (after is None or _filing_key(row) < after)
+        ]
+        rows.sort(key=_filing_key, reverse=True)
+        return [{column: row.get(column) for column in columns} for row in rows[:limit]]
+
+    async def import_filings(
+        self,
+        business_id: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str
+    ) -> Dict:
+        """Validate and insert a CSV or NDJSON stream of ``GSTFilingCreate`` rows.
+
+        The body is consumed line by line (a quoted CSV field may span
+        lines; its record is numbered by the first) and written in batches of
+        ``GST_IMPORT_BATCH_SIZE``, so memory stays bounded by one batch plus
+        the first ``GST_IMPORT_MAX_ERRORS`` row errors regardless of upload
+        size. Rows for a period that already exists are skipped and counted
+        under ``duplicates`` rather than ``accepted``. A row's ``status``
+        (``pending`` or ``filed``) is kept, defaulting to ``pending``.
+        """
+        media_type = content_type.split(";")[0].strip().lower()
+        lines = _iter_lines(chunks, settings.GST_IMPORT_MAX_LINE_BYTES)
+        if media_type in CSV_CONTENT_TYPES:
+            parse = self._csv_parser()
+            lines = _iter_csv_records(lines, settings.GST_IMPORT_MAX_LINE_BYTES)
+        elif media_type in NDJSON_CONTENT_TYPES:
+            parse = json.loads
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Upload text/csv or application/x-ndjson"
+            )
+
+        result = {"received": 0, "accepted": 0, "duplicates": 0, "failed": 0, "errors": []}
+        batch: List[Dict] = []
+        batch_lines: List[int] = []
+        now = datetime.utcnow().isoformat()
+
+        async for line_no, data in lines:
+            if not data.strip():
+                continue
+            try:
+                line = data.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+                raw = parse(line)
+            except ValueError as e:
+                result["received"] += 1
+                self._row_error(result, line_no, [str(e)])
+                continue
+            if raw is None:  # CSV header
+                continue
+            result["received"] += 1
+
+            row, errors = self._validate(business_id, raw)
+            if errors:
+                self._row_error(result, line_no, errors)
+                continue
+            row["created_at"] = now
+            batch.append(row)
+            batch_lines.append(line_no)
+            if len(batch) >= settings.GST_IMPORT_BATCH_SIZE:
+                await self._flush(batch, batch_lines, result)
+                batch, batch_lines = [], []
+
+        await self._flush(batch, batch_lines, result)
+        logger.info(
+            f"GST import for business {business_id}: {result['accepted']} accepted, "
+            f"{result['duplicates']} duplicates, {result['failed']} failed"
+        )
+        return result
+
+    def _csv_parser(self):
+        header: List[str] = []
+
+        def parse(line: str) -> Optional[Dict]:
+            try:
+                values = next(csv.reader([line], strict=True))
+            except csv.Error as e:
+                raise ValueError(str(e))
+            if not header:
+                header.extend(name.strip() for name in values)
+                return None
+            if len(values) != len(header):
+                raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            return {name: value for name, value in zip(header, values) if value != ""}
+
+        return parse
+
+    def _validate(self, business_id: str, raw) -> Tuple[Optional[Dict], List[str]]:
+        if not isinstance(raw, dict):
+            return None, ["Row must be an object"]
+        if raw.get("business_id", business_id) != business_id:
+            return None, ["business_id does not match the authenticated business"]
+        try:
+            filing = GSTFilingCreate(**{**raw, "business_id": business_id})
+        except ValidationError as e:
+            return None, [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+
+        rule = GST_RULES.get(filing.filing_type)
+        if rule is None:
+            return None, [f"filing_type: unsupported '{filing.filing_type}'"]
+
+        row = filing.model_dump(mode="json")
+        row["id"] = _filing_id(business_id, filing.filing_type, filing.period_year, filing.period_month)
+        row["due_date"] = rule.due(filing.period_year, filing.period_month).isoformat()
+        row["reconciliation_status"] = "pending"
+        return row, []
+
+    def _row_error(self, result: Dict, line_no: int, errors: List[str]):
+        result["failed"] += 1
+        if len(result["errors"]) < settings.GST_IMPORT_MAX_ERRORS:
+            result["errors"].append({"line": line_no, "errors": errors})
+
+    async def _flush(self, batch: List[Dict], batch_lines: List[int], result: Dict):
+        if not batch:
+            return
+        try:
+            # Only rows actually written count: periods already on file are skipped
+            if self.db is not None:
+                inserted = await self.db.insert(
+                    "gst_filings", batch, admin=True, ignore_duplicates=True, columns="id"
+                )
+                new_ids = {row["id"] for row in inserted or []}
+                added = list({row["id"]: row for row in batch if row["id"] in new_ids}.values())
+            elif self.mock_db is not None:
+                added = self.mock_db.create_gst_filings(batch)
+            else:
+                added = batch
+            result["accepted"] += len(added)
+            result["duplicates"] += len(batch) - len(added)
+            if added:
+                for listener in self._listeners:
+                    listener.filings_added(added)
+        except Exception as e:
+            logger.error(f"GST import batch failed: {e}")
+            for line_no in batch_lines:
+                self._row_error(result, line_no, [f"Insert failed: {e}"])
+
+    async def reconcile_period(
+        self,
+        business_id: str,
+        period_year: int,
+        period_month: int,
+        books: BinaryIO,
+        supplier: BinaryIO
+    ) -> Dict:
+        """Reconcile a period's purchase register against GSTR-2B and store the ITC figures.
+
+        Parsing and matching run in a worker thread; the outcome is written
+        to the period's GSTR-3B filing (created if the history lacks it).
+        """
+        max_details = settings.RECON_MAX_DETAILS
+
+        def run() -> Dict:
+            book_table, book_errors = InvoiceTable.from_csv(books, max_details)
+            supplier_table, supplier_errors = InvoiceTable.from_csv(supplier, max_details)
+            summary = reconcile(book_table, supplier_table).to_dict(max_details)
+            summary["errors"] = {"books": book_errors, "supplier": supplier_errors}
+            return summary
+
+        summary = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        filing, errors = self._validate(business_id, {
+            "filing_type": "GSTR-3B", "period_year": period_year, "period_month": period_month
+        })
+        if errors:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+        changes = {
+            "reconciliation_status": summary["reconciliation_status"],
+            "itc_available": summary["itc_available"],
+            "itc_claimed": summary["itc_claimed"]
+        }
+        filing["created_at"] = datetime.utcnow().isoformat()
+        if self.db is not None:
+            await self.db.insert("gst_filings", filing, admin=True, ignore_duplicates=True, returning=False)
+            await self.db.update("gst_filings", changes, filters={"id": filing["id"]}, admin=True)
+        elif self.mock_db is not None:
+            self.mock_db.create_gst_filings([filing])
+            self.mock_db.update_gst_filing(filing["id"], changes)
+        for listener in self._listeners:
+            listener.filing_updated(filing, changes)
+
+        logger.info(
+            f"Reconciled {period_year}-{period_month:02d} for business {business_id}: "
+            f"{summary['counts']}"
+        )
+        return {"filing_id": filing["id"], **summary}
+
+    async def validate_identifiers(self, gstins: List[str], pans: List[str], match_pans: bool = False) -> Dict:
+        """Validate vendor-master GSTINs and PANs in bulk; lists only the invalid entries"""
+        if len(gstins) + len(pans) > settings.VALIDATION_MAX_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.VALIDATION_MAX_BATCH} identifiers per request"
+            )
+        if match_pans and len(gstins) != len(pans):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="match_pans needs one PAN per GSTIN"
+            )
+
+        def report(values: List[str], errors) -> Dict:
+            invalid = errors.nonzero()[0]
+            return {
+                "total": len(values),
+                "valid": len(values) - len(invalid),
+                "invalid": [
+                    {"index": int(i), "value": values[i], "errors": error_names(int(errors[i]))}
+                    for i in invalid
+                ]
+            }
+
+        def run() -> Dict:
+            return {
+                "gstins": report(gstins, validate_gstins(gstins, pans if match_pans else None)),
+                "pans": report(pans, validate_pans(pans))
+            }
+
+        return await asyncio.get_running_loop().run_in_executor(None, run)
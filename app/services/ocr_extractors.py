@@ -0,0 +1,144 @@
+import importlib
+import os
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from app.config import settings
+from app.utils.validators import gstin_errors
+
+# Extractors run in OCR worker processes: each is a module-level function
+# taking the uploaded file's path and returning a JSON-serializable dict
+# with at least "text", "pages" and "fields".
+Extractor = Callable[[str], Dict]
+
+class OCRBackend(NamedTuple):
+    name: str
+    extract: Extractor
+    # Optional page-level entry points for PDFs, so pages can be spread
+    # over the worker pool one at a time: page count, and text of page n (1-based)
+    page_count: Optional[Callable[[str], int]] = None
+    extract_page: Optional[Callable[[str, int], str]] = None
+
+_GSTIN = re.compile(r"\b\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b")
+_INVOICE_NUMBER = re.compile(r"invoice\s*(?:no\.?|number|#)\s*[:\-]?\s*([A-Z0-9][A-Z0-9/\-]*)", re.IGNORECASE)
+_INVOICE_DATE = re.compile(
+    r"(?:invoice\s*)?date\s*[:\-]?\s*(\d{4}-\d{2}-\d{2}|\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2,4})", re.IGNORECASE
+)
+_TAX = re.compile(r"\b(CGST|SGST|UTGST|IGST|CESS)\b[^\n\d]*(?:\d+(?:\.\d+)?\s*%[^\n\d]*)?([\d,]+\.\d{1,2})", re.IGNORECASE)
+_TOTAL = re.compile(
+    r"(?:grand\s*)?total(?:\s*(?:invoice\s*)?(?:amount|value))?\s*[:\-]?\s*(?:rs\.?|inr|₹)?\s*([\d,]+\.\d{1,2})",
+    re.IGNORECASE
+)
+
+def _amount(value: str) -> float:
+    return float(value.replace(",", ""))
+
+def parse_invoice_fields(text: str) -> Dict:
+    """Pull the invoice fields reconciliation needs out of OCR text"""
+    gstins: List[str] = []
+    for match in _GSTIN.findall(text.upper()):
+        if match not in gstins and gstin_errors(match) == 0:
+            gstins.append(match)
+
+    taxes: Dict[str, float] = {}
+    for name, value in _TAX.findall(text):
+        taxes.setdefault(name.lower(), _amount(value))
+
+    number = _INVOICE_NUMBER.search(text)
+    invoice_date = _INVOICE_DATE.search(text)
+    totals = _TOTAL.findall(text)
+    return {
+        "supplier_gstin": gstins[0] if gstins else None,
+        "recipient_gstin": gstins[1] if len(gstins) > 1 else None,
+        "invoice_number": number.group(1) if number else None,
+        "invoice_date": invoice_date.group(1) if invoice_date else None,
+        "taxes": taxes,
+        "tax_amount": round(sum(taxes.values()), 2) if taxes else None,
+        # The last "total" on an invoice is the grand total
+        "total_amount": _amount(totals[-1]) if totals else None,
+    }
+
+def _tesseract():
+    try:
+        import pytesseract
+    except ImportError as e:
+        raise RuntimeError(f"Tesseract backend needs pytesseract and Pillow: {e}")
+    pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_PATH
+    return pytesseract
+
+def _pdf2image():
+    try:
+        import pdf2image
+    except ImportError as e:
+        raise RuntimeError(f"PDF extraction needs pdf2image: {e}")
+    return pdf2image
+
+def pdf_page_count(path: str) -> int:
+    return int(_pdf2image().pdfinfo_from_path(path)["Pages"])
+
+def iter_pdf_pages(path: str, dpi: Optional[int] = None) -> Iterator:
+    """Render a PDF one page at a time; each image is closed once the consumer moves on"""
+    convert = _pdf2image().convert_from_path
+    for page in range(1, pdf_page_count(path) + 1):
+        images = convert(path, dpi=dpi or settings.OCR_DPI, first_page=page, last_page=page)
+        try:
+            yield from images
+        finally:
+            for image in images:
+                image.close()
+
+def tesseract_extract_page(path: str, page: int) -> str:
+    """OCR a single PDF page"""
+    pytesseract = _tesseract()
+    images = _pdf2image().convert_from_path(path, dpi=settings.OCR_DPI, first_page=page, last_page=page)
+    try:
+        return "".join(pytesseract.image_to_string(image) for image in images)
+    finally:
+        for image in images:
+            image.close()
+
+def tesseract_extract(path: str) -> Dict:
+    """OCR an image or PDF with Tesseract"""
+    pytesseract = _tesseract()
+    if os.path.splitext(path)[1].lower() == ".pdf":
+        texts = [pytesseract.image_to_string(page) for page in iter_pdf_pages(path)]
+    else:
+        from PIL import Image
+        with Image.open(path) as image:
+            texts = [pytesseract.image_to_string(image)]
+
+    text = "\n\f".join(texts)
+    return {"text": text, "pages": len(texts), "fields": parse_invoice_fields(text)}
+
+def _read_text(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="ignore")
+
+def stub_extract(path: str) -> Dict:
+    """Development/test backend: reads the upload as UTF-8 text instead of running OCR"""
+    text = _read_text(path)
+    return {"text": text, "pages": text.count("\f") + 1, "fields": parse_invoice_fields(text)}
+
+def stub_page_count(path: str) -> int:
+    """Stub pages are separated by form feeds"""
+    return _read_text(path).count("\f") + 1
+
+def stub_extract_page(path: str, page: int) -> str:
+    return _read_text(path).split("\f")[page - 1]
+
+BACKENDS: Dict[str, OCRBackend] = {
+    "tesseract": OCRBackend("tesseract", tesseract_extract, pdf_page_count, tesseract_extract_page),
+    "stub": OCRBackend("stub", stub_extract, stub_page_count, stub_extract_page),
+}
+
+def load_backend(name: Optional[str] = None) -> OCRBackend:
+    """Backend registered under ``name``, or a ``package.module:attribute`` path
+    to an ``OCRBackend`` or a whole-document extractor function"""
+    name = name or settings.OCR_BACKEND
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown OCR backend '{name}'")
+    backend = getattr(importlib.import_module(module), attr)
+    return backend if isinstance(backend, OCRBackend) else OCRBackend(attr, backend)
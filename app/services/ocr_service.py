@@ -0,0 +1,290 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.services.ocr_extractors import OCRBackend, load_backend, parse_invoice_fields
+from app.utils.cache import ExpiringLRUCache
+from app.utils.disk_cache import ContentCache
+from app.utils.uploads import MultipartFileStream
+
+logger = logging.getLogger(__name__)
+
+# Room in Content-Length for the multipart boundaries and part headers
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+class OCRJob:
+    __slots__ = ("id", "business_id", "filename", "size", "sha256", "cached", "status",
+                 "created_at", "finished_at", "result", "error")
+
+    def __init__(self, business_id: str, filename: str, size: int, sha256: str):
+        self.id = str(uuid.uuid4())
+        self.business_id = business_id
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.cached = False
+        self.status = "queued"
+        self.created_at = datetime.utcnow().isoformat()
+        self.finished_at: Optional[str] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "size": self.size,
+            "sha256": self.sha256,
+            "cached": self.cached,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+class OCRService:
+    """Upload-then-poll OCR pipeline.
+
+    ``submit`` parses the multipart request body as it arrives and writes
+    the file part straight to ``OCR_UPLOAD_DIR``, so an upload is never
+    spooled first; a ``Content-Length`` over ``MAX_UPLOAD_SIZE`` is refused
+    before any of the body is read, and a body without one is cut off as
+    soon as the file passes the limit. It then records a job and returns
+    straight away; extraction runs in a worker pool (worker
+    processes by default, since OCR is CPU bound) and the job is updated in
+    place when it finishes. Jobs are kept in memory for
+    ``OCR_JOB_TTL_SECONDS``. Once ``workers + queue_depth`` jobs are
+    outstanding new uploads get a 503 instead of queueing without bound.
+
+    PDFs on a backend with page-level entry points are extracted page by
+    page: pages go to the pool at most ``workers`` at a time and each worker
+    renders, reads and frees a single page, so memory is bounded by the
+    worker count rather than the length of the document.
+
+    Results are cached on disk by the SHA-256 of the uploaded bytes, which
+    is computed while the upload streams in: a re-uploaded document comes
+    back completed from ``submit`` itself, and concurrent uploads of the
+    same document share one extraction. Cache reads and writes touch the
+    disk, so they run in the default executor rather than on the event loop.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[OCRBackend] = None,
+        workers: int = settings.OCR_WORKERS,
+        queue_depth: int = settings.OCR_QUEUE_DEPTH,
+        executor: str = settings.OCR_EXECUTOR,
+        upload_dir: str = settings.OCR_UPLOAD_DIR,
+        cache_dir: str = settings.OCR_CACHE_DIR
+    ):
+        self.backend = backend or load_backend()
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.executor_type = executor
+        self.upload_dir = upload_dir
+        os.makedirs(upload_dir, exist_ok=True)
+
+        self.jobs = ExpiringLRUCache(maxsize=settings.OCR_JOB_CACHE_SIZE)
+        # Results from different backends must not mix
+        self.cache = ContentCache(
+            os.path.join(cache_dir, self.backend.name),
+            max_bytes=settings.OCR_CACHE_MAX_BYTES
+        )
+        self._extractions: Dict[str, asyncio.Future] = {}
+        self._executor: Optional[Executor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+        return self._executor
+
+    async def _save_upload(self, body: AsyncIterator[bytes], content_type: str) -> Tuple[str, str, int, str]:
+        """Write the body's ``file`` part to the upload directory; its filename, path, size and SHA-256"""
+        reader = MultipartFileStream(content_type, "file")
+        path = None
+        size = 0
+        digest = hashlib.sha256()
+        f = None
+        try:
+            async for chunk in body:
+                data = reader.feed(chunk)
+                if f is None and reader.found:
+                    ext = os.path.splitext(reader.filename)[1].lower()
+                    if ext not in settings.ALLOWED_FILE_TYPES:
+                        raise HTTPException(
+                            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Allowed file types: {', '.join(settings.ALLOWED_FILE_TYPES)}"
+                        )
+                    path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}{ext}")
+                    f = open(path + ".part", "wb")
+                for part in data:
+                    size += len(part)
+                    if size > settings.MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes"
+                        )
+                    digest.update(part)
+                    f.write(part)
+            if f is None:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Multipart field 'file' is required"
+                )
+            if not reader.complete:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload ended early")
+            f.close()
+            os.replace(path + ".part", path)
+        except BaseException:
+            if f is not None:
+                f.close()
+                if os.path.exists(path + ".part"):
+                    os.remove(path + ".part")
+            raise
+        return reader.filename or "upload", path, size, digest.hexdigest()
+
+    async def submit(
+        self,
+        business_id: str,
+        body: AsyncIterator[bytes],
+        content_type: str,
+        content_length: Optional[int] = None
+    ) -> OCRJob:
+        """Store the multipart upload in ``body`` and queue it for extraction"""
+        if self.in_flight >= self.workers + self.queue_depth:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="OCR queue is full, please retry",
+                headers={"Retry-After": "5"}
+            )
+        if content_length is not None and content_length > settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+
+        filename, path, size, sha256 = await self._save_upload(body, content_type)
+        job = OCRJob(business_id, filename, size, sha256)
+        self.jobs.set(job.id, job, time.time() + settings.OCR_JOB_TTL_SECONDS)
+
+        cached = await asyncio.get_running_loop().run_in_executor(None, self.cache.get, sha256)
+        if cached is not None:
+            os.remove(path)
+            job.cached = True
+            job.result = cached
+            job.status = "completed"
+            job.finished_at = job.created_at
+            return job
+
+        self.in_flight += 1
+        task = asyncio.create_task(self._run(job, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: OCRJob, path: str):
+        job.status = "processing"
+        try:
+            extraction = self._extractions.get(job.sha256)
+            if extraction is None:
+                extraction = asyncio.ensure_future(self._extract(path, job.sha256))
+                self._extractions[job.sha256] = extraction
+                extraction.add_done_callback(lambda _: self._extractions.pop(job.sha256, None))
+            else:
+                # Same bytes are already being extracted for another job
+                os.remove(path)
+                job.cached = True
+            job.result = await asyncio.shield(extraction)
+            job.status = "completed"
+            self.completed += 1
+        except Exception as e:
+            logger.error(f"OCR job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+            self.failed += 1
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            self.in_flight -= 1
+
+    async def _extract(self, path: str, sha256: str) -> Dict:
+        try:
+            if path.lower().endswith(".pdf") and self.backend.extract_page is not None:
+                result = await self._extract_pdf(path)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._get_executor(), self.backend.extract, path)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+        await asyncio.get_running_loop().run_in_executor(None, self.cache.set, sha256, result)
+        return result
+
+    async def _extract_pdf(self, path: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pages = await loop.run_in_executor(executor, self.backend.page_count, path)
+        texts: List[str] = [""] * pages
+        pending: Dict[asyncio.Future, int] = {}
+        next_page = 1
+        try:
+            while next_page <= pages or pending:
+                while next_page <= pages and len(pending) < self.workers:
+                    page = loop.run_in_executor(executor, self.backend.extract_page, path, next_page)
+                    pending[page] = next_page
+                    next_page += 1
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for page in done:
+                    texts[pending.pop(page) - 1] = page.result()
+        finally:
+            for page in pending:
+                page.cancel()
+
+        text = "\n\f".join(texts)
+        return {"text": text, "pages": pages, "fields": parse_invoice_fields(text)}
+
+    def get_job(self, job_id: str, business_id: str) -> OCRJob:
+        job = self.jobs.get(job_id)
+        if job is None or job.business_id != business_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OCR job not found")
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "cache": self.cache.stats()
+        }
+
+    async def close(self):
+        """Abandon outstanding jobs and stop the worker pool"""
+        for task in list(self._tasks):
+            task.cancel()
+        for extraction in list(self._extractions.values()):
+            extraction.cancel()
+        await asyncio.gather(*self._tasks, *self._extractions.values(), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,224 @@
+import logging
+import math
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.deadline_service import Deadline, DeadlineService
+
+logger = logging.getLogger(__name__)
+
+# Interest accrual: simple interest per day late, or per month or part of a month
+DAILY = "daily"
+MONTHLY_OR_PART = "monthly"
+
+class PenaltyRule(NamedTuple):
+    subtype: str
+    fee_per_day: float  # rupees
+    fee_cap: Optional[float] = None  # rupees; with fee_cap_pct, only when the deadline has no amount
+    fee_cap_pct: Optional[float] = None  # percent of the deadline's amount, when it has one
+    interest_rate: float = 0  # percent of the amount, per annum (DAILY) or per month (MONTHLY_OR_PART)
+    accrual: str = DAILY
+
+# Late fees and interest by deadline subtype. GST fees are CGST + SGST
+# together and capped at the general Rs 10,000 per return. The lower caps
+# for smaller aggregate turnover slabs are out of scope: businesses carry no
+# turnover here, so the figures are an upper bound for those taxpayers.
+# GSTR-9 is capped by turnover; without an amount it falls back to the same
+# Rs 10,000 so an old unfiled annual return does not accrue for years.
+PENALTY_RULES: Dict[str, PenaltyRule] = {rule.subtype: rule for rule in (
+    PenaltyRule("GSTR-1", 50, fee_cap=10_000),  # section 47
+    PenaltyRule("GSTR-3B", 50, fee_cap=10_000, interest_rate=18),  # sections 47 and 50
+    PenaltyRule("GSTR-9", 200, fee_cap=10_000, fee_cap_pct=0.5),  # capped at 0.5% of turnover
+    PenaltyRule("TDS Payment", 0, interest_rate=1.5, accrual=MONTHLY_OR_PART),  # section 201(1A)
+    PenaltyRule("24Q/26Q", 200, fee_cap_pct=100),  # section 234E, up to the TDS amount
+    PenaltyRule("AOC-4", 100),
+    PenaltyRule("MGT-7", 100),
+    PenaltyRule("LLP Form 11", 100),
+    PenaltyRule("LLP Form 8", 100),
+)}
+# Custom deadlines and unknown subtypes only accrue their own ``penalty_rate``
+_RULES = list(PENALTY_RULES.values()) + [PenaltyRule("", 0)]
+_RULE_INDEX = {rule.subtype: i for i, rule in enumerate(_RULES)}
+_NO_RULE = len(_RULES) - 1
+
+def _fee_table(days: int) -> np.ndarray:
+    """``[rule, days_late]`` -> accrued late fee before any cap"""
+    late = np.arange(days + 1, dtype=np.float64)
+    return np.stack([late * rule.fee_per_day for rule in _RULES])
+
+def _interest_table(days: int) -> np.ndarray:
+    """``[rule, days_late]`` -> accrued interest as a fraction of the amount"""
+    late = np.arange(days + 1, dtype=np.float64)
+    return np.stack([
+        rule.interest_rate / 100 * (np.ceil(late / 30) if rule.accrual == MONTHLY_OR_PART else late / 365)
+        for rule in _RULES
+    ])
+
+_FEE_CAP = np.array([np.inf if rule.fee_cap is None else rule.fee_cap for rule in _RULES])
+_FEE_CAP_PCT = np.array([np.nan if rule.fee_cap_pct is None else rule.fee_cap_pct for rule in _RULES])
+
+def _fee_cap(rule, amount):
+    """The percentage cap where the deadline has an amount, else the fixed rupee cap"""
+    return np.where((amount > 0) & ~np.isnan(_FEE_CAP_PCT[rule]), _FEE_CAP_PCT[rule] * amount / 100, _FEE_CAP[rule])
+
+
+class PenaltyAssessment:
+    """Late fees and interest for a set of open deadlines, accrued as of a day and projected ahead"""
+
+    def __init__(self, seqs: np.ndarray, business: np.ndarray, business_ids: List[str],
+                 fee: np.ndarray, interest: np.ndarray, projected: np.ndarray, days_late: np.ndarray):
+        self.seqs = seqs
+        self.business = business  # index into business_ids, per deadline
+        self.business_ids = business_ids
+        self.fee = fee
+        self.interest = interest
+        self.projected = projected
+        self.days_late = days_late
+
+    def totals(self) -> Dict[str, Dict]:
+        """Per-business sums, in one ``bincount`` per figure"""
+        count = len(self.business_ids)
+        fee = np.bincount(self.business, weights=self.fee, minlength=count)
+        interest = np.bincount(self.business, weights=self.interest, minlength=count)
+        projected = np.bincount(self.business, weights=self.projected, minlength=count)
+        overdue = np.bincount(self.business, weights=self.days_late > 0, minlength=count)
+        return {
+            business_id: {
+                "overdue": int(o),
+                "accrued_late_fees": round(f, 2),
+                "accrued_interest": round(i, 2),
+                "accrued_total": round(f + i, 2),
+                "projected_total": round(p, 2),
+                "penalty_risk": penalty_risk(f + i)
+            }
+            for business_id, o, f, i, p in zip(
+                self.business_ids, overdue.tolist(), fee.tolist(), interest.tolist(), projected.tolist()
+            )
+        }
+
+
+def penalty_risk(accrued: float) -> str:
+    if accrued <= 0:
+        return "low"
+    return "high" if accrued >= settings.PENALTY_RISK_HIGH else "medium"
+
+
+class PenaltyService:
+    """Accrued late fees and interest on open deadlines.
+
+    Subscribes to ``DeadlineService`` and mirrors each deadline into
+    columns indexed by its ``seq`` (rule, due date, amount, own penalty
+    rate, business, open flag). An assessment gathers the wanted rows and
+    looks fees and interest up in per-rule, per-day tables built at
+    start-up, so any number of businesses is one vectorized pass.
+    ``projection_days`` ahead the same lookup gives what would be owed if
+    nothing open were filed by then.
+    """
+
+    def __init__(self, deadline_service: DeadlineService, table_days: int = settings.PENALTY_TABLE_DAYS):
+        self.deadline_service = deadline_service
+        self.table_days = table_days
+        self._fees = _fee_table(table_days)
+        self._interest = _interest_table(table_days)
+        self._business_codes: Dict[str, int] = {}
+        self._rule = array("h")
+        self._due = array("i")
+        self._amount = array("d")
+        self._rate = array("d")
+        self._business = array("i")
+        self._open = array("b")
+        for deadline in deadline_service.records:
+            self.deadline_added(deadline)
+        deadline_service.subscribe(self)
+
+    # DeadlineService listener hooks
+    def deadline_added(self, deadline: Deadline):
+        if deadline.seq != len(self._due):
+            raise RuntimeError(f"Penalty columns out of step at deadline {deadline.seq}")
+        self._rule.append(_RULE_INDEX.get(deadline.subtype, _NO_RULE))
+        self._due.append(deadline.due)
+        self._amount.append(float(deadline.amount) if deadline.amount is not None else 0.0)
+        self._rate.append(float(deadline.penalty_rate) if deadline.penalty_rate is not None else np.nan)
+        self._business.append(self._business_codes.setdefault(deadline.business_id, len(self._business_codes)))
+        self._open.append(deadline.is_open)
+
+    def deadline_completed(self, deadline: Deadline, was_overdue: bool):
+        self._open[deadline.seq] = 0
+
+    def deadline_overdue(self, deadline: Deadline):
+        pass  # lateness is computed from the due date
+
+    def _accrued(self, rule, due, amount, rate, as_of: int):
+        days = np.clip(as_of - due, 0, self.table_days)
+        fee = np.minimum(self._fees[rule, days], _fee_cap(rule, amount))
+        # A deadline's own penalty_rate is simple interest per annum on its amount
+        interest = amount * np.where(np.isnan(rate), self._interest[rule, days], rate / 100 * days / 365)
+        return np.round(fee, 2), np.round(interest, 2), days
+
+    def penalty_on(self, deadline: Deadline, day: int) -> float:
+        """Late fee plus interest ``deadline`` had accrued by ``day`` (an ordinal).
+
+        Scalar form of ``_accrued`` over the same tables, for one deadline at a time.
+        """
+        if day <= deadline.due:
+            return 0.0
+        seq = deadline.seq
+        rule, amount, rate = self._rule[seq], self._amount[seq], self._rate[seq]
+        days = min(day - deadline.due, self.table_days)
+        cap_pct = _FEE_CAP_PCT[rule]
+        cap = cap_pct * amount / 100 if amount > 0 and not math.isnan(cap_pct) else _FEE_CAP[rule]
+        fee = min(float(self._fees[rule, days]), cap)
+        interest = amount * (float(self._interest[rule, days]) if math.isnan(rate) else rate / 100 * days / 365)
+        return round(fee, 2) + round(interest, 2)
+
+    def assess(
+        self,
+        business_ids: Optional[Iterable[str]] = None,
+        today: Optional[date] = None,
+        projection_days: int = settings.PENALTY_PROJECTION_DAYS
+    ) -> PenaltyAssessment:
+        """Penalties on the open deadlines of ``business_ids`` (every business when omitted)"""
+        today = today or self.deadline_service.today
+        if business_ids is None:
+            seqs = np.flatnonzero(np.frombuffer(self._open, dtype=np.int8))
+            ids = list(self._business_codes)
+            business = np.frombuffer(self._business, dtype=np.int32)[seqs]
+        else:
+            ids = list(business_ids)
+            per_business = [self.deadline_service.open_seqs(business_id) for business_id in ids]
+            seqs = np.fromiter((seq for group in per_business for seq in group), dtype=np.int64,
+                               count=sum(map(len, per_business)))
+            business = np.repeat(np.arange(len(ids)), [len(group) for group in per_business])
+
+        rule = np.frombuffer(self._rule, dtype=np.int16)[seqs]
+        due = np.frombuffer(self._due, dtype=np.int32)[seqs]
+        amount = np.frombuffer(self._amount, dtype=np.float64)[seqs]
+        rate = np.frombuffer(self._rate, dtype=np.float64)[seqs]
+
+        as_of = today.toordinal()
+        fee, interest, days = self._accrued(rule, due, amount, rate, as_of)
+        projected_fee, projected_interest, _ = self._accrued(
+            rule, due, amount, rate, (today + timedelta(days=projection_days)).toordinal()
+        )
+        return PenaltyAssessment(seqs, business, ids, fee, interest, projected_fee + projected_interest, days)
+
+    def business_penalties(self, business_id: str, today: Optional[date] = None) -> Dict:
+        """Totals plus a per-deadline breakdown of what is accruing for one business"""
+        today = today or self.deadline_service.today
+        assessment = self.assess([business_id], today)
+        records = self.deadline_service.records
+        accruing = np.flatnonzero(assessment.days_late > 0)
+        return {
+            **assessment.totals()[business_id],
+            "projection_days": settings.PENALTY_PROJECTION_DAYS,
+            "deadlines": [{
+                **records[int(assessment.seqs[i])].to_dict(today),
+                "days_late": int(assessment.days_late[i]),
+                "late_fee": float(assessment.fee[i]),
+                "interest": float(assessment.interest[i])
+            } for i in accruing]
+        }
@@ -0,0 +1,275 @@
+import csv
+import io
+import logging
+import re
+from datetime import date, datetime
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Mismatch reasons, stored as a bitmask per matched pair
+DATE = 1
+TAXABLE_VALUE = 2
+TAX_AMOUNT = 4
+INVOICE_NUMBER = 8
+REASONS = ((DATE, "invoice_date"), (TAXABLE_VALUE, "taxable_value"),
+           (TAX_AMOUNT, "tax_amount"), (INVOICE_NUMBER, "invoice_number"))
+
+INVOICE_COLUMNS = ("gstin", "invoice_number", "invoice_date", "taxable_value", "tax_amount")
+
+_LEADING_ZEROS = re.compile(r"(?<![0-9])0+(?=[0-9])")
+_INVOICE_NUMBER_NOISE = re.compile(r"[^0-9A-Z]")
+
+def normalize_invoice_number(value: str) -> str:
+    """``inv/0042`` and ``INV-42`` compare equal: upper-case, zero padding and separators dropped"""
+    return _INVOICE_NUMBER_NOISE.sub("", _LEADING_ZEROS.sub("", value.upper()))
+
+def _parse_date(value: str) -> int:
+    value = value.strip()
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        # GSTN exports use DD-MM-YYYY
+        return datetime.strptime(value.replace("/", "-"), "%d-%m-%Y").toordinal()
+
+
+class InvoiceTable:
+    """Column-oriented invoice lines from one side of a reconciliation"""
+
+    __slots__ = ("gstin", "invoice_number", "date", "taxable_value", "tax_amount", "line")
+
+    def __init__(
+        self,
+        gstin: List[str],
+        invoice_number: List[str],
+        dates: Iterable[int],
+        taxable_value: Iterable[float],
+        tax_amount: Iterable[float],
+        line: Optional[Iterable[int]] = None
+    ):
+        count = len(gstin)
+        self.gstin = gstin
+        self.invoice_number = invoice_number
+        self.date = np.fromiter(dates, dtype=np.int32, count=count)
+        self.taxable_value = np.fromiter(taxable_value, dtype=np.float64, count=count)
+        self.tax_amount = np.fromiter(tax_amount, dtype=np.float64, count=count)
+        self.line = (np.fromiter(line, dtype=np.int32, count=count) if line is not None
+                     else np.arange(1, count + 1, dtype=np.int32))
+
+    def __len__(self) -> int:
+        return len(self.gstin)
+
+    @classmethod
+    def from_csv(cls, stream: BinaryIO, max_errors: int) -> Tuple["InvoiceTable", List[Dict]]:
+        """Read ``INVOICE_COLUMNS`` from a CSV upload; bad lines become errors, not rows"""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            return cls._read_csv(csv.reader(text), max_errors)
+        finally:
+            # Leave the upload's file open for its owner to close
+            text.detach()
+
+    @classmethod
+    def _read_csv(cls, reader, max_errors: int) -> Tuple["InvoiceTable", List[Dict]]:
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [column for column in INVOICE_COLUMNS if column not in header]
+        if missing:
+            return cls([], [], [], [], []), [{"line": 1, "errors": [f"Missing columns: {', '.join(missing)}"]}]
+        g, n, d, v, t = (header.index(column) for column in INVOICE_COLUMNS)
+
+        gstin, number, dates, taxable, tax, lines = [], [], [], [], [], []
+        errors: List[Dict] = []
+        for line_no, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                parsed = (row[g].strip().upper(), row[n].strip(), _parse_date(row[d]),
+                          float(row[v] or 0), float(row[t] or 0))
+            except IndexError:
+                if len(errors) < max_errors:
+                    errors.append({"line": line_no, "errors": [f"Expected {len(header)} columns, got {len(row)}"]})
+                continue
+            except ValueError as e:
+                if len(errors) < max_errors:
+                    errors.append({"line": line_no, "errors": [str(e)]})
+                continue
+            gstin.append(parsed[0])
+            number.append(parsed[1])
+            dates.append(parsed[2])
+            taxable.append(parsed[3])
+            tax.append(parsed[4])
+            lines.append(line_no)
+        return cls(gstin, number, dates, taxable, tax, lines), errors
+
+
+def _factorize(left: Iterable, right: Iterable, left_count: int, right_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer codes for hashable keys, shared between both sides"""
+    codes: Dict = {}
+    left_codes = np.fromiter((codes.setdefault(k, len(codes)) for k in left), dtype=np.int64, count=left_count)
+    right_codes = np.fromiter((codes.setdefault(k, len(codes)) for k in right), dtype=np.int64, count=right_count)
+    return left_codes, right_codes
+
+def _occurrence(codes: np.ndarray) -> np.ndarray:
+    """0 for the first line with a code, 1 for the second and so on"""
+    order = np.argsort(codes, kind="stable")
+    ordered = codes[order]
+    positions = np.arange(len(codes))
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    rank = np.empty(len(codes), dtype=np.int64)
+    rank[order] = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    return rank
+
+def _join(left_codes: np.ndarray, right_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """One-to-one equi-join on codes; the n-th duplicate on one side pairs with the n-th on the other"""
+    if not len(left_codes) or not len(right_codes):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    left_rank, right_rank = _occurrence(left_codes), _occurrence(right_codes)
+    width = int(max(left_rank.max(), right_rank.max())) + 1
+    _, left_idx, right_idx = np.intersect1d(
+        left_codes * width + left_rank, right_codes * width + right_rank,
+        assume_unique=True, return_indices=True
+    )
+    return left_idx, right_idx
+
+def _differs(a: np.ndarray, b: np.ndarray, absolute: float, percent: float) -> np.ndarray:
+    return np.abs(a - b) > np.maximum(absolute, np.maximum(np.abs(a), np.abs(b)) * percent / 100)
+
+
+class ReconciliationResult:
+    """Index buckets produced by ``reconcile`` plus the ITC figures they imply.
+
+    ``matched`` and ``mismatched`` are ``(book_idx, supplier_idx, reasons)``
+    over the two input tables; ``missing_in_2b`` are book lines the supplier
+    never reported and ``missing_in_books`` supplier lines not yet booked.
+    """
+
+    def __init__(self, books: InvoiceTable, supplier: InvoiceTable, book_idx, supplier_idx, reasons):
+        self.books = books
+        self.supplier = supplier
+        clean = reasons == 0
+        self.matched = (book_idx[clean], supplier_idx[clean])
+        self.mismatched = (book_idx[~clean], supplier_idx[~clean], reasons[~clean])
+
+        booked = np.zeros(len(books), dtype=bool)
+        booked[book_idx] = True
+        reported = np.zeros(len(supplier), dtype=bool)
+        reported[supplier_idx] = True
+        self.missing_in_2b = np.flatnonzero(~booked)
+        self.missing_in_books = np.flatnonzero(~reported)
+
+    @property
+    def itc_available(self) -> float:
+        """Tax credit the supplier returns make available"""
+        return round(float(self.supplier.tax_amount.sum()), 2)
+
+    @property
+    def itc_claimed(self) -> float:
+        """Credit claimable from the books: paired lines only, at the lower of the two amounts"""
+        book_idx = np.concatenate([self.matched[0], self.mismatched[0]])
+        supplier_idx = np.concatenate([self.matched[1], self.mismatched[1]])
+        return round(float(np.minimum(
+            self.books.tax_amount[book_idx], self.supplier.tax_amount[supplier_idx]
+        ).sum()), 2)
+
+    @property
+    def status(self) -> str:
+        if len(self.mismatched[0]) or len(self.missing_in_2b) or len(self.missing_in_books):
+            return "discrepancies"
+        return "reconciled"
+
+    def _line(self, table: InvoiceTable, i: int) -> Dict:
+        return {
+            "line": int(table.line[i]),
+            "gstin": table.gstin[i],
+            "invoice_number": table.invoice_number[i],
+            "invoice_date": date.fromordinal(int(table.date[i])).isoformat(),
+            "taxable_value": float(table.taxable_value[i]),
+            "tax_amount": float(table.tax_amount[i])
+        }
+
+    def to_dict(self, max_details: int) -> Dict:
+        mismatched_book, mismatched_supplier, reasons = self.mismatched
+        return {
+            "reconciliation_status": self.status,
+            "itc_available": self.itc_available,
+            "itc_claimed": self.itc_claimed,
+            "counts": {
+                "matched": len(self.matched[0]),
+                "mismatched": len(mismatched_book),
+                "missing_in_2b": len(self.missing_in_2b),
+                "missing_in_books": len(self.missing_in_books)
+            },
+            "mismatched": [{
+                "books": self._line(self.books, b),
+                "supplier": self._line(self.supplier, s),
+                "reasons": [name for bit, name in REASONS if r & bit]
+            } for b, s, r in zip(mismatched_book[:max_details], mismatched_supplier[:max_details],
+                                 reasons[:max_details])],
+            "missing_in_2b": [self._line(self.books, i) for i in self.missing_in_2b[:max_details]],
+            "missing_in_books": [self._line(self.supplier, i) for i in self.missing_in_books[:max_details]]
+        }
+
+
+def reconcile(
+    books: InvoiceTable,
+    supplier: InvoiceTable,
+    date_tolerance_days: Optional[int] = None,
+    amount_tolerance: Optional[float] = None,
+    amount_tolerance_pct: Optional[float] = None
+) -> ReconciliationResult:
+    """Match the purchase register against supplier-reported (GSTR-2A/2B) lines.
+
+    Pass 1 hash-joins on (GSTIN, normalized invoice number); a pair whose
+    date or amounts fall outside tolerance is kept as mismatched with the
+    reasons flagged. Pass 2 takes what is left on both sides and joins on
+    (GSTIN, tax amount in paise), accepting pairs within the date tolerance
+    as an invoice-number mismatch. Python only runs once per line to build
+    the join keys; the joins and comparisons are numpy array operations.
+    """
+    date_tolerance_days = settings.RECON_DATE_TOLERANCE_DAYS if date_tolerance_days is None else date_tolerance_days
+    amount_tolerance = settings.RECON_AMOUNT_TOLERANCE if amount_tolerance is None else amount_tolerance
+    amount_tolerance_pct = settings.RECON_AMOUNT_TOLERANCE_PCT if amount_tolerance_pct is None else amount_tolerance_pct
+
+    book_codes, supplier_codes = _factorize(
+        zip(books.gstin, map(normalize_invoice_number, books.invoice_number)),
+        zip(supplier.gstin, map(normalize_invoice_number, supplier.invoice_number)),
+        len(books), len(supplier)
+    )
+    book_idx, supplier_idx = _join(book_codes, supplier_codes)
+    reasons = (
+        np.where(np.abs(books.date[book_idx] - supplier.date[supplier_idx]) > date_tolerance_days, DATE, 0)
+        | np.where(_differs(books.taxable_value[book_idx], supplier.taxable_value[supplier_idx],
+                            amount_tolerance, amount_tolerance_pct), TAXABLE_VALUE, 0)
+        | np.where(_differs(books.tax_amount[book_idx], supplier.tax_amount[supplier_idx],
+                            amount_tolerance, amount_tolerance_pct), TAX_AMOUNT, 0)
+    ).astype(np.int8)
+
+    # Pass 2 over the leftovers: same supplier and tax, different invoice number
+    book_left = np.setdiff1d(np.arange(len(books)), book_idx, assume_unique=True)
+    supplier_left = np.setdiff1d(np.arange(len(supplier)), supplier_idx, assume_unique=True)
+    book_paise = np.rint(books.tax_amount[book_left] * 100).astype(np.int64).tolist()
+    supplier_paise = np.rint(supplier.tax_amount[supplier_left] * 100).astype(np.int64).tolist()
+    left_codes, right_codes = _factorize(
+        zip((books.gstin[i] for i in book_left), book_paise),
+        zip((supplier.gstin[i] for i in supplier_left), supplier_paise),
+        len(book_left), len(supplier_left)
+    )
+    left, right = _join(left_codes, right_codes)
+    left, right = book_left[left], supplier_left[right]
+    close = np.abs(books.date[left] - supplier.date[right]) <= date_tolerance_days
+    left, right = left[close], right[close]
+    taxable_reason = np.where(_differs(books.taxable_value[left], supplier.taxable_value[right],
+                                       amount_tolerance, amount_tolerance_pct), TAXABLE_VALUE, 0)
+
+    return ReconciliationResult(
+        books, supplier,
+        np.concatenate([book_idx, left]),
+        np.concatenate([supplier_idx, right]),
+        np.concatenate([reasons, (INVOICE_NUMBER | taxable_reason).astype(np.int8)])
+    )
@@ -0,0 +1,54 @@
+import logging
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.utils.company_index import CompanyIndex
+
+logger = logging.getLogger(__name__)
+
+class ROCService:
+    """Company master lookups (CIN, incorporation and AGM dates, status) for ROC work.
+
+    Served from the memory-mapped index at ``ROC_INDEX_PATH``; opening it
+    reads only the file header, so start-up cost and resident memory do
+    not grow with the snapshot.
+    """
+
+    def __init__(self, index_path: str = settings.ROC_INDEX_PATH):
+        self.index_path = index_path
+        self.index: Optional[CompanyIndex] = None
+        try:
+            self.index = CompanyIndex(index_path)
+            logger.info(f"Company master index loaded: {len(self.index)} companies")
+        except FileNotFoundError:
+            logger.warning(f"Company master index {index_path} not found; ROC lookups disabled")
+
+    def _get_index(self) -> CompanyIndex:
+        if self.index is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Company master index is not built"
+            )
+        return self.index
+
+    def get_company(self, cin: str) -> Dict:
+        company = self._get_index().get(cin)
+        if company is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+        return company
+
+    def search(self, name_prefix: str, limit: int) -> List[Dict]:
+        return self._get_index().search(name_prefix, limit)
+
+    def stats(self) -> Dict:
+        return {
+            "index_path": self.index_path,
+            "companies": len(self.index) if self.index is not None else None
+        }
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.utils.validators import validate_pans
+
+logger = logging.getLogger(__name__)
+
+# Threshold modes: "aggregate" taxes the whole FY-to-date amount once the
+# annual threshold is crossed (catching up on earlier untaxed payments),
+# "excess" taxes only the part above the threshold
+AGGREGATE = "aggregate"
+EXCESS = "excess"
+
+class TDSSection(NamedTuple):
+    code: str
+    nature: str
+    individual_rate: float  # percent, payee PAN holder type P (individual) or H (HUF)
+    other_rate: float  # percent, any other PAN holder
+    no_pan_rate: float  # percent, section 206AA (PAN missing or invalid)
+    single_threshold: Optional[float]  # a single payment above this is taxed on its own
+    annual_threshold: Optional[float]  # FY aggregate per payee
+    mode: str = AGGREGATE
+
+# Rates and thresholds for FY 2025-26
+TDS_SECTIONS: Dict[str, TDSSection] = {s.code: s for s in (
+    TDSSection("194A", "Interest other than on securities", 10, 10, 20, None, 10_000),
+    TDSSection("194C", "Payments to contractors", 1, 2, 20, 30_000, 100_000),
+    TDSSection("194H", "Commission or brokerage", 2, 2, 20, None, 20_000),
+    # Rent thresholds are per month; monthly rent payments are taxed individually
+    TDSSection("194I(a)", "Rent of plant and machinery", 2, 2, 20, 50_000, None),
+    TDSSection("194I(b)", "Rent of land, building or furniture", 10, 10, 20, 50_000, None),
+    TDSSection("194J(a)", "Fees for technical services", 2, 2, 20, None, 50_000),
+    TDSSection("194J(b)", "Fees for professional services", 10, 10, 20, None, 50_000),
+    TDSSection("194Q", "Purchase of goods", 0.1, 0.1, 5, None, 5_000_000, EXCESS),
+)}
+SECTION_CODES = tuple(TDS_SECTIONS)
+_SECTION_INDEX = {code.upper(): i for i, code in enumerate(SECTION_CODES)}
+
+# Per-section parameters as arrays indexed by section number, in paise
+_NO_LIMIT = np.iinfo(np.int64).max
+_SINGLE = np.array([_NO_LIMIT if s.single_threshold is None else round(s.single_threshold * 100)
+                    for s in TDS_SECTIONS.values()], dtype=np.int64)
+_ANNUAL = np.array([_NO_LIMIT if s.annual_threshold is None else round(s.annual_threshold * 100)
+                    for s in TDS_SECTIONS.values()], dtype=np.int64)
+_EXCESS = np.array([s.mode == EXCESS for s in TDS_SECTIONS.values()])
+_RATES = np.array([[s.individual_rate, s.other_rate, s.no_pan_rate] for s in TDS_SECTIONS.values()])
+_INDIVIDUAL, _OTHER, _NO_PAN = range(3)
+
+def financial_year(day: date) -> int:
+    """Starting calendar year of the April-March financial year ``day`` falls in"""
+    return day.year if day.month >= 4 else day.year - 1
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+def _paise(amounts: Sequence[float], count: int) -> np.ndarray:
+    return np.rint(np.fromiter(amounts, dtype=np.float64, count=count) * 100).astype(np.int64)
+
+
+class PaymentBatch:
+    """Column-oriented vendor payments for one TDS run"""
+
+    __slots__ = ("vendor", "pan", "section", "amount", "date", "pan_ok", "rate_class")
+
+    def __init__(
+        self,
+        vendor: List[str],
+        pan: List[Optional[str]],
+        section: Sequence[int],
+        amount: Sequence[float],
+        dates: Sequence[date]
+    ):
+        count = len(vendor)
+        self.vendor = vendor
+        self.pan = [(p or "").strip().upper() for p in pan]
+        self.section = np.fromiter(section, dtype=np.int16, count=count)
+        self.amount = _paise(amount, count)
+        self.date = dates
+        self.pan_ok = validate_pans(self.pan) == 0 if count else np.zeros(0, dtype=bool)
+        holder = np.array([p[3:4] for p in self.pan], dtype="U1") if count else np.zeros(0, dtype="U1")
+        self.rate_class = np.where(
+            ~self.pan_ok, _NO_PAN, np.where((holder == "P") | (holder == "H"), _INDIVIDUAL, _OTHER)
+        ).astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.vendor)
+
+
+class TDSResult:
+    """Per-payment deductions from ``compute_tds`` plus closing FY aggregates per payee and section"""
+
+    def __init__(self, batch: PaymentBatch, taxable, rate, tds, shortfall,
+                 groups: List[Tuple[int, str, int]], paid, taxed):
+        self.batch = batch
+        self.taxable = taxable  # paise
+        self.rate = rate  # percent
+        self.tds = tds  # rupees
+        self.shortfall = shortfall  # rupees due but more than the payment could cover
+        self.groups = groups  # (financial_year, payee, section) per group
+        self.paid = paid  # paise, FY-to-date after this batch, per group
+        self.taxed = taxed
+
+    def summary(self) -> List[Dict]:
+        batch = self.batch
+        sections = np.arange(len(SECTION_CODES))
+        count = np.bincount(batch.section, minlength=len(sections))
+        amount = np.bincount(batch.section, weights=batch.amount, minlength=len(sections))
+        taxable = np.bincount(batch.section, weights=self.taxable, minlength=len(sections))
+        tds = np.bincount(batch.section, weights=self.tds, minlength=len(sections))
+        return [{
+            "section": SECTION_CODES[s],
+            "payments": int(count[s]),
+            "amount": round(float(amount[s]) / 100, 2),
+            "taxable_amount": round(float(taxable[s]) / 100, 2),
+            "tds": round(float(tds[s]), 2)
+        } for s in sections if count[s]]
+
+    def to_dict(self, indices: Sequence[int]) -> Dict:
+        """``indices`` maps batch rows back to positions in the caller's payment list"""
+        batch = self.batch
+        section = [SECTION_CODES[s] for s in batch.section.tolist()]
+        higher_rate = (~batch.pan_ok).tolist()
+        taxable = (self.taxable / 100).tolist()
+        rate = self.rate.tolist()
+        tds = self.tds.tolist()
+        shortfall = self.shortfall.tolist()
+        net = ((batch.amount - self.tds * 100) / 100).tolist()
+        return {
+            "total_tds": round(float(self.tds.sum()), 2),
+            "total_shortfall": round(float(self.shortfall.sum()), 2),
+            "summary": self.summary(),
+            "deductions": [{
+                "index": indices[i],
+                "section": section[i],
+                "taxable_amount": taxable[i],
+                "rate": rate[i],
+                "tds": tds[i],
+                "shortfall": shortfall[i],
+                "net_payable": net[i],
+                "higher_rate": higher_rate[i]
+            } for i in range(len(batch))],
+            # Pass back as ``opening`` for the next run in the same financial year
+            "closing": [{
+                "financial_year": fy,
+                "payee": payee,
+                "section": SECTION_CODES[section],
+                "paid": float(paid) / 100,
+                "taxed": float(taxed) / 100
+            } for (fy, payee, section), paid, taxed in zip(self.groups, self.paid.tolist(), self.taxed.tolist())]
+        }
+
+
+def _group_shift(values: np.ndarray, starts: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Previous value within each group; ``first`` for the group's first row"""
+    shifted = np.empty_like(values)
+    shifted[1:] = values[:-1]
+    shifted[starts] = first[starts]
+    return shifted
+
+def _group_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Running total restarting at every group start"""
+    total = np.cumsum(values)
+    offset = np.where(starts, total - values, 0)
+    return total - np.maximum.accumulate(offset)
+
+def compute_tds(batch: PaymentBatch, opening: Optional[Dict[Tuple[int, str, int], Tuple[float, float]]] = None) -> TDSResult:
+    """Section-wise TDS for a payment batch with FY-to-date thresholds per payee.
+
+    Payments are grouped by (financial year, payee, section), where the
+    payee is the PAN or, without a valid one, ``vendor:<vendor>``. ``opening`` maps
+    a group to the ``(paid, taxed)`` rupee amounts from earlier runs. Within
+    a group, sorted by date, the running aggregate decides the taxable base:
+
+    * aggregate sections tax a payment above ``single_threshold`` on its
+      own, and once the FY total crosses ``annual_threshold`` everything
+      paid so far that was not yet taxed, then every later payment in full
+    * excess sections tax only the part of the FY total above the threshold
+
+    Python runs once per payment to build the group keys; sorting, running
+    totals and rates are numpy array operations.
+    """
+    opening = opening or {}
+    count = len(batch)
+    ordinal = np.fromiter((day.toordinal() for day in batch.date), dtype=np.int64, count=count)
+    days = (ordinal - _EPOCH).astype("datetime64[D]")
+    fy = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    fy -= days.astype("datetime64[M]").astype(np.int64) % 12 < 3  # January-March
+
+    payees: Dict[str, int] = {}
+    payee = np.fromiter((
+        payees.setdefault(pan if ok else f"vendor:{vendor}", len(payees))
+        for pan, ok, vendor in zip(batch.pan, batch.pan_ok.tolist(), batch.vendor)
+    ), dtype=np.int64, count=count)
+    # One integer per (financial year, payee, section) group
+    sections = len(SECTION_CODES)
+    first_fy = int(fy.min()) if count else 0
+    keys, group = np.unique(
+        ((fy - first_fy) * len(payees) + payee) * sections + batch.section, return_inverse=True
+    )
+    payee_names = list(payees)
+    groups = [(first_fy + int(k) // sections // len(payee_names), payee_names[int(k) // sections % len(payee_names)],
+               int(k) % sections) for k in keys.tolist()]
+    index = {key: i for i, key in enumerate(groups)} if opening else {}
+    opening_paid = np.zeros(len(groups), dtype=np.int64)
+    opening_taxed = np.zeros(len(groups), dtype=np.int64)
+    for key, (paid, taxed) in opening.items():
+        if key in index:
+            opening_paid[index[key]] = round(paid * 100)
+            opening_taxed[index[key]] = round(taxed * 100)
+
+    order = np.lexsort((np.arange(count), ordinal, group))
+    grp = group[order]
+    amount = batch.amount[order]
+    section = batch.section[order]
+    starts = np.ones(count, dtype=bool)
+    starts[1:] = grp[1:] != grp[:-1]
+
+    single = _SINGLE[section]
+    annual = _ANNUAL[section]
+    first_taxed = opening_taxed[grp]
+    after = opening_paid[grp] + _group_cumsum(amount, starts)
+    before = after - amount
+
+    # Aggregate mode: cumulative taxed base through each payment
+    single_taxed = first_taxed + _group_cumsum(np.where(amount > single, amount, 0), starts)
+    taxed = np.where(after > annual, after, single_taxed)
+    aggregate_base = taxed - _group_shift(taxed, starts, first_taxed)
+    # Excess mode: the part of this payment above the threshold
+    excess_base = np.maximum(after - annual, 0) - np.maximum(before - annual, 0)
+    excess = _EXCESS[section]
+    base = np.where(excess, excess_base, aggregate_base)
+    taxed = np.where(excess, np.maximum(after - annual, 0), taxed)
+
+    rate = _RATES[section, batch.rate_class[order]]
+    # TDS is rounded to the nearest rupee (section 288B); a catch-up larger
+    # than the payment itself is deducted up to the payment, the rest is shortfall
+    due = np.rint(base * rate / 10_000)
+    tds = np.minimum(due, amount // 100)
+
+    ends = np.flatnonzero(np.append(starts[1:], count > 0))
+    closing_paid = np.zeros(len(groups), dtype=np.int64)
+    closing_taxed = np.zeros(len(groups), dtype=np.int64)
+    closing_paid[grp[ends]] = after[ends]
+    closing_taxed[grp[ends]] = taxed[ends]
+
+    unsorted = np.empty(count, dtype=np.int64)
+    unsorted[order] = np.arange(count)
+    return TDSResult(batch, base[unsorted], rate[unsorted], tds[unsorted], (due - tds)[unsorted],
+                     groups, closing_paid, closing_taxed)
+
+
+class TDSService:
+    async def compute(self, payments: List, opening: List) -> Dict:
+        """Compute TDS for a batch of vendor payments (``TDSPayment`` models).
+
+        Payments under an unknown section are reported as errors and left
+        out; the rest are computed in a worker thread.
+        """
+        if len(payments) > settings.TDS_MAX_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.TDS_MAX_BATCH} payments per request"
+            )
+
+        def run() -> Dict:
+            indices, vendor, pan, section, amount, dates = [], [], [], [], [], []
+            errors: List[Dict] = []
+            for i, payment in enumerate(payments):
+                code = _SECTION_INDEX.get(payment.section.strip().upper())
+                if code is None:
+                    errors.append({"index": i, "errors": [f"Unknown section '{payment.section}'"]})
+                    continue
+                indices.append(i)
+                vendor.append(payment.vendor)
+                pan.append(payment.pan)
+                section.append(code)
+                amount.append(payment.amount)
+                dates.append(payment.payment_date)
+
+            balances = {}
+            for entry in opening:
+                code = _SECTION_INDEX.get(entry.section.strip().upper())
+                if code is not None:
+                    payee = entry.payee.strip()
+                    if not payee.startswith("vendor:"):
+                        payee = payee.upper()
+                    balances[(entry.financial_year, payee, code)] = (entry.paid, entry.taxed)
+
+            result = compute_tds(PaymentBatch(vendor, pan, section, amount, dates), balances)
+            return {**result.to_dict(indices), "errors": errors}
+
+        result = await asyncio.get_running_loop().run_in_executor(None, run)
+        logger.info(f"Computed TDS on {len(payments)} payments: {result['total_tds']}")
+        return result
@@ -0,0 +1,66 @@
+import hashlib
+import logging
+import uuid
+from typing import Dict, Iterable
+
+from app.services.auth_service import AuthService
+from app.services.deadline_service import Deadline, DeadlineService
+from app.services.gst_service import GSTService
+
+logger = logging.getLogger(__name__)
+
+
+class VersionService:
+    """Monotonic per-business data versions, for ETags on read endpoints.
+
+    Subscribes to the deadline, GST and auth services and bumps a
+    business's counter on every write they report. Counters live in
+    process memory and start from zero, so each process has its own
+    ``epoch`` in the tags: a restart can never answer 304 to a tag from
+    before it. Tags also carry the deadline engine's day, since overdue
+    counts and accrued penalties move with the date and not only with writes.
+    """
+
+    def __init__(self, deadline_service: DeadlineService, gst_service: GSTService, auth_service: AuthService):
+        self.deadline_service = deadline_service
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        deadline_service.subscribe(self)
+        gst_service.subscribe(self)
+        auth_service.subscribe(self)
+
+    def version(self, business_id: str) -> int:
+        return self._versions.get(business_id, 0)
+
+    def bump(self, business_id: str):
+        self._versions[business_id] = self._versions.get(business_id, 0) + 1
+
+    def etag(self, business_id: str, user_id: str, resource: str) -> str:
+        """Weak tag for ``resource`` (path and query) as ``user_id`` sees it now"""
+        scope = hashlib.blake2b(f"{user_id}\0{resource}".encode(), digest_size=6).hexdigest()
+        return (
+            f'W/"{self.epoch}-{self.deadline_service.today.toordinal()}-'
+            f'{self.version(business_id)}-{scope}"'
+        )
+
+    # DeadlineService listener hooks
+    def deadline_added(self, deadline: Deadline):
+        self.bump(deadline.business_id)
+
+    def deadline_completed(self, deadline: Deadline, was_overdue: bool):
+        self.bump(deadline.business_id)
+
+    def deadline_overdue(self, deadline: Deadline):
+        self.bump(deadline.business_id)
+
+    # GSTService listener hooks
+    def filings_added(self, rows: Iterable[Dict]):
+        for business_id in {row["business_id"] for row in rows}:
+            self.bump(business_id)
+
+    def filing_updated(self, row: Dict, changes: Dict):
+        self.bump(row["business_id"])
+
+    # AuthService listener hooks
+    def profile_changed(self, business_id: str):
+        self.bump(business_id)
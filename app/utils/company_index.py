@@ -0,0 +1,236 @@
+"""Fixed-width, sorted company master index served through ``mmap``.
+
+The file is a small header followed by two sorted regions:
+
+* company records, ``RECORD`` layout, ordered by CIN
+* name entries (normalized name prefix, record number), ordered by name
+
+Lookups bisect a region in place, so opening the index reads only the
+header and a lookup touches a couple of dozen pages; nothing is parsed
+into Python objects up front. Build the file from an MCA company master
+CSV snapshot with::
+
+    python -m app.utils.company_index snapshot.csv data/roc_companies.idx
+"""
+import bisect
+import csv
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+MAGIC = b"NIYAMROC"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIII")  # magic, version, reserved, count, record size, name entry size
+
+NAME_KEY_BYTES = 48
+RECORD = np.dtype([
+    ("cin", "S21"), ("name", "S120"), ("status", "S32"), ("category", "S40"), ("state", "S32"),
+    ("roc", "S24"), ("incorporated", "<i4"), ("last_agm", "<i4"), ("last_balance_sheet", "<i4"),
+])
+NAME_ENTRY = np.dtype([("key", f"S{NAME_KEY_BYTES}"), ("record", "<u4")])
+_TEXT_FIELDS = ("cin", "name", "status", "category", "state", "roc")
+_DATE_FIELDS = ("incorporated", "last_agm", "last_balance_sheet")
+_RECORD = struct.Struct("<" + "".join(f"{RECORD[f].itemsize}s" for f in _TEXT_FIELDS) + "iii")
+
+# Snapshot column names (MCA company master export first) per field
+COLUMNS: Dict[str, tuple] = {
+    "cin": ("corporate_identification_number", "cin"),
+    "name": ("company_name", "name"),
+    "status": ("company_status", "status", "filing_status"),
+    "category": ("company_category", "category"),
+    "state": ("registered_state", "state"),
+    "roc": ("registrar_of_companies", "roc"),
+    "incorporated": ("date_of_registration", "incorporation_date", "date_of_incorporation"),
+    "last_agm": ("date_of_last_agm", "last_agm_date", "agm_date"),
+    "last_balance_sheet": ("date_of_balance_sheet", "last_balance_sheet_date", "balance_sheet_date"),
+}
+
+_NAME_NOISE = re.compile(r"[^0-9A-Z]+")
+
+def name_key(name: str) -> bytes:
+    """Case- and punctuation-insensitive sort key: ``m/s. abc & co`` -> ``M S ABC CO``"""
+    return _NAME_NOISE.sub(" ", name.upper()).strip().encode("utf-8")
+
+def _ordinal(value: str) -> int:
+    value = (value or "").strip()
+    if not value:
+        return 0
+    for parse in (date.fromisoformat, lambda v: datetime.strptime(v.replace("/", "-"), "%d-%m-%Y").date()):
+        try:
+            return parse(value[:10]).toordinal()
+        except ValueError:
+            continue
+    return 0
+
+def _encode(value: str, size: int) -> bytes:
+    # Truncate on a character boundary
+    return value.strip().encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+
+class _Keys:
+    """Sequence view of fixed-width keys inside an mmap, for ``bisect``"""
+
+    __slots__ = ("mm", "offset", "stride", "width", "count")
+
+    def __init__(self, mm: mmap.mmap, offset: int, stride: int, width: int, count: int):
+        self.mm = mm
+        self.offset = offset
+        self.stride = stride
+        self.width = width
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        start = self.offset + i * self.stride
+        return self.mm[start:start + self.width].rstrip(b"\0")
+
+
+class CompanyIndex:
+    """Read side: CIN and name-prefix lookups over a memory-mapped index file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_RANDOM"):
+            self._mm.madvise(mmap.MADV_RANDOM)  # bisection hops around; skip readahead
+        magic, version, _, count, record_size, entry_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.itemsize or entry_size != NAME_ENTRY.itemsize:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} company index")
+        self.count = count
+        self._records = HEADER.size
+        self._names = HEADER.size + count * record_size
+        self._cins = _Keys(self._mm, self._records, record_size, RECORD["cin"].itemsize, count)
+        self._name_keys = _Keys(self._mm, self._names, entry_size, NAME_KEY_BYTES, count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, i: int) -> Dict:
+        values = _RECORD.unpack_from(self._mm, self._records + i * RECORD.itemsize)
+        company = {
+            field: value.rstrip(b"\0").decode("utf-8", "replace") or None
+            for field, value in zip(_TEXT_FIELDS, values)
+        }
+        for field, ordinal in zip(_DATE_FIELDS, values[len(_TEXT_FIELDS):]):
+            company[field] = date.fromordinal(ordinal).isoformat() if ordinal else None
+        return company
+
+    def get(self, cin: str) -> Optional[Dict]:
+        key = cin.strip().upper().encode("ascii", "ignore")
+        i = bisect.bisect_left(self._cins, key)
+        if i < self.count and self._cins[i] == key:
+            return self._record(i)
+        return None
+
+    def search(self, prefix: str, limit: int) -> List[Dict]:
+        """Companies whose normalized name starts with ``prefix``, in name order"""
+        wanted = name_key(prefix)
+        key = wanted[:NAME_KEY_BYTES]
+        results = []
+        i = bisect.bisect_left(self._name_keys, key)
+        while i < self.count and len(results) < limit and self._name_keys[i].startswith(key):
+            record, = struct.unpack_from("<I", self._mm, self._names + i * NAME_ENTRY.itemsize + NAME_KEY_BYTES)
+            company = self._record(record)
+            # Keys hold only the first NAME_KEY_BYTES; longer prefixes are checked in full
+            if len(wanted) <= NAME_KEY_BYTES or name_key(company["name"] or "").startswith(wanted):
+                results.append(company)
+            i += 1
+        return results
+
+    def close(self):
+        self._mm.close()
+
+
+def _read_snapshot(path: str) -> Iterator[Dict[str, str]]:
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower().replace(" ", "_") for name in next(reader, [])]
+        positions = {}
+        for field, names in COLUMNS.items():
+            position = next((header.index(name) for name in names if name in header), None)
+            if position is not None:
+                positions[field] = position
+        if "cin" not in positions or "name" not in positions:
+            raise ValueError(f"{path} needs CIN and company name columns")
+        for row in reader:
+            yield {field: row[i] if i < len(row) else "" for field, i in positions.items()}
+
+
+def build_company_index(snapshot_path: str, index_path: str, chunk_rows: int = 100_000) -> int:
+    """Build ``index_path`` from a company master CSV; returns the number of companies.
+
+    Rows are packed into fixed-width records in chunks and spilled to a
+    temporary file, which is then sorted through ``np.memmap`` so memory
+    stays at the sort keys rather than the whole dataset. When a CIN
+    repeats, the last row wins.
+    """
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as work:
+        records_path = os.path.join(work, "records")
+        keys_path = os.path.join(work, "names")
+        count = 0
+        with open(records_path, "wb") as records_file, open(keys_path, "wb") as keys_file:
+            chunk = np.zeros(chunk_rows, dtype=RECORD)
+            keys = np.zeros(chunk_rows, dtype=NAME_ENTRY["key"])
+            filled = 0
+            for row in _read_snapshot(snapshot_path):
+                cin = row["cin"].strip().upper()
+                if not cin:
+                    continue
+                chunk[filled] = (
+                    _encode(cin, 21), *(_encode(row.get(f, ""), RECORD[f].itemsize) for f in _TEXT_FIELDS[1:]),
+                    *(_ordinal(row.get(f, "")) for f in _DATE_FIELDS)
+                )
+                keys[filled] = name_key(row["name"])[:NAME_KEY_BYTES]
+                filled += 1
+                if filled == chunk_rows:
+                    chunk.tofile(records_file)
+                    keys.tofile(keys_file)
+                    count += filled
+                    filled = 0
+            chunk[:filled].tofile(records_file)
+            keys[:filled].tofile(keys_file)
+            count += filled
+
+        records = np.memmap(records_path, dtype=RECORD, mode="r", shape=(count,)) if count else np.zeros(0, RECORD)
+        names = np.memmap(keys_path, dtype=NAME_ENTRY["key"], mode="r", shape=(count,)) if count else np.zeros(0, "S1")
+        order = np.argsort(records["cin"], kind="stable")
+        cins = records["cin"][order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = cins[1:] != cins[:-1]
+        order = order[last]
+        del cins
+
+        entries = np.zeros(len(order), dtype=NAME_ENTRY)
+        entries["key"] = names[order]
+        entries["record"] = np.arange(len(order), dtype=np.uint32)
+        entries = entries[np.argsort(entries["key"], kind="stable")]
+
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(order), RECORD.itemsize, NAME_ENTRY.itemsize))
+            for start in range(0, len(order), chunk_rows):
+                f.write(records[order[start:start + chunk_rows]].tobytes())
+            f.write(entries.tobytes())
+        del records, names
+        os.replace(tmp_path, index_path)
+    return len(order)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m app.utils.company_index SNAPSHOT.csv INDEX_PATH")
+    built = build_company_index(sys.argv[1], sys.argv[2])
+    print(f"Indexed {built} companies into {sys.argv[2]}")
@@ -0,0 +1,140 @@
+"""Brotli/gzip response compression above a size threshold.
+
+Picks ``br`` when the client accepts it and the optional ``brotli``
+package is installed, otherwise ``gzip``. Responses smaller than
+``minimum_size``, already encoded, or of media types that are compressed
+already pass through untouched. Streaming bodies are compressed chunk by
+chunk, so large exports are never buffered whole.
+"""
+import logging
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Media types that gain nothing from a second compression pass
+_PRECOMPRESSED = ("image/", "video/", "audio/", "application/zip", "application/gzip", "application/pdf")
+
+def _accepted(accept_encoding: str) -> set:
+    """Codings the client accepts (``q=0`` means refused)"""
+    codings = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            codings.add(coding.strip())
+    return codings
+
+
+class _Compressor:
+    """One response's streaming encoder"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses of at least ``minimum_size`` bytes"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        if brotli is None:
+            logger.info("brotli package not installed; compressing with gzip only")
+
+    def _encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if "br" in accepted and brotli is not None:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+
+        async def wrapped_send(message: Message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                start = message  # held until the first body chunk shows the size
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(raw=response_start["headers"])
+                if (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(_PRECOMPRESSED)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    await send(response_start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                await send(response_start)
+            elif compressor is None:
+                await send(message)
+                return
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body
+            })
+
+        await self.app(scope, receive, wrapped_send)
@@ -0,0 +1,85 @@
+"""Conditional GETs answered from per-business data versions.
+
+For the configured read paths, the bearer token is verified (a cached
+lookup) and its ``bid`` claim names the business whose version the ETag
+is built from, via ``app.state.version_service``. A matching
+``If-None-Match`` gets a 304 before the route runs: no profile load,
+no backend query, no serialization. Otherwise the response goes out
+with the ETag computed before the handler ran, so a write that lands
+mid-request can only cost the client one extra full response.
+Tokens without ``bid`` fall through to the route unchanged.
+"""
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.security import verify_token
+
+# Clients must revalidate, and shared caches must not store per-user data
+CACHE_CONTROL = "private, no-cache"
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` against ``etag``"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ConditionalGetMiddleware:
+    """ETags and 304 responses for ``paths`` (exact request paths)"""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str] = ()):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    def _etag(self, scope: Scope, headers: Headers) -> Optional[str]:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            payload = verify_token(token)
+        except HTTPException:
+            return None  # the route reports the auth error
+        business_id = payload.get("bid")
+        versions = getattr(scope["app"].state, "version_service", None)
+        if not business_id or versions is None:
+            return None
+        query = scope.get("query_string", b"").decode("latin-1")
+        return versions.etag(business_id, payload["sub"], f"{scope['path']}?{query}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        etag = self._etag(scope, headers)
+        if etag is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", CACHE_CONTROL.encode()),
+                    (b"vary", b"Authorization"),
+                ]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def wrapped_send(message: Message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                response_headers = MutableHeaders(raw=message["headers"])
+                response_headers["ETag"] = etag
+                response_headers["Cache-Control"] = CACHE_CONTROL
+                response_headers.add_vary_header("Authorization")
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
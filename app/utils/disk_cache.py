@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ContentCache:
+    """Disk-backed JSON cache keyed by content hash, bounded by total bytes.
+
+    Each entry is one file, ``<directory>/<key[:2]>/<key>.json``. An
+    in-memory index of key -> size, ordered least recently used first, is
+    rebuilt from file modification times on start-up, and reads bump the
+    file's mtime so that order survives restarts. Writes evict from the LRU
+    end until the cache fits in ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    os.remove(path)  # torn write from a previous run
+                elif name.endswith(".json"):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            # Explicit ns timestamp: the kernel's coarse clock can tie with recent writes
+            now = time.time_ns()
+            os.utime(path, ns=(now, now))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self._discard(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _discard(self, key: str):
+        with self._lock:
+            self.bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,280 @@
+"""Request latency histograms and backend round-trip timing.
+
+``MetricsMiddleware`` times every request by route template, and counts
+the backend calls and auth work done while serving it. Backend clients
+and auth helpers report through ``backend_call`` and ``auth_work``, which
+add to process-wide histograms and, when called inside a request, to that
+request's tally (carried in a context variable, so concurrent requests
+never mix). ``registry.render()`` produces the Prometheus text format
+served at ``/metrics``, along with ``Sampled`` gauges and counters read
+from their owners (e.g. the password hashing pool); with ``server_timing`` on, each response also
+gets a ``Server-Timing`` header with the same per-request breakdown.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response adds the charset
+
+# Upper bounds in seconds; requests and backend round trips live in the ms
+# range, local MockDB calls and cached token checks in the us range
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination, in the Prometheus model"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = pairs + "," if pairs else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                yield f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}'
+            suffix = f"{{{pairs}}}" if pairs else ""
+            yield f"{self.name}_sum{suffix} {_format(total)}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Sampled:
+    """Gauge or counter whose value is read from ``sample`` at render time.
+
+    For figures an object already keeps (pool sizes, queue depths, totals),
+    so nothing extra is recorded on the hot path.
+    """
+
+    def __init__(self, name: str, documentation: str, sample: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.sample = sample
+        self.kind = kind
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield f"{self.name} {_format(self.sample())}"
+
+
+class MetricsRegistry:
+    """The metrics exposed at ``/metrics``"""
+
+    def __init__(self, namespace: str = "niyam"):
+        self.namespace = namespace
+        self._metrics: List = []
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = REQUEST_BUCKETS) -> Histogram:
+        metric = Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def sampled(self, name: str, documentation: str, sample: Callable[[], float], kind: str = "gauge") -> Sampled:
+        metric = Sampled(f"{self.namespace}_{name}", documentation, sample, kind)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time from request to last response byte",
+    ("method", "route", "status")
+)
+REQUEST_BACKEND_CALLS = registry.histogram(
+    "http_request_backend_calls", "Backend (Supabase or MockDB) calls made while serving a request",
+    ("route",), COUNT_BUCKETS
+)
+REQUEST_BACKEND_SECONDS = registry.histogram(
+    "http_request_backend_seconds", "Time a request spent waiting on backend calls", ("route",)
+)
+BACKEND_CALL_SECONDS = registry.histogram(
+    "backend_call_duration_seconds", "Duration of one backend call, in or out of a request",
+    ("backend", "operation"), CALL_BUCKETS
+)
+AUTH_WORK_SECONDS = registry.histogram(
+    "auth_work_duration_seconds", "Password hashing (including pool queueing) and JWT encode/decode time",
+    ("kind",), CALL_BUCKETS
+)
+
+
+class RequestTimings:
+    """Backend calls and auth work recorded while serving one request"""
+
+    __slots__ = ("backend_calls", "backend_seconds", "auth_seconds")
+
+    def __init__(self):
+        self.backend_calls = 0
+        self.backend_seconds = 0.0
+        self.auth_seconds: Dict[str, float] = {}
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+class backend_call:
+    """Time one backend round trip (``backend`` is "supabase" or "mockdb"); use as a context manager"""
+
+    __slots__ = ("labels", "start")
+
+    def __init__(self, backend: str, operation: str):
+        self.labels = (backend, operation)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        BACKEND_CALL_SECONDS.observe(elapsed, *self.labels)
+        timings = _current.get()
+        if timings is not None:
+            timings.backend_calls += 1
+            timings.backend_seconds += elapsed
+
+
+class auth_work:
+    """Time password hashing or JWT work (``kind`` names which); use as a context manager"""
+
+    __slots__ = ("kind", "start")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        AUTH_WORK_SECONDS.observe(elapsed, self.kind)
+        timings = _current.get()
+        if timings is not None:
+            timings.auth_seconds[self.kind] = timings.auth_seconds.get(self.kind, 0.0) + elapsed
+
+
+def timed_backend_calls(backend: str) -> Callable:
+    """Decorator timing each call of a synchronous backend method as ``backend_call``"""
+
+    def decorate(method: Callable) -> Callable:
+        operation = method.__name__
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with backend_call(backend, operation):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class MetricsMiddleware:
+    """Per-route latency and backend-call histograms, and optional ``Server-Timing`` headers.
+
+    Routes are labelled by their path template, so ``/deadlines/{deadline_id}/complete``
+    is one series however many ids are seen; requests no route matches
+    share the ``<unmatched>`` label.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+        self._templates: Optional[Dict[Callable, str]] = None
+        self._static_paths: frozenset = frozenset()
+
+    def _route(self, scope: Scope) -> str:
+        router = scope["app"].router
+        if self._templates is None:
+            self._templates = {
+                route.endpoint: route.path for route in router.routes if hasattr(route, "endpoint")
+            }
+            self._static_paths = frozenset(
+                route.path for route in router.routes if "{" not in getattr(route, "path", "{")
+            )
+        template = self._templates.get(scope.get("endpoint"))
+        if template is not None:
+            return template
+        # Answered before routing (e.g. a 304 from ConditionalGetMiddleware) or 404/405
+        if scope["path"] in self._static_paths:
+            return scope["path"]
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return route.path
+        return "<unmatched>"
+
+    def _server_timing(self, timings: RequestTimings, elapsed: float) -> str:
+        entries = [f"app;dur={elapsed * 1000:.2f}"]
+        if timings.backend_calls:
+            entries.append(f'db;desc="{timings.backend_calls} calls";dur={timings.backend_seconds * 1000:.2f}')
+        entries.extend(f"{kind};dur={seconds * 1000:.2f}" for kind, seconds in timings.auth_seconds.items())
+        return ", ".join(entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def wrapped_send(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(raw=message["headers"])
+                    headers.append("Server-Timing", self._server_timing(timings, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = self._route(scope)
+            REQUEST_SECONDS.observe(elapsed, scope["method"], route, str(status))
+            REQUEST_BACKEND_CALLS.observe(timings.backend_calls, route)
+            REQUEST_BACKEND_SECONDS.observe(timings.backend_seconds, route)
@@ -1,81 +1,386 @@
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
+from app.config import settings
+from app.utils.metrics import timed_backend_calls
+
 logger = logging.getLogger(__name__)
 
+class _Table:
+    """In-memory table backed by a JSON file.
+
+    Rows are held in a dict keyed on ``id`` (insertion ordered, so dumps keep
+    the on-disk order) with extra hash indexes for unique lookup fields and
+    group indexes (value -> ordered set of ids) for non-unique ones.
+
+    Mutations arrive through ``_Store.write`` holding ``lock`` (the store's);
+    reads take it too, since compaction and the write-behind activity flush
+    change rows from other threads.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        lock: threading.RLock,
+        unique_fields: Iterable[str] = (),
+        group_fields: Iterable[str] = ()
+    ):
+        self.filepath = filepath
+        self.lock = lock
+        self.rows: Dict[str, Dict] = {}
+        self.indexes: Dict[str, Dict[Any, str]] = {field: {} for field in unique_fields}
+        self.groups: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in group_fields}
+
+    def load(self, records: List[Dict]):
+        self.rows = {}
+        for index in self.indexes.values():
+            index.clear()
+        for group in self.groups.values():
+            group.clear()
+        for record in records:
+            self._index(record)
+
+    def _index(self, record: Dict):
+        row_id = record.get("id")
+        if row_id in self.rows:
+            self._unindex_groups(self.rows[row_id], row_id)
+        self.rows[row_id] = record
+        for field, index in self.indexes.items():
+            value = record.get(field)
+            if value is not None:
+                index[value] = row_id
+        for field, group in self.groups.items():
+            group.setdefault(record.get(field), {})[row_id] = None
+
+    def _unindex_groups(self, record: Dict, row_id: str):
+        for field, group in self.groups.items():
+            members = group.get(record.get(field))
+            if members is not None:
+                members.pop(row_id, None)
+
+    def get(self, row_id: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.rows.get(row_id)
+            return dict(row) if row is not None else None
+
+    def find_one(self, field: str, value: Any) -> Optional[Dict]:
+        with self.lock:
+            row_id = self.indexes[field].get(value)
+            return self.get(row_id) if row_id is not None else None
+
+    def find_all(self, field: str, value: Any) -> List[Dict]:
+        with self.lock:
+            return [dict(self.rows[row_id]) for row_id in self.groups[field].get(value, ())]
+
+    def insert(self, record: Dict) -> Dict:
+        self._index(dict(record))
+        return record
+
+    def update(self, row_id: str, changes: Dict) -> bool:
+        row = self.rows.get(row_id)
+        if row is None:
+            return False
+        for field, index in self.indexes.items():
+            if field in changes and row.get(field) is not None:
+                index.pop(row[field], None)
+        self._unindex_groups(row, row_id)
+        row.update(changes)
+        for field, index in self.indexes.items():
+            if row.get(field) is not None:
+                index[row[field]] = row_id
+        for field, group in self.groups.items():
+            group.setdefault(row.get(field), {})[row_id] = None
+        return True
+
+    def dump(self) -> List[Dict]:
+        with self.lock:
+            return [dict(row) for row in self.rows.values()]
+
+
+class _Store:
+    """Tables of one data directory plus their append-only journal.
+
+    The JSON files are snapshots; every mutation since the last snapshot is
+    one JSON line in ``mockdb.journal``. On load the snapshots are read and
+    the journal is replayed over them. Once the journal grows past
+    ``MOCKDB_JOURNAL_COMPACT_BYTES`` a background thread writes fresh
+    snapshots and drops the journal.
+
+    Compaction first rotates the live journal to ``mockdb.journal.1`` so new
+    writes never wait on snapshot I/O. Journal records set whole rows or
+    fields, so replaying a rotated journal over a snapshot that already
+    contains it (a crash mid-compaction) is harmless.
+    """
+
+    def __init__(self, data_dir: str):
+        self.lock = threading.RLock()
+        self.tables: Dict[str, _Table] = {
+            "users": _Table(os.path.join(data_dir, "users.json"), self.lock, unique_fields=("email",)),
+            "businesses": _Table(os.path.join(data_dir, "businesses.json"), self.lock),
+            "compliance_deadlines": _Table(
+                os.path.join(data_dir, "compliance_deadlines.json"), self.lock, group_fields=("business_id",)
+            ),
+            "gst_filings": _Table(
+                os.path.join(data_dir, "gst_filings.json"), self.lock, group_fields=("business_id",)
+            ),
+        }
+        self.journal_file = os.path.join(data_dir, "mockdb.journal")
+        self.rotated_journal_file = self.journal_file + ".1"
+        self.compact_threshold = settings.MOCKDB_JOURNAL_COMPACT_BYTES
+        self._compacting = False
+        self._compaction_lock = threading.Lock()
+
+        for table in self.tables.values():
+            _ensure_file(table.filepath)
+            table.load(_read_file(table.filepath))
+        self._replay(self.rotated_journal_file)
+        self._replay(self.journal_file)
+
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal_size = self._journal.tell()
+        if self._journal_size and not _ends_with_newline(self.journal_file):
+            # Terminate a torn last entry so the next append starts a clean line
+            self._journal.write("\n")
+            self._journal_size += 1
+
+    def _replay(self, filepath: str):
+        if not os.path.exists(filepath):
+            return
+        applied = 0
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Only the tail can be torn by a crash mid-append
+                    logger.warning(f"Skipping unreadable journal entry {filepath}:{line_no}")
+                    continue
+                self._apply(entry)
+                applied += 1
+        if applied:
+            logger.info(f"Replayed {applied} journal entries from {filepath}")
+
+    def _apply(self, entry: Dict):
+        table = self.tables[entry["table"]]
+        if entry["op"] == "insert":
+            table.insert(entry["row"])
+        elif entry["op"] == "insert_many":
+            for row in entry["rows"]:
+                table.insert(row)
+        elif entry["op"] == "update":
+            table.update(entry["id"], entry["changes"])
+        elif entry["op"] == "update_many":
+            for row_id, changes in entry["changes"].items():
+                table.update(row_id, changes)
+
+    def write(self, entry: Dict):
+        """Apply a mutation and append it to the journal."""
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.lock:
+            self._apply(entry)
+            self._journal.write(line)
+            self._journal.flush()
+            if settings.MOCKDB_FSYNC:
+                os.fsync(self._journal.fileno())
+            self._journal_size += len(line)
+            if self._journal_size >= self.compact_threshold and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact, name="mockdb-compaction", daemon=True).start()
+
+    def compact(self):
+        """Write fresh snapshots and discard the journal entries they cover."""
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self):
+        try:
+            with self.lock:
+                if os.path.exists(self.rotated_journal_file):
+                    # A previous compaction died; fold its entries into this one
+                    self._journal.close()
+                    torn = not _ends_with_newline(self.rotated_journal_file)
+                    with open(self.rotated_journal_file, 'a', encoding='utf-8') as rotated, \
+                            open(self.journal_file, 'r', encoding='utf-8') as live:
+                        rotated.write(("\n" if torn else "") + live.read())
+                    os.remove(self.journal_file)
+                else:
+                    self._journal.close()
+                    os.replace(self.journal_file, self.rotated_journal_file)
+                self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal_size = 0
+                snapshots = [(table.filepath, table.dump()) for table in self.tables.values()]
+
+            for filepath, data in snapshots:
+                _write_file_atomic(filepath, data)
+            os.remove(self.rotated_journal_file)
+            logger.info("MockDB journal compacted")
+        except Exception as e:
+            logger.error(f"MockDB journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+
+def _ensure_file(filepath: str):
+    if not os.path.exists(filepath):
+        with open(filepath, 'w') as f:
+            json.dump([], f)
+
+def _read_file(filepath: str) -> List[Dict]:
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading {filepath}: {e}")
+        return []
+
+def _ends_with_newline(filepath: str) -> bool:
+    if os.path.getsize(filepath) == 0:
+        return True
+    with open(filepath, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _write_file_atomic(filepath: str, data: List[Dict]):
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
 class MockDB:
+    """File-backed stand-in for Supabase used when no client is configured.
+
+    Each data directory is loaded once per process into hash-indexed tables
+    that every ``MockDB`` instance for that directory shares, so lookups are
+    O(1) dict hits. Writes append a single line to the directory's journal
+    (see ``_Store``) rather than rewriting the JSON files. Writes that depend
+    on which rows exist check and write under one hold of the store lock.
+    """
+
+    _stores: Dict[str, _Store] = {}
+    _stores_lock = threading.Lock()
+
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
-            
+
         self.users_file = os.path.join(data_dir, "users.json")
         self.businesses_file = os.path.join(data_dir, "businesses.json")
-        
-        self._ensure_file(self.users_file)
-        self._ensure_file(self.businesses_file)
 
-    def _ensure_file(self, filepath: str):
-        if not os.path.exists(filepath):
-            with open(filepath, 'w') as f:
-                json.dump([], f)
+        self._store = self._load_store()
+        self.users = self._store.tables["users"]
+        self.businesses = self._store.tables["businesses"]
+        self.deadlines = self._store.tables["compliance_deadlines"]
+        self.gst_filings = self._store.tables["gst_filings"]
 
-    def _read_file(self, filepath: str) -> List[Dict]:
-        try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error reading {filepath}: {e}")
-            return []
+    def _load_store(self) -> _Store:
+        key = os.path.abspath(self.data_dir)
+        with MockDB._stores_lock:
+            store = MockDB._stores.get(key)
+            if store is None:
+                store = _Store(self.data_dir)
+                MockDB._stores[key] = store
+        return store
 
-    def _write_file(self, filepath: str, data: List[Dict]):
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error writing {filepath}: {e}")
+    def compact(self):
+        """Fold the journal into the JSON snapshots now."""
+        self._store.compact()
 
     # User operations
+    @timed_backend_calls("mockdb")
     def get_user_by_email(self, email: str) -> Optional[Dict]:
-        users = self._read_file(self.users_file)
-        for user in users:
-            if user.get("email") == email:
-                return user
-        return None
+        return self.users.find_one("email", email)
 
+    @timed_backend_calls("mockdb")
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        users = self._read_file(self.users_file)
-        for user in users:
-            if user.get("id") == user_id:
-                return user
-        return None
+        return self.users.get(user_id)
 
+    @timed_backend_calls("mockdb")
     def create_user(self, user_data: Dict) -> Dict:
-        users = self._read_file(self.users_file)
-        users.append(user_data)
-        self._write_file(self.users_file, users)
+        self._store.write({"op": "insert", "table": "users", "row": user_data})
         return user_data
-        
+
+    @timed_backend_calls("mockdb")
     def update_user_last_login(self, user_id: str, timestamp: str):
-        users = self._read_file(self.users_file)
-        for user in users:
-            if user.get("id") == user_id:
-                user["last_login"] = timestamp
-                break
-        self._write_file(self.users_file, users)
+        with self._store.lock:
+            if user_id in self.users.rows:
+                self._store.write({
+                    "op": "update", "table": "users", "id": user_id,
+                    "changes": {"last_login": timestamp}
+                })
+
+    @timed_backend_calls("mockdb")
+    def update_users_last_login(self, timestamps: Dict[str, str]):
+        """Apply a batch of ``{user_id: timestamp}`` as one journal entry"""
+        with self._store.lock:
+            changes = {
+                user_id: {"last_login": timestamp}
+                for user_id, timestamp in timestamps.items()
+                if user_id in self.users.rows
+            }
+            if changes:
+                self._store.write({"op": "update_many", "table": "users", "changes": changes})
 
     # Business operations
+    @timed_backend_calls("mockdb")
     def create_business(self, business_data: Dict) -> Dict:
-        businesses = self._read_file(self.businesses_file)
-        businesses.append(business_data)
-        self._write_file(self.businesses_file, businesses)
+        self._store.write({"op": "insert", "table": "businesses", "row": business_data})
         return business_data
 
+    @timed_backend_calls("mockdb")
     def get_business_by_id(self, business_id: str) -> Optional[Dict]:
-        businesses = self._read_file(self.businesses_file)
-        for business in businesses:
-            if business.get("id") == business_id:
-                return business
-        return None
+        return self.businesses.get(business_id)
+
+    # Compliance deadline operations
+    @timed_backend_calls("mockdb")
+    def get_deadlines_by_business(self, business_id: str) -> List[Dict]:
+        return self.deadlines.find_all("business_id", business_id)
+
+    @timed_backend_calls("mockdb")
+    def create_deadlines(self, deadlines: List[Dict]) -> List[Dict]:
+        if deadlines:
+            self._store.write({"op": "insert_many", "table": "compliance_deadlines", "rows": deadlines})
+        return deadlines
+
+    @timed_backend_calls("mockdb")
+    def update_deadlines(self, changes: Dict[str, Dict]):
+        """Apply ``{deadline_id: changes}`` as one journal entry"""
+        with self._store.lock:
+            changes = {row_id: change for row_id, change in changes.items() if row_id in self.deadlines.rows}
+            if changes:
+                self._store.write({"op": "update_many", "table": "compliance_deadlines", "changes": changes})
+
+    @timed_backend_calls("mockdb")
+    def update_deadline(self, deadline_id: str, changes: Dict):
+        with self._store.lock:
+            if deadline_id in self.deadlines.rows:
+                self._store.write({
+                    "op": "update", "table": "compliance_deadlines", "id": deadline_id,
+                    "changes": changes
+                })
+
+    # GST filing operations
+    @timed_backend_calls("mockdb")
+    def get_gst_filings_by_business(self, business_id: str) -> List[Dict]:
+        return self.gst_filings.find_all("business_id", business_id)
+
+    @timed_backend_calls("mockdb")
+    def create_gst_filings(self, filings: List[Dict]) -> List[Dict]:
+        """Insert as one journal entry, skipping ids that already exist"""
+        with self._store.lock:
+            new = {filing["id"]: filing for filing in filings if filing["id"] not in self.gst_filings.rows}
+            if new:
+                self._store.write({"op": "insert_many", "table": "gst_filings", "rows": list(new.values())})
+        return list(new.values())
+
+    @timed_backend_calls("mockdb")
+    def update_gst_filing(self, filing_id: str, changes: Dict):
+        with self._store.lock:
+            if filing_id in self.gst_filings.rows:
+                self._store.write({"op": "update", "table": "gst_filings", "id": filing_id, "changes": changes})
@@ -0,0 +1,61 @@
+"""JSON responses rendered by orjson, without FastAPI's encoding pass.
+
+By default FastAPI runs every returned value through ``jsonable_encoder``
+(and validates it when the route has a ``response_model``) before the
+response class calls ``json.dumps``. Routes here return plain dicts that
+are already JSON-shaped, so ``JSONRoute`` hands them straight to
+``FastJSONResponse``, which serializes in one orjson call and falls back
+to ``jsonable_encoder`` only for values orjson cannot encode itself.
+"""
+import asyncio
+import functools
+from typing import Any, Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson (dates, UUIDs, enums and numpy values included)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=_OPTIONS)
+
+
+def _rendered(call: Callable, response_class: type, status_code: int) -> Callable:
+    kwargs = {"status_code": status_code} if status_code else {}
+
+    def render(content):
+        return content if isinstance(content, Response) else response_class(content, **kwargs)
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kw):
+            return render(await call(*args, **kw))
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kw):
+            return render(call(*args, **kw))
+    endpoint.renders_response = True
+    return endpoint
+
+
+class JSONRoute(APIRoute):
+    """``APIRoute`` whose endpoint results are rendered by the route's response class directly.
+
+    Applies to routes without a ``response_model`` or an injected
+    ``Response`` parameter; those keep FastAPI's usual serialization.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if (self.response_field is None and self.dependant.response_param_name is None
+                and not getattr(call, "renders_response", False)):
+            response_class = getattr(self.response_class, "value", self.response_class)
+            self.dependant.call = _rendered(call, response_class, self.status_code)
+        return super().get_route_handler()
@@ -1,10 +1,17 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from jose import jwt
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.utils.cache import ExpiringLRUCache
+from app.utils.metrics import auth_work, registry
+from app.utils.validators import gstin_errors, pan_errors
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -16,6 +23,105 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a stored password against one provided by user"""
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHashingPool:
+    """Bounded executor for pbkdf2 work so it never runs on the event loop.
+
+    At most ``workers`` hashes run at once and ``queue_depth`` more may wait;
+    beyond that callers get a 503 straight away instead of piling up behind
+    a login burst. hashlib releases the GIL inside pbkdf2, so the default
+    thread pool hashes in parallel; ``process`` is available for
+    interpreters where it does not. ``register_metrics`` exposes the pool's
+    size, load and completed/failed/rejected totals at ``/metrics``.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, executor: str = "thread"):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self.in_flight >= self.workers + self.queue_depth:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"}
+            )
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with auth_work("password_hash"):
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def register_metrics(self, prefix: str = "password_hash"):
+        """Expose the pool's size, load and totals at ``/metrics``"""
+        registry.sampled(f"{prefix}_workers", "Password hashing pool size", lambda: self.workers)
+        registry.sampled(f"{prefix}_queue_limit", "Hashes allowed to wait beyond the pool size", lambda: self.queue_depth)
+        registry.sampled(f"{prefix}_in_flight", "Hashes running or queued", lambda: self.in_flight)
+        registry.sampled(f"{prefix}_queued", "Hashes waiting for a worker", lambda: self.queued)
+        registry.sampled(f"{prefix}_completed_total", "Hashes that finished", lambda: self.completed, "counter")
+        registry.sampled(f"{prefix}_failed_total", "Hashes that raised", lambda: self.failed, "counter")
+        registry.sampled(f"{prefix}_rejected_total", "Hashes refused with a 503 because the queue was full",
+                         lambda: self.rejected, "counter")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    executor=settings.PASSWORD_HASH_EXECUTOR
+)
+password_hashing_pool.register_metrics()
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the hashing pool"""
+    return await password_hashing_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool"""
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -26,7 +132,8 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    with auth_work("jwt_encode"):
+        encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
@@ -34,17 +141,33 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=30)  # Refresh tokens last 30 days
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    with auth_work("jwt_encode"):
+        encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+# Verified payloads keyed by token digest; each entry lives until the token's exp
+token_cache = ExpiringLRUCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Verify a token's signature and expiry, using the cache when possible"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        with auth_work("jwt_decode"):
+            payload = jwt.decode(
+                token, 
+                settings.JWT_SECRET_KEY, 
+                algorithms=[settings.JWT_ALGORITHM]
+            )
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)) and expires_at > time.time():
+            token_cache.set(key, payload, expires_at)
+    return dict(payload)
+
 def verify_token(token: str, is_refresh: bool = False) -> Dict[str, Any]:
     """Verify JWT token and return payload"""
     try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = _decode_token(token)
         
         # Check token type
         token_type = payload.get("type")
@@ -79,23 +202,14 @@ def verify_token(token: str, is_refresh: bool = False) -> Dict[str, Any]:
             detail="Invalid token"
         )
 
-def validate_gstin(gstin: str) -> bool:
-    """Validate GSTIN format"""
-    if not gstin or len(gstin) != 15:
+def validate_gstin(gstin: str, pan: Optional[str] = None) -> bool:
+    """Validate GSTIN format, state code and check digit (and the embedded PAN if given)"""
+    if not gstin:
         return False
-    
-    # Basic GSTIN validation logic
-    # Add more sophisticated validation as needed
-    return gstin[:2].isdigit() and gstin[2].isalpha()
+    return gstin_errors(gstin, pan) == 0
 
 def validate_pan(pan: str) -> bool:
-    """Validate PAN format"""
-    if not pan or len(pan) != 10:
+    """Validate PAN format and holder type"""
+    if not pan:
         return False
-    
-    # PAN validation: 5 letters, 4 digits, 1 letter
-    return (
-        pan[:5].isalpha() and 
-        pan[5:9].isdigit() and 
-        pan[9].isalpha()
-    )
+    return pan_errors(pan) == 0
@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+class MultipartFileStream:
+    """Incremental ``multipart/form-data`` reader that keeps one file field.
+
+    Feed it the raw request body chunk by chunk; ``feed`` returns the bytes
+    of the ``field`` part found in that chunk, and ``filename`` is set as
+    soon as the part's headers have been read. Other parts are skipped
+    without being buffered, so nothing is spooled before the caller sees it.
+    ``complete`` turns true once the closing boundary has been read.
+    """
+
+    def __init__(self, content_type: str, field: str):
+        media_type, options = parse_options_header(content_type)
+        if media_type != b"multipart/form-data" or not options.get(b"boundary"):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Expected a multipart/form-data body"
+            )
+        self.field = field.encode()
+        self.filename: Optional[str] = None
+        self.found = False
+        self.complete = False
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_field = False
+        self._data: List[bytes] = []
+        self._parser = MultipartParser(options[b"boundary"], callbacks={
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field_data,
+            "on_header_value": self._header_value_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+            "on_end": self._end,
+        })
+
+    def _part_begin(self):
+        self._headers = {}
+
+    def _header_field_data(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") == self.field and not self.found:
+            self.found = self._in_field = True
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        if self._in_field:
+            self._data.append(data[start:end])
+
+    def _part_end(self):
+        self._in_field = False
+
+    def _end(self):
+        self.complete = True
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Parse the next chunk of the body; the file field's bytes in it"""
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed multipart body: {e}")
+        data, self._data = self._data, []
+        return data
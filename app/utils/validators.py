@@ -0,0 +1,169 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# GST state codes (first two GSTIN digits)
+STATE_CODES: Dict[str, str] = {
+    "01": "Jammu and Kashmir", "02": "Himachal Pradesh", "03": "Punjab", "04": "Chandigarh",
+    "05": "Uttarakhand", "06": "Haryana", "07": "Delhi", "08": "Rajasthan",
+    "09": "Uttar Pradesh", "10": "Bihar", "11": "Sikkim", "12": "Arunachal Pradesh",
+    "13": "Nagaland", "14": "Manipur", "15": "Mizoram", "16": "Tripura",
+    "17": "Meghalaya", "18": "Assam", "19": "West Bengal", "20": "Jharkhand",
+    "21": "Odisha", "22": "Chhattisgarh", "23": "Madhya Pradesh", "24": "Gujarat",
+    "25": "Daman and Diu", "26": "Dadra and Nagar Haveli and Daman and Diu",
+    "27": "Maharashtra", "28": "Andhra Pradesh (before reorganisation)", "29": "Karnataka",
+    "30": "Goa", "31": "Lakshadweep", "32": "Kerala", "33": "Tamil Nadu",
+    "34": "Puducherry", "35": "Andaman and Nicobar Islands", "36": "Telangana",
+    "37": "Andhra Pradesh", "38": "Ladakh", "97": "Other Territory", "99": "Centre Jurisdiction",
+}
+
+# Fourth PAN character: holder type
+PAN_HOLDER_TYPES: Dict[str, str] = {
+    "A": "Association of Persons", "B": "Body of Individuals", "C": "Company",
+    "F": "Firm / LLP", "G": "Government", "H": "Hindu Undivided Family",
+    "J": "Artificial Juridical Person", "L": "Local Authority", "P": "Individual",
+    "T": "Trust",
+}
+
+GSTIN_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Failure reasons, reported as a bitmask per identifier
+FORMAT = 1
+STATE_CODE = 2
+PAN_HOLDER_TYPE = 4
+CHECKSUM = 8
+PAN_MISMATCH = 16
+ERRORS = (
+    (FORMAT, "invalid_format"), (STATE_CODE, "unknown_state_code"),
+    (PAN_HOLDER_TYPE, "invalid_pan_holder_type"), (CHECKSUM, "checksum_mismatch"),
+    (PAN_MISMATCH, "pan_mismatch"),
+)
+
+# Lookup tables indexed by ASCII byte, built once at import
+_VALUE = np.full(256, -1, dtype=np.int16)
+_VALUE[np.frombuffer(GSTIN_CHARSET.encode(), dtype=np.uint8)] = np.arange(36)
+_DIGIT = np.zeros(256, dtype=bool)
+_DIGIT[np.frombuffer(b"0123456789", dtype=np.uint8)] = True
+_ALPHA = np.zeros(256, dtype=bool)
+_ALPHA[np.frombuffer(GSTIN_CHARSET[10:].encode(), dtype=np.uint8)] = True
+_ENTITY = _DIGIT | _ALPHA
+_ENTITY[ord("0")] = False
+_PAN_HOLDER = np.zeros(256, dtype=bool)
+_PAN_HOLDER[np.frombuffer("".join(PAN_HOLDER_TYPES).encode(), dtype=np.uint8)] = True
+_STATE = np.zeros(100, dtype=bool)
+_STATE[[int(code) for code in STATE_CODES]] = True
+
+# Check digit: every second character is doubled, and each product counts
+# as quotient + remainder base 36. _CONTRIB[weight - 1, value] holds that sum.
+_WEIGHTS = np.array([1, 2] * 7)
+_CONTRIB = np.array([[(v * w) // 36 + (v * w) % 36 for v in range(36)] for w in (1, 2)], dtype=np.int32)
+_SCALAR_CONTRIB = [
+    {c: int(_CONTRIB[w - 1, v]) for v, c in enumerate(GSTIN_CHARSET)} for w in _WEIGHTS
+]
+
+def _pan_format_ok(pan: str) -> bool:
+    return (
+        len(pan) == 10 and pan.isascii() and pan[:5].isalpha() and pan[:5].isupper()
+        and pan[5:9].isdigit() and pan[9].isalpha() and pan[9].isupper()
+    )
+
+def gstin_check_digit(gstin: str) -> str:
+    """Check character for the first 14 characters of a GSTIN"""
+    total = sum(table[c] for table, c in zip(_SCALAR_CONTRIB, gstin[:14]))
+    return GSTIN_CHARSET[-total % 36]
+
+def pan_errors(pan: str) -> int:
+    """Error bitmask for one PAN (0 when valid)"""
+    pan = pan.strip().upper()
+    if not _pan_format_ok(pan):
+        return FORMAT
+    return 0 if pan[3] in PAN_HOLDER_TYPES else PAN_HOLDER_TYPE
+
+def gstin_errors(gstin: str, pan: Optional[str] = None) -> int:
+    """Error bitmask for one GSTIN (0 when valid), optionally against the holder's PAN"""
+    gstin = gstin.strip().upper()
+    if (
+        len(gstin) != 15 or not gstin.isascii() or not gstin[:2].isdigit()
+        or not _pan_format_ok(gstin[2:12]) or gstin[12] not in GSTIN_CHARSET[1:]
+        or gstin[13] != "Z" or gstin[14] not in GSTIN_CHARSET
+    ):
+        return FORMAT
+    errors = 0
+    if gstin[:2] not in STATE_CODES:
+        errors |= STATE_CODE
+    if gstin[5] not in PAN_HOLDER_TYPES:
+        errors |= PAN_HOLDER_TYPE
+    if gstin_check_digit(gstin) != gstin[14]:
+        errors |= CHECKSUM
+    if pan and gstin[2:12] != pan.strip().upper():
+        errors |= PAN_MISMATCH
+    return errors
+
+def error_names(errors: int) -> List[str]:
+    return [name for bit, name in ERRORS if errors & bit]
+
+def _as_bytes(values: Sequence[str], width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """``(n, width)`` byte matrix of the values plus a mask of rows that fit it exactly"""
+    fits = np.fromiter(map(len, values), dtype=np.int64, count=len(values)) == width
+    if fits.all():
+        padded = "".join(values)
+    else:
+        padded = "".join(v if len(v) == width else "?" * width for v in values)
+    # Non-ASCII characters become "?", which no table accepts
+    matrix = np.frombuffer(padded.encode("ascii", "replace"), dtype=np.uint8).reshape(len(values), width)
+    return matrix, fits
+
+def _pan_columns_ok(pan: np.ndarray) -> np.ndarray:
+    return _ALPHA[pan[:, :5]].all(axis=1) & _DIGIT[pan[:, 5:9]].all(axis=1) & _ALPHA[pan[:, 9]]
+
+def validate_pans(pans: Sequence[str]) -> np.ndarray:
+    """Error bitmask per PAN, computed over the whole batch with table lookups"""
+    pans = [p.strip().upper() for p in pans]
+    if not pans:
+        return np.zeros(0, dtype=np.int8)
+    matrix, fits = _as_bytes(pans, 10)
+    format_ok = fits & _pan_columns_ok(matrix)
+    return np.where(
+        format_ok, np.where(_PAN_HOLDER[matrix[:, 3]], 0, PAN_HOLDER_TYPE), FORMAT
+    ).astype(np.int8)
+
+def validate_gstins(gstins: Sequence[str], pans: Optional[Sequence[Optional[str]]] = None) -> np.ndarray:
+    """Error bitmask per GSTIN, computed over the whole batch with table lookups.
+
+    ``pans``, when given, lines up with ``gstins``; a non-empty entry must
+    equal the PAN embedded in that GSTIN.
+    """
+    gstins = [g.strip().upper() for g in gstins]
+    if not gstins:
+        return np.zeros(0, dtype=np.int8)
+    matrix, fits = _as_bytes(gstins, 15)
+
+    format_ok = (
+        fits
+        & _DIGIT[matrix[:, :2]].all(axis=1)
+        & _pan_columns_ok(matrix[:, 2:12])
+        & _ENTITY[matrix[:, 12]]
+        & (matrix[:, 13] == ord("Z"))
+        & (_VALUE[matrix[:, 14]] >= 0)
+    )
+
+    state = (matrix[:, 0].astype(np.int16) - ord("0")) * 10 + (matrix[:, 1] - ord("0"))
+    state_ok = _STATE[np.clip(state, 0, 99)]
+    holder_ok = _PAN_HOLDER[matrix[:, 5]]
+
+    values = np.maximum(_VALUE[matrix[:, :14]], 0)
+    total = _CONTRIB[_WEIGHTS - 1, values].sum(axis=1)
+    checksum_ok = _VALUE[matrix[:, 14]] == -total % 36
+
+    errors = (
+        np.where(state_ok, 0, STATE_CODE)
+        | np.where(holder_ok, 0, PAN_HOLDER_TYPE)
+        | np.where(checksum_ok, 0, CHECKSUM)
+    )
+    if pans is not None:
+        expected = [(p or "").strip().upper() for p in pans]
+        mismatch = np.fromiter(
+            (bool(p) and g[2:12] != p for g, p in zip(gstins, expected)), dtype=bool, count=len(gstins)
+        )
+        errors |= np.where(mismatch, PAN_MISMATCH, 0)
+    return np.where(format_ok, errors, FORMAT).astype(np.int8)
@@ -0,0 +1,170 @@
+"""Compliance trends: pre-aggregated rollups vs scanning raw events.
+
+Generates six years of GST filings (GSTR-1 and GSTR-3B with liability,
+ITC and payment figures, a tenth later revised by reconciliation) and
+rule deadlines (most filed, some late, some missed) for 1k businesses,
+streams them through ``AnalyticsService`` as events, then answers month
+(36 periods), quarter and financial-year trends per business two ways:
+reading the rollups, and scanning the business's raw filings and
+deadlines (already grouped by business in memory) the way a per-request
+query would. Both must agree. Rollup reads are timed alone and as the
+full ``trends`` response.
+
+    python -m benchmarks.bench_analytics
+    python -m benchmarks.bench_analytics 10000
+"""
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from app.models.compliance import DeadlineStatus
+from app.services.analytics_service import METRICS, AnalyticsService, period_keys
+from app.services.deadline_service import DeadlineService
+from app.services.gst_service import GSTService
+from app.services.penalty_service import PenaltyService
+
+BUSINESSES = 1_000
+HISTORY_START = date(2020, 4, 1)
+BUSINESS_TYPES = ("Proprietorship", "Private Limited", "LLP")
+TODAY = date(2026, 3, 31)
+PERIODS = {"month": 36, "quarter": 12, "fy": 6}
+
+
+def _deadline_rows(service: DeadlineService, businesses, rng: random.Random):
+    for business in businesses:
+        for row in service.generate(business, HISTORY_START, date(2026, 6, 30)):
+            if row["subtype"] in ("GSTR-3B", "TDS Payment"):
+                row["amount"] = round(rng.uniform(1_000, 200_000), 2)
+            if row["due_date"] < TODAY and rng.random() < 0.95:
+                late = rng.choice((0, 0, 0, 0, 3, 12, 45))
+                row["status"] = DeadlineStatus.COMPLETED.value
+                row["completed_at"] = datetime.combine(row["due_date"] + timedelta(days=late), datetime.min.time()).isoformat()
+            yield row
+
+
+def _filing_rows(businesses, rng: random.Random):
+    for business in businesses:
+        for month_index in range(HISTORY_START.year * 12 + 3, TODAY.year * 12 + 3):
+            year, month = divmod(month_index, 12)
+            for filing_type in ("GSTR-1", "GSTR-3B"):
+                liability = round(rng.uniform(10_000, 500_000), 2) if filing_type == "GSTR-3B" else None
+                itc = round(liability * rng.uniform(0.3, 0.9), 2) if liability else None
+                yield {
+                    "id": str(uuid.uuid4()), "business_id": business["id"], "filing_type": filing_type,
+                    "period_year": year, "period_month": month + 1, "total_tax_liability": liability,
+                    "itc_available": itc, "itc_claimed": round(itc * rng.uniform(0.8, 1), 2) if itc else None,
+                    "payment_made": round(liability - itc, 2) if liability else None
+                }
+
+
+def _scan(filings, deadlines, penalties: PenaltyService, granularity: str, keys: range):
+    """Sum one business's raw events into the requested periods"""
+    level = ("month", "quarter", "fy").index(granularity)
+    sums = {key: dict.fromkeys(METRICS, 0.0) for key in keys}
+    for row in filings:
+        bucket = sums.get(period_keys(row["period_year"], row["period_month"])[level])
+        if bucket is not None:
+            bucket["gst_filings"] += 1
+            bucket["tax_liability"] += row["total_tax_liability"] or 0
+            bucket["tax_paid"] += row["payment_made"] or 0
+            bucket["itc_available"] += row["itc_available"] or 0
+            bucket["itc_claimed"] += row["itc_claimed"] or 0
+    for deadline in deadlines:
+        due = date.fromordinal(deadline.due)
+        bucket = sums.get(period_keys(due.year, due.month)[level])
+        if bucket is None:
+            continue
+        if deadline.status == DeadlineStatus.COMPLETED.value:
+            filed = date.fromisoformat(deadline.completed_at[:10]).toordinal()
+            bucket["filed_on_time" if filed <= deadline.due else "filed_late"] += 1
+            bucket["penalties_paid"] += penalties.penalty_on(deadline, filed)
+        elif deadline.status == DeadlineStatus.OVERDUE.value:
+            bucket["missed"] += 1
+    return [sums[key] for key in keys]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else BUSINESSES
+    rng = random.Random(7)
+    businesses = [{
+        "id": str(uuid.uuid4()), "gstin": "27AAPFU0939F1ZV", "business_type": BUSINESS_TYPES[i % len(BUSINESS_TYPES)]
+    } for i in range(count)]
+    deadlines = DeadlineService()
+    deadlines._as_of = TODAY.toordinal()
+    penalties = PenaltyService(deadlines)
+    gst = GSTService()
+    analytics = AnalyticsService(deadlines, penalties, gst)
+
+    async def load():
+        for business in businesses:
+            await analytics.ensure_business(business["id"])
+    asyncio.run(load())
+
+    filings = list(_filing_rows(businesses, rng))
+    start = time.perf_counter()
+    deadlines.add_rows(_deadline_rows(deadlines, businesses, rng))
+    for i in range(0, len(filings), 500):
+        analytics.filings_added(filings[i:i + 500])
+    revised = rng.sample([row for row in filings if row["itc_available"]], len(filings) // 20)
+    for row in revised:
+        changes = {"itc_available": round(row["itc_available"] * 1.1, 2), "itc_claimed": row["itc_available"]}
+        row.update(changes)
+        analytics.filing_updated(row, changes)
+    # Filing a deadline that had gone overdue moves it from missed to late
+    asyncio.run(_complete_some(deadlines, rng))
+    ingest_s = time.perf_counter() - start
+    events = len(deadlines.records) + len(filings) + len(revised)
+    print(f"{count:,} businesses: {len(filings):,} filings, {len(deadlines.records):,} deadlines, "
+          f"{len(revised):,} revisions ingested in {ingest_s:.2f}s ({events / ingest_s:,.0f} events/s)")
+    print("rollup rows: " + ", ".join(f"{name} {len(rollup):,}" for name, rollup in analytics.rollups.items()) + "\n")
+
+    by_business_filings = defaultdict(list)
+    for row in filings:
+        by_business_filings[row["business_id"]].append(row)
+    by_business_deadlines = defaultdict(list)
+    for deadline in deadlines.records:
+        by_business_deadlines[deadline.business_id].append(deadline)
+
+    sample = [business["id"] for business in rng.sample(businesses, min(200, count))]
+    print(f"{'trend':<16}{'rollup read us':>16}{'trends() us':>13}{'raw scan us':>13}{'read speed-up':>15}")
+    for granularity, periods in PERIODS.items():
+        end = period_keys(TODAY.year, TODAY.month)[("month", "quarter", "fy").index(granularity)]
+        keys = range(end - periods + 1, end + 1)
+        rollup = analytics.rollups[granularity]
+        codes = [analytics._business_codes[business_id] for business_id in sample]
+        start = time.perf_counter()
+        for code in codes:
+            rollup.read(code, keys)
+        read_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        start = time.perf_counter()
+        trends = [analytics.trends(business_id, granularity, periods, TODAY) for business_id in sample]
+        trends_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        start = time.perf_counter()
+        scans = [
+            _scan(by_business_filings[business_id], by_business_deadlines[business_id], penalties, granularity, keys)
+            for business_id in sample
+        ]
+        scan_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        for trend, scan in zip(trends, scans):
+            for got, expected in zip(trend, scan):
+                for metric in METRICS:
+                    assert abs(got[metric] - expected[metric]) < 0.05, (granularity, got["period"], metric)
+        print(f"{f'{granularity} x {periods}':<16}{read_us:>16.0f}{trends_us:>13.0f}{scan_us:>13.0f}"
+              f"{scan_us / read_us:>14.1f}x")
+
+
+async def _complete_some(deadlines: DeadlineService, rng: random.Random):
+    overdue = [deadline for deadline in deadlines.records if deadline.status == DeadlineStatus.OVERDUE.value]
+    for deadline in rng.sample(overdue, len(overdue) // 2):
+        await deadlines.complete(deadline.business_id, deadline.id, datetime.combine(TODAY, datetime.min.time()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Company master lookups: memory-mapped index vs loading the snapshot.
+
+Writes a synthetic MCA-style company master CSV (500k companies by
+default), builds the index with ``build_company_index``, then in fresh
+interpreters compares:
+
+* loading the CSV into a dict keyed by CIN (plus a sorted name list), the
+  obvious in-process approach
+* opening the index file and serving lookups through ``mmap``
+
+reporting start-up time, peak RSS, private (anonymous) memory and
+per-lookup latency for CIN hits, CIN misses and name-prefix searches.
+Mapped index pages count towards RSS once touched but live in the shared
+page cache, so the private figure is what each worker really costs.
+
+    python -m benchmarks.bench_company_index
+    python -m benchmarks.bench_company_index 2000000
+"""
+import bisect
+import csv
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.utils.company_index import CompanyIndex, build_company_index, name_key
+
+COMPANIES = 500_000
+LOOKUPS = 20_000
+STATES = (("MH", "Maharashtra", "RoC-Mumbai"), ("DL", "Delhi", "RoC-Delhi"), ("KA", "Karnataka", "RoC-Bangalore"),
+          ("TN", "Tamil Nadu", "RoC-Chennai"), ("GJ", "Gujarat", "RoC-Ahmedabad"))
+WORDS = ("Sharma", "Agro", "Infotech", "Textiles", "Global", "Shree", "Ganesh", "Logistics", "Pharma",
+         "Solutions", "Exports", "Builders", "Capital", "Foods", "Motors", "Energy", "Ventures", "Steel")
+
+
+def write_snapshot(path: str, count: int) -> list:
+    """Write the CSV; returns the CINs in file order"""
+    rng = random.Random(1)
+    cins = []
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CORPORATE_IDENTIFICATION_NUMBER", "COMPANY_NAME", "COMPANY_STATUS", "COMPANY_CATEGORY",
+                         "REGISTERED_STATE", "REGISTRAR_OF_COMPANIES", "DATE_OF_REGISTRATION", "DATE_OF_LAST_AGM",
+                         "DATE_OF_BALANCE_SHEET"])
+        for i in range(count):
+            code, state, roc = STATES[i % len(STATES)]
+            year = 1990 + rng.randrange(35)
+            kind = "PTC" if rng.random() < 0.9 else "PLC"
+            name = " ".join(rng.sample(WORDS, 3)) + f" {i} " + ("Private Limited" if kind == "PTC" else "Limited")
+            cins.append(f"U{10000 + i % 90000:05d}{code}{year}{kind}{i:06d}")
+            writer.writerow([
+                cins[-1], name, rng.choice(("Active", "Active", "Active", "Strike Off", "Dormant")),
+                "Company limited by Shares", state, roc, f"{rng.randrange(1, 28):02d}-{rng.randrange(1, 13):02d}-{year}",
+                f"{rng.randrange(1, 28):02d}-09-2024", "31-03-2024"
+            ])
+    return cins
+
+
+def write_queries(path: str, cins: list):
+    """Sampled CIN hits, one per line, then name prefixes"""
+    rng = random.Random(2)
+    hits = rng.choices(cins, k=LOOKUPS)
+    prefixes = [f"{a} {b}" for a, b in zip(rng.choices(WORDS, k=LOOKUPS // 10), rng.choices(WORDS, k=LOOKUPS // 10))]
+    with open(path, "w") as f:
+        f.write("\n".join(hits) + "\n\n" + "\n".join(prefixes))
+
+
+def _private_mib() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _timed(fn, args) -> float:
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def _scenario(name: str, snapshot: str, index_path: str, queries: str):
+    """Run one approach in this (fresh) process and print its figures"""
+    with open(queries) as f:
+        hits, prefixes = (block.split("\n") for block in f.read().split("\n\n"))
+    misses = [cin[:-6] + "999999" for cin in hits]
+
+    start = time.perf_counter()
+    if name == "dict":
+        with open(snapshot, newline="") as f:
+            rows = {row["CORPORATE_IDENTIFICATION_NUMBER"]: row for row in csv.DictReader(f)}
+        names = sorted((name_key(row["COMPANY_NAME"]), cin) for cin, row in rows.items())
+        keys = [key for key, _ in names]
+
+        def search(prefix):
+            wanted = name_key(prefix)
+            i = bisect.bisect_left(keys, wanted)
+            return [rows[names[j][1]] for j in range(i, min(i + 20, len(keys))) if keys[j].startswith(wanted)]
+        get = rows.get
+    else:
+        index = CompanyIndex(index_path)
+
+        def search(prefix):
+            return index.search(prefix, 20)
+        get = index.get
+    startup = time.perf_counter() - start
+
+    assert all(get(cin) is not None for cin in hits[:100]) and get(misses[0]) is None
+    hit_us = _timed(get, hits)
+    miss_us = _timed(get, misses)
+    search_us = _timed(search, prefixes)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{startup:.3f} {rss:.0f} {_private_mib():.0f} {hit_us:.1f} {miss_us:.1f} {search_us:.1f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COMPANIES
+    with tempfile.TemporaryDirectory() as work:
+        snapshot = os.path.join(work, "companies.csv")
+        index_path = os.path.join(work, "companies.idx")
+        queries = os.path.join(work, "queries.txt")
+        write_queries(queries, write_snapshot(snapshot, count))
+
+        start = time.perf_counter()
+        built = build_company_index(snapshot, index_path)
+        build_s = time.perf_counter() - start
+        print(f"{built:,} companies: snapshot {os.path.getsize(snapshot) / 2**20:.0f} MiB, "
+              f"index {os.path.getsize(index_path) / 2**20:.0f} MiB built in {build_s:.1f}s\n")
+        print(f"{'approach':<22}{'startup s':>10}{'peak MiB':>10}{'private MiB':>13}{'CIN hit us':>12}{'CIN miss us':>13}{'prefix us':>11}")
+        for label, name in (("dict from CSV", "dict"), ("mmap index", "index")):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_company_index", "--scenario", name, snapshot, index_path,
+                 queries],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            startup, rss, private, hit, miss, search = out
+            print(f"{label:<22}{startup:>10}{rss:>10}{private:>13}{hit:>12}{miss:>13}{search:>11}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--scenario":
+        _scenario(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5])
+    else:
+        main()
@@ -0,0 +1,91 @@
+"""Dashboard polling with and without ETag revalidation.
+
+Starts the app in-process on MockDB (in a temporary directory), signs a
+business up, imports five years of GST filings, then polls each
+ETag-enabled read endpoint the way an idle dashboard does: once without
+``If-None-Match`` (full response) and once revalidating the tag it was
+given (304). Reports server time per request through the whole ASGI
+stack, and bytes on the wire with gzip accepted.
+
+    python -m benchmarks.bench_conditional_get
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ["SUPABASE_URL"] = ""  # MockDB, whatever the local .env says
+
+import httpx
+
+from app.main import app, shutdown_event, startup_event
+
+POLLS = 300
+PATHS = (
+    "/api/auth/me",
+    "/api/dashboard/summary",
+    "/api/dashboard/deadlines?days=366",
+    "/api/dashboard/penalties",
+    "/api/gst/filings?limit=200",
+    "/api/analytics/trends?granularity=month&periods=60",
+)
+
+
+async def _poll(client: httpx.AsyncClient, path: str, headers: dict):
+    start = time.perf_counter()
+    for _ in range(POLLS):
+        response = await client.get(path, headers=headers)
+    elapsed_us = (time.perf_counter() - start) / POLLS * 1e6
+    wire = int(response.headers.get("content-length", len(response.content)))
+    return response, elapsed_us, wire
+
+
+async def run():
+    await startup_event()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/api/auth/signup", json={
+                "email": "poll@example.com", "password": "Passw0rd!x", "full_name": "Poll",
+                "business_name": "Poll Traders"
+            })
+            login = await client.post("/api/auth/login", json={"email": "poll@example.com", "password": "Passw0rd!x"})
+            auth = {"Authorization": f"Bearer {login.json()['data']['access_token']}", "Accept-Encoding": "gzip"}
+            rows = "\n".join(
+                f"GSTR-3B,{2021 + m // 12},{m % 12 + 1},{100000 + m * 1000},{40000 + m * 100},{38000 + m * 90},{60000}"
+                for m in range(60)
+            )
+            imported = await client.post(
+                "/api/gst/filings/import",
+                content="filing_type,period_year,period_month,total_tax_liability,itc_available,itc_claimed,"
+                        "payment_made\n" + rows,
+                headers={**auth, "Content-Type": "text/csv"}
+            )
+            print(f"imported: {imported.json()['data']}")
+            for path in PATHS:  # first reads generate deadlines and load history
+                await client.get(path, headers=auth)
+
+            print(f"{'endpoint':<52}{'200 us':>9}{'304 us':>9}{'200 bytes':>11}{'304 bytes':>11}")
+            for path in PATHS:
+                full, full_us, full_bytes = await _poll(client, path, auth)
+                assert full.status_code == 200 and full.headers.get("etag"), path
+                revalidated, cached_us, cached_bytes = await _poll(
+                    client, path, {**auth, "If-None-Match": full.headers["etag"]}
+                )
+                assert revalidated.status_code == 304, (path, revalidated.status_code)
+                print(f"{path:<52}{full_us:>9,.0f}{cached_us:>9,.0f}{full_bytes:>11,}{cached_bytes:>11,}")
+    finally:
+        await shutdown_event()
+
+
+def main():
+    logging.disable(logging.INFO)  # per-request access logs
+    with tempfile.TemporaryDirectory() as work:
+        os.chdir(work)
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Deadline engine at 10k businesses x 3 years of deadlines.
+
+Builds the indexes in one batch and again one business at a time (as
+lazy loads do), then compares "due in the next N days" and "overdue"
+queries on the date-sorted indexes with a full scan of the same
+business's deadlines and with a scan of every deadline.
+
+    python -m benchmarks.bench_deadlines
+"""
+import random
+import resource
+import time
+import uuid
+from datetime import date
+from itertools import chain
+
+from app.services.deadline_service import DeadlineService
+
+BUSINESSES = 10_000
+YEARS = 3
+QUERIES = 2_000
+BUSINESS_TYPES = ("Proprietorship", "Private Limited", "LLP")
+
+
+def _businesses():
+    return [{
+        "id": str(uuid.uuid4()),
+        "gstin": "27AAPFU0939F1ZV",
+        "business_type": BUSINESS_TYPES[i % len(BUSINESS_TYPES)],
+    } for i in range(BUSINESSES)]
+
+
+def _timed(fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(*arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def main():
+    today = date(2025, 11, 15)
+    start, end = date(2023, 4, 1), date(2023 + YEARS, 3, 31)
+    businesses = _businesses()
+    service = DeadlineService()
+
+    def with_history(rows):
+        # Most past deadlines were filed, so "overdue" is a realistic handful
+        for row in rows:
+            if row["due_date"] < today and random.random() < 0.97:
+                row["status"] = "completed"
+            yield row
+
+    t0 = time.perf_counter()
+    service.add_rows(with_history(chain.from_iterable(
+        service.generate(business, start, end) for business in businesses
+    )))
+    build = time.perf_counter() - t0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"generated + indexed {len(service._records):,} deadlines for {BUSINESSES:,} businesses "
+          f"in {build:.2f}s (max RSS {rss:.0f} MiB, {len(service._open_all):,} open)")
+
+    # Businesses load lazily on first request, one add_rows each
+    lazy = DeadlineService()
+    t0 = time.perf_counter()
+    for business in businesses:
+        lazy.add_rows(with_history(lazy.generate(business, start, end)))
+    lazy_build = time.perf_counter() - t0
+    print(f"same, loaded one business at a time: {lazy_build:.2f}s "
+          f"({lazy_build / BUSINESSES * 1e3:.2f} ms per load, {len(lazy._open_all):,} open)")
+
+    sample = [(random.choice(businesses)["id"],) for _ in range(QUERIES)]
+    by_business = {}
+    for record in service._records:
+        by_business.setdefault(record.business_id, []).append(record)
+
+    def scan_business(business_id):
+        lo, hi = today.toordinal(), today.toordinal() + 30
+        return [r for r in by_business[business_id] if r.is_open and lo <= r.due <= hi]
+
+    def scan_all(business_id):
+        lo, hi = today.toordinal(), today.toordinal() + 30
+        return [r for r in service._records
+                if r.business_id == business_id and r.is_open and lo <= r.due <= hi]
+
+    print(f"{'query':<34} {'per call (us)':>14}")
+    print(f"{'upcoming 30d, index':<34} "
+          f"{_timed(lambda b: service.upcoming(b, 30, today), sample):>14.1f}")
+    print(f"{'upcoming 30d count, index':<34} "
+          f"{_timed(lambda b: service.count_upcoming(b, 30, today), sample):>14.2f}")
+    print(f"{'overdue, index':<34} "
+          f"{_timed(lambda b: service.overdue(b, today), sample):>14.1f}")
+    print(f"{'upcoming 30d, scan business rows':<34} {_timed(scan_business, sample):>14.1f}")
+    print(f"{'upcoming 30d, scan all rows':<34} {_timed(scan_all, sample[:3]):>14.0f}")
+
+    t0 = time.perf_counter()
+    due_soon = service._open_all.count_between(today.toordinal(), today.toordinal() + 7)
+    print(f"all businesses, open & due within 7 days: {due_soon:,} "
+          f"in {(time.perf_counter() - t0) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Bulk GSTIN/PAN validation throughput.
+
+Validates vendor-master sized batches (about 10% of them corrupted) one
+identifier at a time with the scalar validator and as a batch with the
+table-driven vectorized one, checks both agree, and reports the full
+/api/gst/validate service path (validation plus building the report).
+
+    python -m benchmarks.bench_identifier_validation
+    python -m benchmarks.bench_identifier_validation 250000
+"""
+import asyncio
+import random
+import sys
+import time
+
+from app.services.gst_service import GSTService
+from app.utils.validators import (
+    GSTIN_CHARSET, PAN_HOLDER_TYPES, STATE_CODES, gstin_check_digit, gstin_errors,
+    validate_gstins, validate_pans
+)
+
+SIZES = (10_000, 100_000, 250_000)
+LETTERS = GSTIN_CHARSET[10:]
+
+
+def _identifiers(count: int, rng: random.Random):
+    states = list(STATE_CODES)
+    holders = list(PAN_HOLDER_TYPES)
+    gstins, pans = [], []
+    for _ in range(count):
+        pan = ("".join(rng.choices(LETTERS, k=3)) + rng.choice(holders) + rng.choice(LETTERS)
+               + f"{rng.randrange(10_000):04d}" + rng.choice(LETTERS))
+        body = rng.choice(states) + pan + rng.choice(GSTIN_CHARSET[1:]) + "Z"
+        gstin = body + gstin_check_digit(body)
+        if rng.random() < 0.1:
+            # One character replaced; mostly caught by the check digit
+            i = rng.randrange(15)
+            gstin = gstin[:i] + rng.choice(GSTIN_CHARSET) + gstin[i + 1:]
+        gstins.append(gstin)
+        pans.append(pan)
+    return gstins, pans
+
+
+def main():
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or SIZES
+    rng = random.Random(7)
+    service = GSTService()
+    print(f"{'ids':>9} {'scalar/s':>12} {'batch/s':>12} {'speedup':>8} {'service/s':>12} {'invalid':>8}")
+    for count in sizes:
+        gstins, pans = _identifiers(count, rng)
+
+        start = time.perf_counter()
+        scalar = [gstin_errors(g) for g in gstins]
+        scalar_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = validate_gstins(gstins)
+        batch_s = time.perf_counter() - start
+        assert batch.tolist() == scalar
+        assert not validate_pans(pans).any()
+
+        start = time.perf_counter()
+        report = asyncio.run(service.validate_identifiers(gstins, pans, match_pans=True))
+        service_s = time.perf_counter() - start
+
+        invalid = count - report["gstins"]["valid"]
+        print(f"{count:>9} {count / scalar_s:>12,.0f} {count / batch_s:>12,.0f} "
+              f"{scalar_s / batch_s:>7.1f}x {2 * count / service_s:>12,.0f} {invalid:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Login latency before and after collapsing the login critical path.
+
+"before" replays the old sequence of four dependent round trips
+(sign-in, update last_login, select user, select business name);
+"after" is AuthService.authenticate_user (sign-in, then one joined
+user+business read; last_login is written behind by ActivityWriter).
+Both run against the local Supabase stand-in with injected network delay.
+
+    python -m benchmarks.bench_login_latency
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from app.database import AsyncSupabaseClient
+from app.services.auth_service import AuthService
+from tests.supabase_stub import SupabaseStub
+
+DELAY = 0.02
+JITTER = 0.01
+LOGINS = 200
+CONCURRENCY = 1
+
+
+async def legacy_login(db: AsyncSupabaseClient, email: str, password: str):
+    session = await db.sign_in_with_password(email, password)
+    user_id = session["user"]["id"]
+    token = session["access_token"]
+    await db.update("users", {"last_login": datetime.utcnow().isoformat()},
+                    filters={"id": user_id}, access_token=token)
+    user = await db.select("users", filters={"id": user_id}, single=True, access_token=token)
+    await db.select("businesses", columns="trade_name", filters={"id": user["business_id"]},
+                    single=True, access_token=token)
+
+
+async def measure(login, emails):
+    latencies = []
+    queue = list(emails)
+
+    async def worker():
+        while queue:
+            email = queue.pop()
+            start = time.perf_counter()
+            await login(email, "password")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return statistics.median(latencies), p99
+
+
+async def run(stub: SupabaseStub):
+    client = AsyncSupabaseClient(stub.url, "anon-key", "service-role-key")
+    service = AuthService(db=client)
+    emails = [f"user{i}@example.com" for i in range(LOGINS)]
+    for email in emails:
+        stub.add_user(email)
+
+    await service.authenticate_user(emails[0], "password")  # warm the pool
+    before = await measure(lambda e, p: legacy_login(client, e, p), emails)
+    after = await measure(service.authenticate_user, emails)
+    await client.aclose()
+
+    print(f"backend delay {DELAY * 1000:.0f}-{(DELAY + JITTER) * 1000:.0f} ms, "
+          f"{LOGINS} logins, {CONCURRENCY} concurrent")
+    print(f"{'':>8} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    print(f"{'before':>8} {before[0]:>10.1f} {before[1]:>10.1f}")
+    print(f"{'after':>8} {after[0]:>10.1f} {after[1]:>10.1f}")
+
+
+def main():
+    stub = SupabaseStub(delay=DELAY, jitter=JITTER).start()
+    try:
+        asyncio.run(run(stub))
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Cost of request instrumentation.
+
+Times the pieces ``MetricsMiddleware`` adds to every request: one
+histogram observation, a ``backend_call`` around a MockDB lookup (against
+the bare lookup), and the middleware itself around a trivial ASGI app,
+with and without ``Server-Timing``. Then fills the registry with a
+realistic number of series (every route x a few statuses, every MockDB
+and Supabase operation) and times rendering ``/metrics``.
+
+    python -m benchmarks.bench_metrics
+"""
+import asyncio
+import tempfile
+import time
+import uuid
+
+from app.main import app
+from app.utils.metrics import (
+    BACKEND_CALL_SECONDS, REQUEST_SECONDS, MetricsMiddleware, backend_call, registry
+)
+from app.utils.mock_db import MockDB
+
+TARGET_SECONDS = 0.5
+
+
+def _per_call_us(fn) -> float:
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < TARGET_SECONDS:
+        fn()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _asgi_per_call_us(asgi) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": [], "query_string": b"", "app": app}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < TARGET_SECONDS:
+        await asgi(dict(scope), receive, send)
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _plain(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        db = MockDB(data_dir)
+        user_id = str(uuid.uuid4())
+        db.create_user({"id": user_id, "email": "metrics@example.com", "business_id": None})
+        lookup = MockDB.get_user_by_id.__wrapped__
+
+        def wrapped_lookup():
+            with backend_call("mockdb", "bench"):
+                lookup(db, user_id)
+
+        print(f"{'operation':<44}{'us':>8}")
+        print(f"{'histogram observe':<44}{_per_call_us(lambda: REQUEST_SECONDS.observe(0.004, 'GET', '/bench', '200')):>8.2f}")
+        bare = _per_call_us(lambda: lookup(db, user_id))
+        timed = _per_call_us(wrapped_lookup)
+        print(f"{'MockDB lookup, bare':<44}{bare:>8.2f}")
+        print(f"{'MockDB lookup, in backend_call':<44}{timed:>8.2f}")
+
+        plain = asyncio.run(_asgi_per_call_us(_plain))
+        measured = asyncio.run(_asgi_per_call_us(MetricsMiddleware(_plain)))
+        with_header = asyncio.run(_asgi_per_call_us(MetricsMiddleware(_plain, server_timing=True)))
+        print(f"{'trivial ASGI app':<44}{plain:>8.2f}")
+        print(f"{'  + MetricsMiddleware':<44}{measured:>8.2f}")
+        print(f"{'  + MetricsMiddleware, Server-Timing':<44}{with_header:>8.2f}")
+
+    routes = [route.path for route in app.routes]
+    for route in routes:
+        for status in ("200", "304", "401", "404", "500"):
+            REQUEST_SECONDS.observe(0.01, "GET", route, status)
+    operations = [name for name in vars(MockDB) if name.split("_")[0] in ("get", "create", "update")]
+    for operation in operations:
+        BACKEND_CALL_SECONDS.observe(0.0001, "mockdb", operation)
+        BACKEND_CALL_SECONDS.observe(0.01, "supabase", f"GET /rest/v1/{operation}")
+    body = registry.render()
+    render_ms = _per_call_us(registry.render) / 1000
+    print(f"\n/metrics: {body.count(chr(10)):,} lines, {len(body) / 1024:.0f} KiB, rendered in {render_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Lookup latency of MockDB against the old read-and-scan implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mock_db
+"""
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from app.utils.mock_db import MockDB
+
+SIZES = (1_000, 10_000, 100_000)
+LOOKUPS = 200
+
+
+def _make_users(count: int):
+    users = []
+    for i in range(count):
+        users.append({
+            "id": str(uuid.uuid4()),
+            "email": f"user{i}@example.com",
+            "hashed_password": "x" * 87,
+            "full_name": f"User {i}",
+            "phone": None,
+            "business_id": str(uuid.uuid4()),
+            "created_at": "2026-01-01T00:00:00",
+            "last_login": None,
+        })
+    return users
+
+
+def _scan_by_email(users_file: str, email: str):
+    """The pre-index lookup path: parse the whole file, then scan it."""
+    with open(users_file, 'r') as f:
+        users = json.load(f)
+    for user in users:
+        if user.get("email") == email:
+            return user
+    return None
+
+
+def _per_lookup_us(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main():
+    print(f"{'users':>8} {'scan (us)':>12} {'indexed (us)':>14} {'speedup':>10}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as data_dir:
+            users = _make_users(size)
+            with open(os.path.join(data_dir, "users.json"), 'w') as f:
+                json.dump(users, f)
+
+            db = MockDB(data_dir)
+            emails = [random.choice(users)["email"] for _ in range(LOOKUPS)]
+
+            scan_keys = emails[: max(5, LOOKUPS * 1_000 // size)]
+            scan_us = _per_lookup_us(lambda e: _scan_by_email(db.users_file, e), scan_keys)
+            indexed_us = _per_lookup_us(db.get_user_by_email, emails)
+            print(f"{size:>8} {scan_us:>12.1f} {indexed_us:>14.3f} {scan_us / indexed_us:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
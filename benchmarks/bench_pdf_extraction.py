@@ -0,0 +1,175 @@
+"""Peak memory of PDF OCR: whole-document rendering vs page streaming.
+
+Writes a 200-page statement PDF and extracts it three ways, each in a
+fresh interpreter so ``ru_maxrss`` is not polluted by the others:
+
+* whole document: every page rendered up front, then read (what a single
+  ``convert_from_path`` call does)
+* page stream: ``iter_pdf_pages``-style, one page rendered, read and freed
+  at a time in one process
+* OCRService with W worker processes: pages fanned out over the pool, at
+  most W in flight
+
+Poppler and Tesseract are not needed: the benchmark plugs in a synthetic
+backend whose renderer allocates a real A4 page bitmap at the chosen DPI
+and whose "OCR" reduces it, so memory behaves like the real pipeline while
+the absolute timings do not.
+
+    python -m benchmarks.bench_pdf_extraction
+    python -m benchmarks.bench_pdf_extraction 200 150
+"""
+import asyncio
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+from app.services.ocr_extractors import OCRBackend, parse_invoice_fields
+
+PAGES = 200
+DPI = 100
+A4_INCHES = (8.27, 11.69)
+_PAGE = re.compile(rb"/Type\s*/Page\b")
+
+
+def write_statement(path: str, pages: int):
+    """Minimal valid PDF with one line of text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for n in range(1, pages + 1):
+        text = f"BT /F1 12 Tf 72 770 Td (Statement page {n} Total: {n * 1000}.00) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def page_count(path: str) -> int:
+    with open(path, "rb") as f:
+        return len(_PAGE.findall(f.read()))
+
+
+def render_page(path: str, page: int) -> Image.Image:
+    dpi = int(os.environ.get("BENCH_DPI", DPI))
+    image = Image.new("RGB", (int(A4_INCHES[0] * dpi), int(A4_INCHES[1] * dpi)), "white")
+    ImageDraw.Draw(image).text((dpi, dpi), f"Statement page {page} Total: {page * 1000}.00", fill="black")
+    return image
+
+
+def read_page(image: Image.Image) -> str:
+    with image.convert("L") as gray:
+        ink = sum(gray.histogram()[:128])
+    return f"Page ink {ink}"
+
+
+def extract_page(path: str, page: int) -> str:
+    image = render_page(path, page)
+    try:
+        return read_page(image)
+    finally:
+        image.close()
+
+
+def extract(path: str) -> dict:
+    texts = [extract_page(path, n) for n in range(1, page_count(path) + 1)]
+    text = "\n\f".join(texts)
+    return {"text": text, "pages": len(texts), "fields": parse_invoice_fields(text)}
+
+
+BACKEND = OCRBackend("bench", extract, page_count, extract_page)
+
+
+def _whole_document(path: str) -> int:
+    images = [render_page(path, n) for n in range(1, page_count(path) + 1)]
+    texts = [read_page(image) for image in images]
+    return len(texts)
+
+
+def _page_stream(path: str) -> int:
+    return extract(path)["pages"]
+
+
+def _service(path: str, workers: int, workdir: str) -> int:
+    from app.services.ocr_service import OCRService
+
+    async def run():
+        service = OCRService(
+            backend=BACKEND, workers=workers, executor="process",
+            upload_dir=os.path.join(workdir, "uploads"), cache_dir=os.path.join(workdir, "cache")
+        )
+        try:
+            result = await service._extract_pdf(path)
+            # Reap the workers so their peak RSS shows up under RUSAGE_CHILDREN
+            service._executor.shutdown(wait=True)
+        finally:
+            await service.close()
+        return result["pages"]
+
+    return asyncio.run(run())
+
+
+def _scenario(name: str, path: str, workers: int, workdir: str):
+    """Run one scenario in this (fresh) process and print its figures"""
+    start = time.perf_counter()
+    if name == "whole":
+        pages = _whole_document(path)
+    elif name == "stream":
+        pages = _page_stream(path)
+    else:
+        pages = _service(path, workers, workdir)
+    elapsed = time.perf_counter() - start
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"{pages} {elapsed:.2f} {own:.0f} {children:.0f}")
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else PAGES
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else DPI
+    env = dict(os.environ, BENCH_DPI=str(dpi))
+    width, height = int(A4_INCHES[0] * dpi), int(A4_INCHES[1] * dpi)
+    print(f"{pages}-page statement, A4 at {dpi} dpi ({width * height * 3 / 2**20:.1f} MiB per RGB page)\n")
+    # RUSAGE_CHILDREN reports the largest single worker, so the bound is parent + W x worker
+    print(f"{'scenario':<24}{'seconds':>10}{'parent MiB':>12}{'worker MiB':>12}{'bound MiB':>12}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "statement.pdf")
+        write_statement(path, pages)
+        scenarios = [("whole document", "whole", 0), ("page stream", "stream", 0)]
+        scenarios += [(f"OCRService, {w} workers", "service", w) for w in (1, 2, 4)]
+        for label, name, workers in scenarios:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pdf_extraction", "--scenario", name, path, str(workers), workdir],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout.split()
+            done, elapsed, own, worker = int(out[0]), float(out[1]), int(out[2]), int(out[3])
+            assert done == pages, (label, done)
+            bound = own + workers * worker
+            print(f"{label:<24}{elapsed:>10.2f}{own:>12}{worker if workers else '-':>12}{bound:>12}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--scenario":
+        _scenario(sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5])
+    else:
+        main()
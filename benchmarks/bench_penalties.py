@@ -0,0 +1,120 @@
+"""Late fees and interest across 10k businesses.
+
+Generates three years of deadlines per business (most past ones filed,
+tax and TDS amounts on the rest, a few custom deadlines with their own
+penalty rate) and assesses every open deadline three ways: a
+per-deadline Python loop over the penalty rules, one vectorized
+``PenaltyService.assess`` pass over all businesses, and the single
+business lookup the dashboard does per request. The loop and the
+vectorized pass must agree.
+
+    python -m benchmarks.bench_penalties
+    python -m benchmarks.bench_penalties 20000
+"""
+import math
+import random
+import sys
+import time
+import uuid
+from datetime import date
+from itertools import chain
+
+from app.services.deadline_service import DeadlineService
+from app.services.penalty_service import MONTHLY_OR_PART, PENALTY_RULES, PenaltyService
+
+BUSINESSES = 10_000
+BUSINESS_TYPES = ("Proprietorship", "Private Limited", "LLP")
+TODAY = date(2025, 11, 15)
+PROJECTION_DAYS = 30
+
+
+def _rows(service: DeadlineService, count: int, rng: random.Random):
+    start, end = date(2023, 4, 1), date(2026, 3, 31)
+    businesses = [{
+        "id": str(uuid.uuid4()),
+        "gstin": "27AAPFU0939F1ZV",
+        "business_type": BUSINESS_TYPES[i % len(BUSINESS_TYPES)],
+    } for i in range(count)]
+    for row in chain.from_iterable(service.generate(b, start, end) for b in businesses):
+        if row["due_date"] < TODAY and rng.random() < 0.97:
+            row["status"] = "completed"
+        if row["subtype"] in ("GSTR-3B", "TDS Payment", "24Q/26Q"):
+            row["amount"] = round(rng.uniform(1_000, 500_000), 2)
+        elif row["subtype"] == "GSTR-9" and rng.random() < 0.5:
+            row["amount"] = round(rng.uniform(1e6, 5e7), 2)  # turnover
+        yield row
+    for business in businesses[::10]:
+        yield {
+            "id": str(uuid.uuid4()), "business_id": business["id"], "type": "custom", "subtype": "Advance tax",
+            "due_date": date(2025, 9, 15), "amount": 25_000.0, "penalty_rate": 12.0
+        }
+
+
+def _reference(service: DeadlineService, as_of: int):
+    """Per-deadline loop: {business_id: accrued fee + interest}"""
+    totals = {}
+    for deadline in service.records:
+        if not deadline.is_open:
+            continue
+        days = max(as_of - deadline.due, 0)
+        amount = deadline.amount or 0.0
+        rule = PENALTY_RULES.get(deadline.subtype)
+        fee = interest = 0.0
+        if rule is not None:
+            fee = days * rule.fee_per_day
+            if rule.fee_cap_pct is not None and amount > 0:
+                fee = min(fee, amount * rule.fee_cap_pct / 100)
+            elif rule.fee_cap is not None:
+                fee = min(fee, rule.fee_cap)
+            if deadline.penalty_rate is None:
+                periods = math.ceil(days / 30) if rule.accrual == MONTHLY_OR_PART else days / 365
+                interest = amount * rule.interest_rate / 100 * periods
+        if deadline.penalty_rate is not None:
+            interest = amount * deadline.penalty_rate / 100 * days / 365
+        totals[deadline.business_id] = totals.get(deadline.business_id, 0.0) + round(fee, 2) + round(interest, 2)
+    return totals
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else BUSINESSES
+    deadlines = DeadlineService()
+    deadlines._as_of = TODAY.toordinal()
+    penalties = PenaltyService(deadlines)
+    deadlines.add_rows(_rows(deadlines, count, random.Random(5)))
+    open_count = sum(deadline.is_open for deadline in deadlines.records)
+    print(f"{count:,} businesses, {len(deadlines.records):,} deadlines, {open_count:,} open\n")
+
+    start = time.perf_counter()
+    expected = _reference(deadlines, TODAY.toordinal())
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assessment = penalties.assess(today=TODAY, projection_days=PROJECTION_DAYS)
+    assess_s = time.perf_counter() - start
+    totals = assessment.totals()
+    totals_s = time.perf_counter() - start
+    for business_id, accrued in expected.items():
+        assert abs(totals[business_id]["accrued_total"] - accrued) < 0.05, business_id
+
+    ids = list(expected)[:1000]
+    start = time.perf_counter()
+    for business_id in ids:
+        penalties.assess([business_id], today=TODAY).totals()
+    single_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+    print(f"{'path':<36}{'seconds':>10}")
+    print(f"{'per-deadline loop':<36}{loop_s:>10.3f}")
+    print(f"{'vectorized, all businesses':<36}{assess_s:>10.3f}")
+    print(f"{'  + per-business totals':<36}{totals_s:>10.3f}")
+    print(f"\none business (dashboard): {single_us:.0f} us")
+
+    risk = {}
+    for row in totals.values():
+        risk[row["penalty_risk"]] = risk.get(row["penalty_risk"], 0) + 1
+    accrued = sum(row["accrued_total"] for row in totals.values())
+    projected = sum(row["projected_total"] for row in totals.values())
+    print(f"accrued {accrued:,.0f}, projected in {PROJECTION_DAYS} days {projected:,.0f}, risk {risk}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""ITC reconciliation of 500k purchase-register lines against GSTR-2B.
+
+Builds a register and a supplier-side copy with realistic noise (rounding
+differences, shifted dates, reformatted and mistyped invoice numbers,
+lines missing on either side) and times the vectorized engine, plus the
+CSV parsing the /api/gst/reconcile endpoint does first.
+
+    python -m benchmarks.bench_reconciliation
+    python -m benchmarks.bench_reconciliation 1000000
+"""
+import io
+import random
+import sys
+import time
+from datetime import date
+
+from app.services.reconciliation_service import INVOICE_COLUMNS, InvoiceTable, reconcile
+
+LINES = 500_000
+SUPPLIERS = 5_000
+
+
+def _tables(lines: int):
+    rng = random.Random(42)
+    suppliers = [f"27AAAC{i:05d}Z1Z{i % 10}" for i in range(SUPPLIERS)]
+    start = date(2025, 4, 1).toordinal()
+    books, supplier = [], []
+    for i in range(lines):
+        gstin = rng.choice(suppliers)
+        number = f"INV/{i:07d}"
+        day = start + rng.randrange(30)
+        taxable = round(rng.uniform(1_000, 500_000), 2)
+        tax = round(taxable * 0.18, 2)
+        books.append((gstin, number, day, taxable, tax))
+
+        roll = rng.random()
+        if roll < 0.02:
+            continue  # never reported by the supplier
+        if roll < 0.05:
+            number = f"INV-{i}"  # reformatted: still an exact match once normalized
+        elif roll < 0.06:
+            number = f"IN{i:07d}X"  # mistyped: found by the second pass
+        elif roll < 0.08:
+            tax += 25  # amount mismatch
+        elif roll < 0.09:
+            day += 10  # date mismatch
+        elif roll < 0.30:
+            tax += 0.4  # rounding, within tolerance
+        supplier.append((gstin, number, day, taxable, tax))
+    for j in range(lines // 50):
+        # reported by suppliers but not yet booked
+        supplier.append((rng.choice(suppliers), f"LATE/{j}", start + rng.randrange(30), 1000.0, 180.0))
+    rng.shuffle(supplier)
+    return books, supplier
+
+
+def _table(rows):
+    gstin, number, dates, taxable, tax = zip(*rows)
+    return InvoiceTable(list(gstin), list(number), dates, taxable, tax)
+
+
+def _csv(rows) -> io.BytesIO:
+    text = io.StringIO()
+    text.write(",".join(INVOICE_COLUMNS) + "\n")
+    for gstin, number, day, taxable, tax in rows:
+        text.write(f"{gstin},{number},{date.fromordinal(day).isoformat()},{taxable},{tax}\n")
+    return io.BytesIO(text.getvalue().encode())
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    books_rows, supplier_rows = _tables(lines)
+    books_csv, supplier_csv = _csv(books_rows), _csv(supplier_rows)
+
+    start = time.perf_counter()
+    books, _ = InvoiceTable.from_csv(books_csv, 10)
+    supplier, _ = InvoiceTable.from_csv(supplier_csv, 10)
+    parse_s = time.perf_counter() - start
+
+    books, supplier = _table(books_rows), _table(supplier_rows)
+    start = time.perf_counter()
+    result = reconcile(books, supplier)
+    match_s = time.perf_counter() - start
+
+    counts = result.to_dict(0)["counts"]
+    print(f"register lines {len(books):,}, GSTR-2B lines {len(supplier):,}")
+    print(f"CSV parse      {parse_s:6.2f} s")
+    print(f"reconcile      {match_s:6.2f} s")
+    for bucket, count in counts.items():
+        print(f"  {bucket:<17} {count:>9,}")
+    print(f"ITC available  {result.itc_available:,.2f}")
+    print(f"ITC claimed    {result.itc_claimed:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
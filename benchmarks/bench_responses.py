@@ -0,0 +1,126 @@
+"""Response serialization and bytes on the wire, per route.
+
+Builds each route's real payload with its service (a GST filings page,
+a business's overdue deadlines and penalties over five years, a 120
+month trend, a TDS batch and a bulk identifier validation) and renders
+it two ways:
+
+* the previous path: ``response_model=dict`` validation, FastAPI's
+  ``jsonable_encoder`` pass, then ``json.dumps`` in ``JSONResponse``
+* ``FastJSONResponse`` called directly, as ``JSONRoute`` does
+
+then reports the body size raw and compressed the way
+``CompressionMiddleware`` would (gzip, and brotli when installed).
+
+    python -m benchmarks.bench_responses
+"""
+import asyncio
+import gzip
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.config import settings
+from app.models.compliance import TDSPayment
+from app.services.analytics_service import AnalyticsService
+from app.services.deadline_service import DeadlineService
+from app.services.gst_service import GST_FILING_COLUMNS, GSTService
+from app.services.penalty_service import PenaltyService
+from app.services.tds_service import TDSService
+from app.utils.compression import brotli
+from app.utils.responses import FastJSONResponse
+
+TODAY = date(2025, 11, 15)
+TARGET_SECONDS = 0.5
+
+
+def _payloads():
+    rng = random.Random(3)
+    deadlines = DeadlineService()
+    deadlines._as_of = TODAY.toordinal()
+    penalties = PenaltyService(deadlines)
+    gst = GSTService()
+    analytics = AnalyticsService(deadlines, penalties, gst)
+    business = {"id": str(uuid.uuid4()), "gstin": "27AAPFU0939F1ZV", "business_type": "Private Limited"}
+    deadlines.load_businesses([business], date(2020, 11, 15), date(2026, 11, 15))
+    asyncio.run(analytics.ensure_business(business["id"]))
+    analytics.filings_added([{
+        "id": str(uuid.uuid4()), "business_id": business["id"], "period_year": 2016 + m // 12,
+        "period_month": m % 12 + 1, "total_tax_liability": rng.uniform(1e4, 1e6), "itc_available": 5e3,
+        "itc_claimed": 4e3, "payment_made": 1e4
+    } for m in range(120)])
+
+    filings = [{
+        "id": str(uuid.uuid4()), "business_id": business["id"], "filing_type": "GSTR-3B",
+        "period_year": 2025 - i // 12, "period_month": 12 - i % 12, "due_date": "2025-01-20",
+        "filed_on": datetime(2025, 1, 18, 10, 30).isoformat(), "status": "filed", "reconciliation_status": "matched",
+        "total_taxable_value": round(rng.uniform(1e5, 1e7), 2), "total_tax_liability": round(rng.uniform(1e4, 1e6), 2),
+        "itc_available": round(rng.uniform(1e3, 1e5), 2), "itc_claimed": round(rng.uniform(1e3, 1e5), 2),
+        "payment_made": round(rng.uniform(1e4, 1e6), 2), "challan_number": f"CPIN{i:010d}",
+        "created_at": datetime(2025, 1, 18, 10, 30).isoformat()
+    } for i in range(settings.GST_FILINGS_MAX_PAGE_SIZE)]
+    assert set(filings[0]) == set(GST_FILING_COLUMNS)
+
+    tds = TDSService()
+    payments = [TDSPayment(
+        vendor=f"Vendor {i % 800}", pan=f"AB{'CFHP'[i % 4]}PK{i % 10000:04d}{'ABCDE'[i % 5]}",
+        section=("194C", "194J(b)", "194H", "194I(b)")[i % 4], amount=rng.uniform(1e3, 2e5),
+        payment_date=date(2025, 4 + i % 9, 1 + i % 28)
+    ) for i in range(5000)]
+    gstins = [f"27AAPFU{i % 10000:04d}F1Z{'V' if i % 10 else '0'}" for i in range(50_000)]
+    pans = [f"AAPFU{i % 10000:04d}F" for i in range(50_000)]
+
+    def wrap(data):
+        return {"success": True, "data": data}
+
+    return [
+        ("GET /api/gst/filings?limit=200", {"success": True, "data": filings, "next_cursor": "WzIwMDgsMSwiYWJjIl0"}),
+        ("GET /api/dashboard/deadlines?overdue=1", wrap(deadlines.overdue(business["id"]))),
+        ("GET /api/dashboard/penalties", wrap(penalties.business_penalties(business["id"]))),
+        ("GET /api/analytics/trends?periods=120", wrap({
+            "granularity": "month", "periods": analytics.trends(business["id"], "month", 120, TODAY)
+        })),
+        ("POST /api/tds/compute (5k)", wrap(asyncio.run(tds.compute(payments, [])))),
+        ("POST /api/gst/validate (100k)", wrap(asyncio.run(gst.validate_identifiers(gstins, pans)))),
+    ]
+
+
+def _per_call_us(fn) -> float:
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < TARGET_SECONDS:
+        fn()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    field = APIRoute("/", lambda: None, response_model=dict).response_field
+    loop = asyncio.new_event_loop()
+
+    def previous(payload):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=payload))
+        return JSONResponse(content).body
+
+    header = f"{'route':<38}{'before us':>11}{'after us':>10}{'speed-up':>10}{'raw KiB':>9}{'gzip KiB':>10}"
+    print(header + (f"{'br KiB':>8}" if brotli else "  (brotli not installed)"))
+    for route, payload in _payloads():
+        body = FastJSONResponse(payload).body
+        assert json.loads(previous(payload)) == json.loads(body), route
+        before = _per_call_us(lambda: previous(payload))
+        after = _per_call_us(lambda: FastJSONResponse(payload).body)
+        gzipped = len(gzip.compress(body, settings.GZIP_LEVEL))
+        line = (f"{route:<38}{before:>11,.0f}{after:>10,.0f}{before / after:>9.1f}x"
+                f"{len(body) / 1024:>9.1f}{gzipped / 1024:>10.1f}")
+        if brotli:
+            line += f"{len(brotli.compress(body, quality=settings.BROTLI_QUALITY)) / 1024:>8.1f}"
+        print(line)
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
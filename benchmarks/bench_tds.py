@@ -0,0 +1,134 @@
+"""Month-end TDS run over 100k vendor payments.
+
+Generates a payment batch across sections (contractors, professional and
+technical fees, rent, commission, interest, goods purchases) with repeat
+payees, some PANs missing or invalid and FY-to-date opening balances for
+part of the payees. Computes it with a straightforward per-payment loop
+over running totals, checks the vectorized engine agrees with it, and
+times the engine on its own and the full /api/tds/compute service path
+(request models in, response dict out).
+
+    python -m benchmarks.bench_tds
+    python -m benchmarks.bench_tds 200000
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.models.compliance import TDSOpeningBalance, TDSPayment
+from app.services.tds_service import (
+    EXCESS, SECTION_CODES, TDS_SECTIONS, PaymentBatch, TDSService, compute_tds, financial_year
+)
+from app.utils.validators import pan_errors
+
+PAYMENTS = 100_000
+VENDORS = 8_000
+# Section and a typical payment size
+MIX = (("194C", 40_000), ("194C", 400_000), ("194J(b)", 60_000), ("194J(a)", 20_000),
+       ("194H", 8_000), ("194I(b)", 80_000), ("194A", 5_000), ("194Q", 900_000))
+
+
+def _batch(count: int, rng: random.Random):
+    vendors = []
+    for i in range(VENDORS):
+        roll = rng.random()
+        if roll < 0.05:
+            pan = None
+        elif roll < 0.07:
+            pan = f"AB{i:03d}"  # malformed
+        else:
+            pan = f"{'ABCDE'[i % 5]}{'FGHIJ'[i // 5 % 5]}{'KLMNO'[i // 25 % 5]}{'PCFH'[i % 4]}X{i:04d}Z"
+        vendors.append((f"Vendor {i}", pan, MIX[i % len(MIX)]))
+
+    start = date(2025, 10, 1)
+    payments = []
+    for _ in range(count):
+        vendor, pan, (section, size) = rng.choice(vendors)
+        amount = round(rng.uniform(0.2, 1.8) * size, 2)
+        payments.append(TDSPayment(vendor=vendor, pan=pan, section=section, amount=amount,
+                                   payment_date=start + timedelta(days=rng.randrange(31))))
+    opening = [
+        TDSOpeningBalance(financial_year=2025, payee=pan, section=section,
+                          paid=round(rng.uniform(0, 3) * size, 2), taxed=0)
+        for _, pan, (section, size) in vendors[::3] if pan and not pan_errors(pan)
+    ]
+    return payments, opening
+
+
+def _reference(payments, opening):
+    """Payment-at-a-time computation with a dict of running totals"""
+    totals = {}
+    for entry in opening:
+        totals[(entry.financial_year, entry.payee, entry.section)] = [round(entry.paid * 100), round(entry.taxed * 100)]
+    tds = [0.0] * len(payments)
+    order = sorted(range(len(payments)), key=lambda i: payments[i].payment_date)
+    for i in order:
+        p = payments[i]
+        section = TDS_SECTIONS[p.section]
+        pan_ok = bool(p.pan) and not pan_errors(p.pan)
+        key = (financial_year(p.payment_date), p.pan if pan_ok else f"vendor:{p.vendor}", p.section)
+        paid, taxed = totals.setdefault(key, [0, 0])
+        amount = round(p.amount * 100)
+        annual = None if section.annual_threshold is None else round(section.annual_threshold * 100)
+        single = None if section.single_threshold is None else round(section.single_threshold * 100)
+        paid += amount
+        if section.mode == EXCESS:
+            now_taxed = max(paid - annual, 0)
+        elif annual is not None and paid > annual:
+            now_taxed = paid
+        elif single is not None and amount > single:
+            now_taxed = taxed + amount
+        else:
+            now_taxed = taxed
+        if not pan_ok:
+            rate = section.no_pan_rate
+        elif p.pan[3] in "PH":
+            rate = section.individual_rate
+        else:
+            rate = section.other_rate
+        tds[i] = float(min(round((now_taxed - taxed) * rate / 10_000), amount // 100))
+        totals[key] = [paid, now_taxed]
+    return tds
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PAYMENTS
+    payments, opening = _batch(count, random.Random(11))
+
+    start = time.perf_counter()
+    expected = _reference(payments, opening)
+    reference_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = PaymentBatch(
+        [p.vendor for p in payments], [p.pan for p in payments],
+        [SECTION_CODES.index(p.section) for p in payments],
+        [p.amount for p in payments], [p.payment_date for p in payments]
+    )
+    balances = {(o.financial_year, o.payee, SECTION_CODES.index(o.section)): (o.paid, o.taxed) for o in opening}
+    result = compute_tds(batch, balances)
+    engine_s = time.perf_counter() - start
+    assert result.tds.tolist() == expected
+
+    start = time.perf_counter()
+    report = asyncio.run(TDSService().compute(payments, opening))
+    service_s = time.perf_counter() - start
+    assert [d["tds"] for d in report["deductions"]] == expected
+
+    print(f"{count:,} payments, {len(result.groups):,} payee/section groups, "
+          f"{len(opening):,} opening balances, total TDS {report['total_tds']:,.0f}\n")
+    print(f"{'path':<24}{'seconds':>10}{'payments/s':>14}")
+    for label, seconds in (("per-payment loop", reference_s), ("vectorized engine", engine_s),
+                           ("service (with report)", service_s)):
+        print(f"{label:<24}{seconds:>10.3f}{count / seconds:>14,.0f}")
+    print()
+    print(f"{'section':<10}{'payments':>10}{'amount':>18}{'taxable':>18}{'tds':>14}")
+    for row in report["summary"]:
+        print(f"{row['section']:<10}{row['payments']:>10,}{row['amount']:>18,.2f}"
+              f"{row['taxable_amount']:>18,.2f}{row['tds']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
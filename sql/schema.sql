@@ -56,11 +56,36 @@ create table public.gst_filings (
     filed_on timestamp with time zone,
     status text default 'pending',
     reconciliation_status text default 'pending',
+    total_taxable_value numeric default 0,
     total_tax_liability numeric default 0,
     itc_available numeric default 0,
+    itc_claimed numeric default 0,
+    payment_made numeric default 0,
     challan_number text
 );
 
+-- Filing history is read newest period first, one business at a time; id
+-- breaks ties between filing types in the same period for keyset paging
+create index gst_filings_business_period_idx
+    on public.gst_filings (business_id, period_year, period_month, id);
+
+-- Bulk last_login update used by the write-behind activity writer. It runs
+-- as its owner, so only the service role (the backend) may call it
+create or replace function public.touch_last_login(updates jsonb)
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+    update public.users u
+    set last_login = greatest(u.last_login, x.last_login)
+    from jsonb_to_recordset(updates) as x(id uuid, last_login timestamptz)
+    where u.id = x.id;
+$$;
+
+revoke execute on function public.touch_last_login(jsonb) from public, anon, authenticated;
+grant execute on function public.touch_last_login(jsonb) to service_role;
+
 -- Enable Row Level Security (RLS)
 alter table public.businesses enable row level security;
 alter table public.users enable row level security;
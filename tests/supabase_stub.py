@@ -0,0 +1,151 @@
+"""Local stand-in for the Supabase Auth and PostgREST endpoints AuthService uses.
+
+Each request sleeps for ``delay`` seconds (plus up to ``jitter`` seconds of
+random extra) to model the network round trip.
+The server counts requests, TCP connections and the peak number of requests
+in flight, which shows whether callers overlap and reuse connections.
+"""
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class SupabaseStub:
+    def __init__(self, delay: float = 0.05, jitter: float = 0.0):
+        self.delay = delay
+        self.jitter = jitter
+        self.users = {}
+        self.businesses = {}
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SupabaseStub":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = self.connections = self.max_in_flight = 0
+
+    def add_user(self, email: str, full_name: str = "Stub User") -> str:
+        user_id, business_id = str(uuid.uuid4()), str(uuid.uuid4())
+        self.businesses[business_id] = {
+            "id": business_id, "user_id": user_id,
+            "legal_name": f"{full_name} Traders", "trade_name": f"{full_name} Traders",
+        }
+        self.users[user_id] = {
+            "id": user_id, "email": email, "full_name": full_name,
+            "business_id": business_id, "last_login": None,
+        }
+        return user_id
+
+    # Request handling
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _route(self, method: str, path: str, query: dict, body):
+        table = {"users": self.users, "businesses": self.businesses}
+        if path == "/auth/v1/token" and method == "POST":
+            for user in self.users.values():
+                if user["email"] == body["email"]:
+                    return 200, {"access_token": "stub-token", "user": {"id": user["id"]}}
+            return 400, {"error_description": "Invalid login credentials"}
+        if path == "/auth/v1/signup" and method == "POST":
+            return 200, {"user": {"id": str(uuid.uuid4())}}
+        if path == "/rest/v1/rpc/touch_last_login" and method == "POST":
+            for update in body["updates"]:
+                if update["id"] in self.users:
+                    self.users[update["id"]]["last_login"] = update["last_login"]
+            return 204, None
+        if path.startswith("/rest/v1/"):
+            name = path[len("/rest/v1/"):]
+            rows = table.get(name)
+            if rows is None:
+                return 404, {"message": f"relation {name} does not exist"}
+            if method == "POST":
+                records = body if isinstance(body, list) else [body]
+                for record in records:
+                    record.setdefault("id", str(uuid.uuid4()))
+                    rows[record["id"]] = record
+                return 201, records
+            row_id = query.get("id", "eq.")[3:]
+            row = rows.get(row_id)
+            if method == "PATCH":
+                if row is not None:
+                    row.update(body)
+                return 204, None
+            if method == "GET":
+                if row is None:
+                    return 406, {"message": "JSON object requested, multiple (or no) rows returned"}
+                return 200, self._embed(row, query.get("select", "*"))
+        return 404, {"message": "not found"}
+
+    def _embed(self, row: dict, select: str) -> dict:
+        result = dict(row)
+        if "business:businesses" in select:
+            result["business"] = self.businesses.get(row.get("business_id"))
+        return result
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                stub._enter()
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = json.loads(self.rfile.read(length)) if length else None
+                    parsed = urlparse(self.path)
+                    query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                    time.sleep(stub.delay + random.uniform(0, stub.jitter))
+                    status, payload = stub._route(self.command, parsed.path, query, body)
+                finally:
+                    stub._leave()
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = _handle
+
+        return Handler
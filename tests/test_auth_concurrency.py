@@ -0,0 +1,43 @@
+"""Concurrent logins overlap against a local Supabase stand-in instead of serializing."""
+import asyncio
+import time
+
+from app.database import AsyncSupabaseClient
+from app.services.auth_service import AuthService
+from tests.supabase_stub import SupabaseStub
+
+DELAY = 0.05
+CONCURRENCY = 20
+
+
+async def _login_all(stub: SupabaseStub, emails):
+    client = AsyncSupabaseClient(stub.url, "anon-key", "service-role-key")
+    service = AuthService(db=client)
+    try:
+        await service.authenticate_user(emails[0], "password")  # warm the pool
+        stub.reset_counters()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.authenticate_user(email, "password") for email in emails))
+        return results, time.perf_counter() - start
+    finally:
+        await service.close()
+        await client.aclose()
+
+
+def test_concurrent_logins_overlap():
+    stub = SupabaseStub(delay=DELAY).start()
+    try:
+        emails = [f"user{i}@example.com" for i in range(CONCURRENCY)]
+        user_ids = [stub.add_user(email) for email in emails]
+        results, elapsed = asyncio.run(_login_all(stub, emails))
+    finally:
+        stub.stop()
+
+    assert [result["user_id"] for result in results] == user_ids
+    # Every login waits on the stand-in at least once; one at a time the
+    # round trips alone would take stub.requests * DELAY. Password hashing
+    # is CPU time on top, so the bound leaves room for it on a slow machine.
+    assert stub.requests / CONCURRENCY >= 1
+    assert stub.max_in_flight > 1
+    serial = stub.requests * DELAY
+    assert elapsed < serial / 4, f"{elapsed:.2f}s for {CONCURRENCY} logins, {serial:.2f}s back to back"
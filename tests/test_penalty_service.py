@@ -0,0 +1,33 @@
+"""Late-fee caps when a deadline has no amount to take a percentage of."""
+from datetime import date
+
+from app.services.deadline_service import DeadlineService
+from app.services.penalty_service import PenaltyService
+
+TODAY = date(2026, 6, 1)
+
+
+def _service_with(*rows):
+    deadlines = DeadlineService()
+    penalties = PenaltyService(deadlines)
+    deadlines.add_rows([{
+        "id": f"d{i}", "business_id": "b1", "type": "GST", "status": "overdue", **row
+    } for i, row in enumerate(rows)])
+    return deadlines, penalties
+
+
+def test_amountless_gstr9_stops_at_the_fixed_cap():
+    deadlines, penalties = _service_with({"subtype": "GSTR-9", "due_date": "2021-12-31", "amount": None})
+
+    totals = penalties.assess(["b1"], TODAY).totals()["b1"]
+    assert totals["accrued_late_fees"] == 10_000
+    assert totals["projected_total"] == 10_000
+    assert penalties.penalty_on(deadlines.records[0], TODAY.toordinal()) == 10_000
+
+
+def test_gstr9_with_an_amount_uses_the_percentage_cap():
+    deadlines, penalties = _service_with({"subtype": "GSTR-9", "due_date": "2021-12-31", "amount": 5_000_000})
+
+    # 0.5% of the amount, above the fixed fallback
+    assert penalties.assess(["b1"], TODAY).totals()["b1"]["accrued_late_fees"] == 25_000
+    assert penalties.penalty_on(deadlines.records[0], TODAY.toordinal()) == 25_000